@@ -1,7 +1,11 @@
 """
 ai_selector.py
 Uses Gemini (or OpenRouter fallback) to pick the most viral/engaging article.
-Tracks post history to prevent repeating the same article within 30 days.
+Tracks post history to prevent repeating the same article within 30 days —
+including re-published copies with a tweaked headline (post_history).
+The model judges each article on its own (fit / reject, reason, 1-10 score);
+verdicts are kept in article_store, so the next run only sends articles it
+has not judged yet and merges the stored verdicts back in.
 Set GEMINI_API_KEY or OPENROUTER_API_KEY in .env
 Falls back gracefully if no key is set.
 """
@@ -9,26 +13,30 @@ Falls back gracefully if no key is set.
 import os
 import json
 import hashlib
-import requests
-from datetime import datetime, timedelta
-from dotenv import load_dotenv
+import llm_client
+import article_store
+import run_budget
+from scoring_rules import plan as scoring_plan, hits as keyword_hits, total
+from article_record import as_article
+from post_history import open_history, find_posted, record_post
+from config import settings
 
-load_dotenv()
-
-GEMINI_API_KEY     = os.getenv("GEMINI_API_KEY", "")
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
+GEMINI_API_KEY     = settings.gemini_api_key
+OPENROUTER_API_KEY = settings.openrouter_api_key
 
 # ── History config ─────────────────────────────────────────────────────────────
-HISTORY_FILE    = "post_history.json"
+HISTORY_FILE    = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "post_history.jsonl")   # append-only journal (post_history.py)
 HISTORY_DAYS    = 30   # don't repeat articles within this window
 MAX_HISTORY     = 200  # max entries to keep
+SELECT_BUDGET   = 20   # seconds of run budget needed to ask the AI
 
 
-SELECTION_PROMPT = """You are a health content strategist for a Facebook page run by a USANA health
+VERDICT_PROMPT = """You are a health content strategist for a Facebook page run by a USANA health
 supplement distributor targeting Filipino professionals in Singapore and the Philippines.
 
-Given these health articles, select the ONE most likely to get high engagement
-AND that aligns with a natural health and nutrition business.
+Judge EACH of these health articles on its own: is it likely to get high
+engagement AND does it align with a natural health and nutrition business?
 
 PRIORITISE articles about:
 - Nutrition, vitamins, minerals, antioxidants, superfoods
@@ -50,61 +58,26 @@ REJECT articles about:
 Articles:
 {articles_list}
 
-Respond ONLY with valid JSON:
-{{
-  "selected_index": <number 0-based>,
-  "reason": "<one sentence why this fits a natural health business>"
-}}"""
+Respond ONLY with valid JSON — one object per article, same 0-based index:
+[
+  {{
+    "index": <number 0-based>,
+    "fit": <true | false>,
+    "score": <1-10, expected engagement for this page>,
+    "reason": "<one sentence>"
+  }}
+]"""
+
+# Stored verdicts are only reused while the prompt they were made under is unchanged
+VERDICT_KEY  = hashlib.sha1(VERDICT_PROMPT.encode()).hexdigest()[:12]
+VERDICT_PAGE = "health"
 
 
 # ── USANA business content filter ─────────────────────────────────────────────
-# Hard block — these topics directly conflict with a supplement business
-HARD_BLOCKED_KEYWORDS = [
-    # Weight loss drugs — direct competitor/conflict
-    "ozempic", "wegovy", "mounjaro", "tirzepatide", "semaglutide",
-    "glp-1", "glp1", "weight loss drug", "weight loss medication",
-    "weight loss pill", "diet pill", "weight loss injection",
-    # Pharma / prescription drugs
-    "prescription drug", "fda approved drug", "clinical trial", "drug trial",
-    "antidepressant", "antipsychotic", "statin", "blood thinner",
-    "chemotherapy", "immunotherapy", "biological drug",
-    # Competitor supplement/skincare brands
-    "herbalife", "amway", "shaklee", "isagenix", "nuskin", "nu skin",
-    "forever living", "arbonne", "advocare", "beachbody", "optavia",
-    # Medical procedures
-    "bariatric surgery", "gastric bypass", "gastric sleeve", "liposuction",
-    "botox", "filler", "cosmetic surgery", "weight loss surgery",
-    # Harmful / off-brand topics
-    "war", "conflict", "attack", "killed", "shooting",
-    "election", "scandal", "arrested",
-]
-
-# Soft block — deprioritise (not outright removed, but scored low)
-SOFT_BLOCKED_KEYWORDS = [
-    "drug", "medication", "pharmaceutical", "hospital treatment",
-    "surgery", "chemotherapy", "dialysis", "transplant",
-    "cancer treatment", "diabetes drug", "insulin",
-]
-
-# USANA-aligned topics — boost score when present
-PREFERRED_KEYWORDS = [
-    # Nutrition
-    "nutrition", "nutrient", "vitamin", "mineral", "antioxidant",
-    "omega-3", "omega3", "protein", "fibre", "fiber", "probiotic",
-    "superfood", "plant-based", "whole food", "gut health", "microbiome",
-    # Health pillars that USANA addresses
-    "immune", "immunity", "cellular health", "inflammation", "antioxidant",
-    "sleep", "energy", "fatigue", "stress", "cortisol", "burnout",
-    "muscle", "bone health", "heart health", "cardiovascular",
-    # Lifestyle / preventive
-    "exercise", "workout", "movement", "walking", "fitness",
-    "healthy ageing", "longevity", "prevention", "wellness",
-    "mental health", "wellbeing", "self-care", "mindfulness",
-    # Audience-relevant
-    "nurses", "professionals", "shift work", "sedentary", "desk job",
-    "study reveals", "research shows", "new study", "scientists find",
-    "natural", "holistic", "diet", "weight management",
-]
+# Keyword sets and weights live in scoring_rules.toml, profile [business]:
+#   hard_block  — topics that directly conflict with a supplement business (word-boundary)
+#   soft_block  — deprioritised, not removed
+#   preferred   — USANA-aligned topics that boost the score
 
 
 def _is_business_safe(article: dict) -> bool:
@@ -112,11 +85,11 @@ def _is_business_safe(article: dict) -> bool:
     Hard filter — returns False if article conflicts with USANA business.
     Checks title + summary against blocked keywords.
     """
-    text = (article.get("title", "") + " " + article.get("summary", "")).lower()
-    for kw in HARD_BLOCKED_KEYWORDS:
-        if kw in text:
-            print(f"  🚫 Blocked (business conflict): '{kw}' — {article['title'][:60]}")
-            return False
+    blocked = keyword_hits("business", as_article(article).text)["hard_block"]
+    if blocked:
+        kw = next(iter(blocked))
+        print(f"  🚫 Blocked (business conflict): '{kw}' — {article['title'][:60]}")
+        return False
     return True
 
 
@@ -125,79 +98,46 @@ def _business_score(article: dict) -> int:
     Score article alignment with USANA business.
     Higher = better fit. Used in heuristic fallback.
     """
-    text  = (article.get("title", "") + " " + article.get("summary", "")).lower()
-    score = 0
-    for kw in PREFERRED_KEYWORDS:
-        if kw in text:
-            score += 2
-    for kw in SOFT_BLOCKED_KEYWORDS:
-        if kw in text:
-            score -= 3
+    rules = scoring_plan("business")
+    hits  = keyword_hits("business", as_article(article).text)
+    score = sum(weight * total(rules["matcher"], hits, category)
+                for category, weight in rules["weights"].items())
     # Short titles tend to be more shareable
-    if len(article.get("title", "")) < 80:
-        score += 1
+    if len(article.get("title", "")) < rules["short_title"]["max_chars"]:
+        score += rules["short_title"]["points"]
     return score
 
 
-
-
 # ── History management ─────────────────────────────────────────────────────────
 
-def _article_hash(title: str) -> str:
-    """Generate a short hash from article title for deduplication."""
-    return hashlib.md5(title.lower().strip().encode()).hexdigest()[:12]
-
-
-def _load_history() -> list:
-    """Load post history from file."""
-    if not os.path.exists(HISTORY_FILE):
-        return []
-    try:
-        with open(HISTORY_FILE) as f:
-            return json.load(f)
-    except Exception:
-        return []
-
-
-def _save_history(history: list):
-    """Save post history to file, keeping only recent entries."""
-    cutoff = (datetime.now() - timedelta(days=HISTORY_DAYS)).isoformat()
-    recent = [h for h in history if h.get("date", "") >= cutoff]
-    recent = recent[-MAX_HISTORY:]
-    try:
-        with open(HISTORY_FILE, "w") as f:
-            json.dump(recent, f, indent=2)
-    except Exception as e:
-        print(f"  ⚠️  Could not save history: {e}")
+def _history() -> dict:
+    return open_history(HISTORY_FILE, days=HISTORY_DAYS, max_entries=MAX_HISTORY)
 
 
 def save_posted_article(article: dict):
     """Call this after successfully posting to record the article."""
-    history = _load_history()
-    history.append({
-        "hash":  _article_hash(article["title"]),
-        "title": article["title"][:100],
-        "date":  datetime.now().isoformat(),
-    })
-    _save_history(history)
-    print(f"  📝 Saved to history: {article['title'][:60]}...")
+    try:
+        record_post(_history(), article["title"])
+        print(f"  📝 Saved to history: {article['title'][:60]}...")
+    except OSError as e:
+        print(f"  ⚠️  Could not save history: {e}")
 
 
 def _filter_already_posted(articles: list) -> list:
     """Remove articles that were posted within the last HISTORY_DAYS days."""
-    history     = _load_history()
-    posted_hash = {h["hash"] for h in history}
-    cutoff      = (datetime.now() - timedelta(days=HISTORY_DAYS)).isoformat()
-    recent_hash = {
-        h["hash"] for h in history
-        if h.get("date", "") >= cutoff
-    }
+    history = _history()
 
-    filtered = [a for a in articles if _article_hash(a["title"]) not in recent_hash]
+    filtered, reworded = [], 0
+    for a in articles:
+        posted = find_posted(history, a["title"])
+        if posted is None:
+            filtered.append(a)
+        elif posted.get("hash") != as_article(a).content_hash:
+            reworded += 1
 
     removed = len(articles) - len(filtered)
     if removed:
-        print(f"  🚫 Filtered out {removed} recently posted articles.")
+        print(f"  🚫 Filtered out {removed} recently posted articles ({reworded} reworded repeats).")
 
     if not filtered:
         print("  ⚠️  All articles were recently posted — resetting filter for today.")
@@ -217,48 +157,59 @@ def _build_articles_list(articles: list[dict]) -> str:
     return "\n".join(lines)
 
 
-def _select_via_gemini(articles: list[dict]) -> dict | None:
-    if not GEMINI_API_KEY:
-        return None
-    try:
-        prompt = SELECTION_PROMPT.format(articles_list=_build_articles_list(articles))
-        resp = requests.post(
-            f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={GEMINI_API_KEY}",
-            json={"contents": [{"parts": [{"text": prompt}]}]},
-            timeout=30,
-        )
-        text = resp.json()["candidates"][0]["content"]["parts"][0]["text"]
-        text = text.strip().replace("```json", "").replace("```", "")
-        return json.loads(text)
-    except Exception as e:
-        print(f"  ⚠️  Gemini selector error: {e}")
-        print(f"  ⚠️  Response: {resp.text[:300] if 'resp' in locals() else 'no response'}")
-        return None
-
-
-def _select_via_openrouter(articles: list[dict]) -> dict | None:
-    if not OPENROUTER_API_KEY:
+def _parse_verdicts(text: str, count: int) -> dict[int, dict] | None:
+    """{index: {"fit", "score", "reason"}} for every article, or None if the answer is incomplete."""
+    text   = text.strip().replace("```json", "").replace("```", "")
+    result = json.loads(text)
+    if not isinstance(result, list):
         return None
-    try:
-        prompt = SELECTION_PROMPT.format(articles_list=_build_articles_list(articles))
-        resp = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                "Content-Type":  "application/json",
-            },
-            json={
-                "model":    "mistralai/mistral-7b-instruct:free",
-                "messages": [{"role": "user", "content": prompt}],
-            },
-            timeout=30,
-        )
-        text = resp.json()["choices"][0]["message"]["content"]
-        text = text.strip().replace("```json", "").replace("```", "")
-        return json.loads(text)
-    except Exception as e:
-        print(f"  ⚠️  OpenRouter selector error: {e}")
+    verdicts = {}
+    for item in result:
+        if not isinstance(item, dict) or not isinstance(item.get("index"), int):
+            continue
+        if 0 <= item["index"] < count:
+            verdicts[item["index"]] = {
+                "fit":    bool(item.get("fit")),
+                "score":  float(item.get("score") or 0),
+                "reason": str(item.get("reason", "")),
+            }
+    return verdicts if len(verdicts) == count else None
+
+
+def _judge_via_llm(articles: list[dict]) -> list[dict] | None:
+    """One verdict per article (same order), or None if the model gave no usable answer."""
+    prompt   = VERDICT_PROMPT.format(articles_list=_build_articles_list(articles))
+    verdicts = llm_client.generate(prompt, parse=lambda text: _parse_verdicts(text, len(articles)),
+                                   label="Selector")
+    return [verdicts[i] for i in range(len(articles))] if verdicts else None
+
+
+def _select_via_llm(articles: list[dict]) -> dict | None:
+    """
+    Best fit article by AI verdict. Stored verdicts are reused; only
+    articles without one are sent to the model, and their verdicts saved.
+    """
+    stored  = article_store.get_verdicts(articles, VERDICT_PAGE, VERDICT_KEY)
+    ids     = [article_store.article_id(a) for a in articles]
+    unseen  = [a for a, aid in zip(articles, ids) if aid not in stored]
+    print(f"  🗂️  {len(articles) - len(unseen)} stored verdicts, {len(unseen)} article(s) to judge.")
+
+    if unseen:
+        judged = _judge_via_llm(unseen)
+        if judged is None:
+            return None
+        article_store.save_verdicts(list(zip(unseen, judged)), VERDICT_PAGE, VERDICT_KEY)
+        stored.update({article_store.article_id(a): v for a, v in zip(unseen, judged)})
+
+    best_idx, best_score = None, None
+    for i, aid in enumerate(ids):
+        verdict = stored[aid]
+        if verdict["fit"] and (best_score is None or verdict["score"] > best_score):
+            best_idx, best_score = i, verdict["score"]
+    if best_idx is None:
+        print("  ⚠️  AI rejected every article.")
         return None
+    return {"selected_index": best_idx, "reason": stored[ids[best_idx]]["reason"]}
 
 
 def _heuristic_select(articles: list[dict]) -> dict:
@@ -275,6 +226,7 @@ def _heuristic_select(articles: list[dict]) -> dict:
 def select_best_article(articles: list[dict]) -> dict | None:
     if not articles:
         return None
+    articles = [as_article(a) for a in articles]
 
     # ── Step 1: Hard filter — remove business-conflicting articles ────────────
     safe = [a for a in articles if _is_business_safe(a)]
@@ -293,14 +245,11 @@ def select_best_article(articles: list[dict]) -> dict | None:
 
     # ── Step 3: AI selection ──────────────────────────────────────────────────
     result = None
-    if GEMINI_API_KEY:
-        print("  🤖 Using Gemini to select article...")
-        result = _select_via_gemini(fresh)
-    elif OPENROUTER_API_KEY:
-        print("  🤖 Using OpenRouter to select article...")
-        result = _select_via_openrouter(fresh)
-    else:
+    if not (GEMINI_API_KEY or OPENROUTER_API_KEY):
         print("  ⚠️  No AI key — using heuristic selection.")
+    elif run_budget.allows("select", SELECT_BUDGET, "heuristic selection"):
+        print("  🤖 Using Gemini / OpenRouter to select article...")
+        result = _select_via_llm(fresh)
 
     if not result:
         result = _heuristic_select(fresh)
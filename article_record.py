@@ -0,0 +1,118 @@
+"""
+article_record.py
+Compact article record shared by every pipeline stage.
+
+Article is a dict (a["title"], .get(), json.dump and the article store all
+keep working) that lazily computes — once — the derived values each stage
+used to rebuild on its own: lower-cased "title summary" text, token set,
+title word set, content hash and the parsed publish datetime. Setting
+title / summary / published_parsed drops the affected cached values.
+
+Fetchers build records at ingest; stages call as_article() on whatever they
+are given, which is free for a record and one copy for a plain dict.
+"""
+
+import re
+import hashlib
+from datetime import datetime
+
+_WORD_RE  = re.compile(r"\w+")
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_UNSET    = object()
+
+# Cached value → keys whose change invalidates it
+_DEPENDS = {
+    "_text":         ("title", "summary"),
+    "_tokens":       ("title", "summary"),
+    "_title_lower":  ("title",),
+    "_title_words":  ("title",),
+    "_hash":         ("title",),
+    "_published_at": ("published_parsed",),
+}
+
+
+def content_hash(title: str) -> str:
+    """Short md5 of the normalised title — the key used by the post histories."""
+    return hashlib.md5(title.lower().strip().encode()).hexdigest()[:12]
+
+
+class Article(dict):
+    __slots__ = tuple(_DEPENDS)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._invalidate(None)
+
+    def _invalidate(self, key) -> None:
+        for slot, keys in _DEPENDS.items():
+            if key is None or key in keys:
+                setattr(self, slot, _UNSET)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate(key)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._invalidate(None)
+
+    def pop(self, key, *default):
+        value = super().pop(key, *default)
+        self._invalidate(key)
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    @property
+    def title_lower(self) -> str:
+        if self._title_lower is _UNSET:
+            self._title_lower = self.get("title", "").lower()
+        return self._title_lower
+
+    @property
+    def text(self) -> str:
+        """Lower-cased "title summary" — what every keyword scorer scans."""
+        if self._text is _UNSET:
+            self._text = f"{self.title_lower} {self.get('summary', '').lower()}"
+        return self._text
+
+    @property
+    def tokens(self) -> frozenset:
+        if self._tokens is _UNSET:
+            self._tokens = frozenset(_WORD_RE.findall(self.text))
+        return self._tokens
+
+    @property
+    def title_words(self) -> frozenset:
+        """Title words with punctuation stripped (as used for title dedup)."""
+        if self._title_words is _UNSET:
+            self._title_words = frozenset(_PUNCT_RE.sub("", self.title_lower.strip()).split())
+        return self._title_words
+
+    @property
+    def content_hash(self) -> str:
+        if self._hash is _UNSET:
+            self._hash = content_hash(self.get("title", ""))
+        return self._hash
+
+    @property
+    def published_at(self) -> datetime | None:
+        """published_parsed as a naive datetime, or None when missing/invalid."""
+        if self._published_at is _UNSET:
+            pub = self.get("published_parsed")
+            try:
+                self._published_at = datetime(*pub[:6]) if pub else None
+            except Exception:
+                self._published_at = None
+        return self._published_at
+
+
+def as_article(article: dict) -> Article:
+    return article if isinstance(article, Article) else Article(article)
@@ -0,0 +1,352 @@
+"""
+article_store.py
+Persistent SQLite store of every fetched article, across runs.
+
+Keyed by page + a hash of the canonical URL (tracking params, fragments
+and trailing slashes stripped) so the same story seen on several days is
+one row with first_seen / last_seen. Fetchers upsert their whole candidate
+list in one transaction; later stages can then ask for "new since last
+run" or query by date/source through indexes instead of re-scanning JSON.
+
+Database: .cache/articles.db  (rows unseen for RETENTION_DAYS are pruned)
+
+Feed watermarks (same database): per page + feed, the GUIDs seen last run
+and the newest published timestamp. take_new_entries() returns only the
+entries past the watermark, so scoring and dedup run on the delta; pass
+full_rescan=True (or set FULL_RESCAN=1) to emit everything again.
+
+AI verdicts (same rows): the selector's per-article judgement — fit /
+reject, reason and a 1-10 rank score — with when and under which prompt
+version it was made. get_verdicts() returns those still valid (same
+prompt key, younger than VERDICT_DAYS) so only unseen articles go to the
+model on the next run.
+
+CLI summary:
+  python article_store.py
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from config import settings
+
+_BASE_DIR      = os.path.dirname(os.path.abspath(__file__))
+DB_PATH        = os.path.join(_BASE_DIR, ".cache", "articles.db")
+RETENTION_DAYS = 90
+MAX_SEEN_GUIDS = 500   # per feed — comfortably more than any feed's window
+VERDICT_DAYS   = 7     # re-judge an article after this long
+FULL_RESCAN    = settings.full_rescan
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "cmpid", "ref")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id             TEXT NOT NULL,
+    url            TEXT NOT NULL,
+    title          TEXT NOT NULL,
+    source         TEXT,
+    page           TEXT NOT NULL,
+    first_seen     TEXT NOT NULL,
+    last_seen      TEXT NOT NULL,
+    published      TEXT,
+    score          REAL,
+    verdict        TEXT,
+    verdict_reason TEXT,
+    verdict_score  REAL,
+    verdict_at     TEXT,
+    verdict_key    TEXT,
+    data           TEXT,
+    PRIMARY KEY (id, page)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_first_seen  ON articles (page, first_seen);
+CREATE INDEX IF NOT EXISTS idx_articles_last_seen   ON articles (page, last_seen);
+CREATE INDEX IF NOT EXISTS idx_articles_source_seen ON articles (source, last_seen);
+
+CREATE TABLE IF NOT EXISTS runs (
+    page       TEXT NOT NULL,
+    started_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_page ON runs (page, started_at);
+
+CREATE TABLE IF NOT EXISTS feed_watermarks (
+    page           TEXT NOT NULL,
+    feed_url       TEXT NOT NULL,
+    last_published TEXT,
+    seen_guids     TEXT NOT NULL,
+    updated_at     TEXT NOT NULL,
+    PRIMARY KEY (page, feed_url)
+);
+"""
+
+_conn = None
+
+
+def _db() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        _conn = sqlite3.connect(DB_PATH)
+        _conn.row_factory = sqlite3.Row
+        _conn.executescript(_SCHEMA)
+        _migrate(_conn)
+    return _conn
+
+
+def _migrate(db: sqlite3.Connection) -> None:
+    """Add columns introduced after a database was created."""
+    have = {row["name"] for row in db.execute("PRAGMA table_info(articles)")}
+    for column, kind in (("verdict_score", "REAL"), ("verdict_at", "TEXT"), ("verdict_key", "TEXT")):
+        if column not in have:
+            db.execute(f"ALTER TABLE articles ADD COLUMN {column} {kind}")
+    db.commit()
+
+
+def canonical_url(url: str) -> str:
+    """Lower-case scheme/host, drop fragment, tracking params and trailing slash."""
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith(TRACKING_PARAMS)]
+    path  = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def article_id(article: dict) -> str:
+    """Stable row key — canonical URL hash, or the title when there is no URL."""
+    key = canonical_url(article["url"]) if article.get("url") else article.get("title", "").lower().strip()
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def _published(article: dict) -> str:
+    pub = article.get("published_parsed")
+    if pub:
+        try:
+            return datetime(*pub[:6]).isoformat()
+        except Exception:
+            pass
+    return article.get("published", "") or ""
+
+
+def upsert_articles(articles: list[dict], page: str, score_key: str = "score") -> int:
+    """
+    Insert or refresh a batch of articles in one transaction.
+    Existing rows keep first_seen and any stored verdict; last_seen, title
+    and score are refreshed. Returns the number of rows written.
+    """
+    if not articles:
+        return 0
+    now  = datetime.now().isoformat()
+    rows = [(
+        article_id(a),
+        a.get("url", ""),
+        a.get("title", ""),
+        a.get("source", ""),
+        page,
+        now,
+        now,
+        _published(a),
+        a.get(score_key),
+        json.dumps(a, default=str, ensure_ascii=False),
+    ) for a in articles if a.get("title")]
+    cutoff = (datetime.now() - timedelta(days=RETENTION_DAYS)).isoformat()
+    try:
+        with _db() as db:
+            db.executemany("""
+                INSERT INTO articles (id, url, title, source, page, first_seen, last_seen, published, score, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id, page) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    title     = excluded.title,
+                    score     = COALESCE(excluded.score, articles.score),
+                    data      = excluded.data
+            """, rows)
+            db.execute("DELETE FROM articles WHERE last_seen < ?", (cutoff,))
+    except sqlite3.Error as e:
+        print(f"  ⚠️  Article store error: {e}")
+        return 0
+    return len(rows)
+
+
+def record_run(page: str) -> str | None:
+    """Mark the start of a run. Returns the previous run's start time (or None)."""
+    previous = last_run(page)
+    with _db() as db:
+        db.execute("INSERT INTO runs (page, started_at) VALUES (?, ?)", (page, datetime.now().isoformat()))
+    return previous
+
+
+def last_run(page: str) -> str | None:
+    row = _db().execute("SELECT MAX(started_at) FROM runs WHERE page = ?", (page,)).fetchone()
+    return row[0] if row else None
+
+
+def new_since(since: str, page: str) -> list[dict]:
+    """Articles first seen after `since` (ISO timestamp), newest first."""
+    rows = _db().execute(
+        "SELECT data FROM articles WHERE page = ? AND first_seen > ? ORDER BY first_seen DESC",
+        (page, since),
+    ).fetchall()
+    return [json.loads(r["data"]) for r in rows]
+
+
+def seen_between(page: str, start: str, end: str | None = None, source: str | None = None) -> list[sqlite3.Row]:
+    """Rows last seen within [start, end], optionally for one source."""
+    end = end or datetime.now().isoformat()
+    if source:
+        return _db().execute(
+            "SELECT * FROM articles WHERE source = ? AND last_seen BETWEEN ? AND ? AND page = ?",
+            (source, start, end, page),
+        ).fetchall()
+    return _db().execute(
+        "SELECT * FROM articles WHERE page = ? AND last_seen BETWEEN ? AND ? ORDER BY last_seen DESC",
+        (page, start, end),
+    ).fetchall()
+
+
+def counts_by_source(page: str, days: int = 7) -> list[tuple[str, int, int]]:
+    """(source, articles seen, articles first seen) over the last `days` days."""
+    since = (datetime.now() - timedelta(days=days)).isoformat()
+    return [tuple(r) for r in _db().execute("""
+        SELECT source,
+               COUNT(*),
+               SUM(CASE WHEN first_seen >= ? THEN 1 ELSE 0 END)
+        FROM articles
+        WHERE page = ? AND last_seen >= ?
+        GROUP BY source
+        ORDER BY COUNT(*) DESC
+    """, (since, page, since)).fetchall()]
+
+
+# ── Feed watermarks ────────────────────────────────────────────────────────────
+
+def _entry_guid(entry: dict) -> str:
+    return entry.get("id") or entry.get("link") or entry.get("title", "")
+
+
+def take_new_entries(page: str, feed_url: str, entries: list[dict],
+                     full_rescan: bool = False) -> list[dict]:
+    """
+    Return the entries of one feed that are newer than this page's watermark,
+    then advance the watermark. An entry is new when its GUID was not seen
+    last run and it is not dated at/before the newest entry already seen
+    (guards feeds that regenerate GUIDs). First run → every entry is new.
+    """
+    guids     = [_entry_guid(e) for e in entries]
+    published = [_published(e) if e.get("published_parsed") else "" for e in entries]
+    try:
+        db  = _db()
+        row = db.execute(
+            "SELECT last_published, seen_guids FROM feed_watermarks WHERE page = ? AND feed_url = ?",
+            (page, feed_url),
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"  ⚠️  Watermark read error ({e}) — treating every entry as new")
+        return list(entries)
+
+    watermark = (row["last_published"] if row else "") or ""
+    seen      = json.loads(row["seen_guids"]) if row else []
+    if row and not (full_rescan or FULL_RESCAN):
+        seen_set = set(seen)
+        fresh    = [e for e, g, p in zip(entries, guids, published)
+                    if g not in seen_set and not (watermark and p and p <= watermark)]
+    else:
+        fresh    = list(entries)
+
+    current = set(guids)
+    kept    = guids + [g for g in seen if g not in current]
+    newest  = max([watermark] + published)
+    try:
+        with db:
+            db.execute("""
+                INSERT INTO feed_watermarks (page, feed_url, last_published, seen_guids, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(page, feed_url) DO UPDATE SET
+                    last_published = excluded.last_published,
+                    seen_guids     = excluded.seen_guids,
+                    updated_at     = excluded.updated_at
+            """, (page, feed_url, newest, json.dumps(kept[:MAX_SEEN_GUIDS]), datetime.now().isoformat()))
+    except sqlite3.Error as e:
+        print(f"  ⚠️  Watermark write error: {e}")
+    return fresh
+
+
+def get_verdicts(articles: list[dict], page: str, key: str) -> dict[str, dict]:
+    """
+    Stored verdicts for these articles made under prompt `key` within the
+    last VERDICT_DAYS, as {article_id: {"fit", "reason", "score"}}.
+    """
+    ids    = list({article_id(a) for a in articles})
+    cutoff = (datetime.now() - timedelta(days=VERDICT_DAYS)).isoformat()
+    found  = {}
+    try:
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows  = _db().execute(f"""
+                SELECT id, verdict, verdict_reason, verdict_score FROM articles
+                WHERE page = ? AND verdict_key = ? AND verdict_at >= ?
+                  AND id IN ({",".join("?" * len(chunk))})
+            """, (page, key, cutoff, *chunk)).fetchall()
+            for r in rows:
+                found[r["id"]] = {"fit": r["verdict"] == "fit", "reason": r["verdict_reason"] or "",
+                                  "score": r["verdict_score"] or 0}
+    except sqlite3.Error as e:
+        print(f"  ⚠️  Article store error: {e}")
+    return found
+
+
+def save_verdicts(judged: list[tuple[dict, dict]], page: str, key: str) -> int:
+    """
+    Store (article, {"fit", "reason", "score"}) verdicts made under prompt
+    `key`. Articles not in the store yet are inserted. Returns rows written.
+    """
+    now  = datetime.now().isoformat()
+    rows = [(
+        article_id(a),
+        a.get("url", ""),
+        a.get("title", ""),
+        a.get("source", ""),
+        page,
+        now,
+        now,
+        _published(a),
+        json.dumps(a, default=str, ensure_ascii=False),
+        "fit" if v.get("fit") else "reject",
+        v.get("reason", ""),
+        v.get("score"),
+        now,
+        key,
+    ) for a, v in judged if a.get("title")]
+    try:
+        with _db() as db:
+            db.executemany("""
+                INSERT INTO articles (id, url, title, source, page, first_seen, last_seen, published, data,
+                                      verdict, verdict_reason, verdict_score, verdict_at, verdict_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id, page) DO UPDATE SET
+                    verdict        = excluded.verdict,
+                    verdict_reason = excluded.verdict_reason,
+                    verdict_score  = excluded.verdict_score,
+                    verdict_at     = excluded.verdict_at,
+                    verdict_key    = excluded.verdict_key
+            """, rows)
+    except sqlite3.Error as e:
+        print(f"  ⚠️  Article store error: {e}")
+        return 0
+    return len(rows)
+
+
+def pages() -> list[str]:
+    return [r[0] for r in _db().execute("SELECT DISTINCT page FROM articles ORDER BY page")]
+
+
+if __name__ == "__main__":
+    for page in pages():
+        rows = counts_by_source(page)
+        if not rows:
+            continue
+        print(f"\n{page.upper()} — last 7 days (last run: {last_run(page) or 'never'})")
+        width = max(len(r[0] or "") for r in rows)
+        for source, seen, new in rows:
+            print(f"  {source or '?':<{width}}  {seen:>4} seen  {new:>4} new")
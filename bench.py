@@ -0,0 +1,358 @@
+"""
+bench.py
+Micro-benchmarks for the hot paths, on synthetic data (no network).
+Each subcommand prints a table and exits non-zero when its check fails.
+
+  python bench.py keywords [--n 10000]   word-boundary blocklists vs substring scans
+  python bench.py viral                  cost of the per-feature breakdown in score_articles_batch (+ parity)
+  python bench.py dedup                  MinHash/LSH near-dup index vs pairwise title compare
+  python bench.py repeats                post-history repeat lookups from stored fingerprints
+  python bench.py importtime             cold `import main` / `import lp_main` (no heavy deps)
+"""
+
+import sys
+import time
+import random
+import argparse
+import subprocess
+from pathlib import Path
+from datetime import datetime, timedelta
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / "lp"))
+
+import scoring_rules
+from keyword_matcher import build_matcher, scan
+from article_record import Article
+
+# Neutral filler — none of these may hit any blocklist
+FILLER = (
+    "study finds people who sleep well have more energy at work new report shows "
+    "families budget for school year simple morning routine helps teams plan growth "
+    "experts say small daily habits matter local health workers share tips on stress"
+).split()
+
+# Words that contain a blocklist term without being it: war, nba, iran, rape,
+# killed, crime, trump, filler ... — substring scans reject these articles
+TRAPS = [
+    "software", "reward", "award", "toward", "hardware", "unbalanced", "miranda",
+    "grape", "therapeutic", "skilled", "crimean", "trumpet", "warranty", "stewardship",
+]
+
+
+def _timed(fn, items) -> tuple[list, float]:
+    start = time.perf_counter()
+    out   = [fn(x) for x in items]
+    return out, time.perf_counter() - start
+
+
+def _substring_scan(terms: list[str]):
+    """The pre-matcher check: `kw in text` for every keyword."""
+    def check(text: str) -> bool:
+        text = text.lower()
+        return any(kw in text for kw in terms)
+    return check
+
+
+def _inject(term: str) -> str:
+    """A real occurrence of a blocklist rule: stems get an ending, words may be plural."""
+    if term.endswith("*"):
+        return term[:-1] + random.choice(["s", "ing", "ed", ""])
+    plural = "es" if term.endswith(("s", "x", "z", "ch", "sh")) else "s"
+    return term + random.choice(["", "", plural])
+
+
+def _keyword_corpus(terms: list[str], n: int) -> tuple[list[str], list[bool]]:
+    texts, gold = [], []
+    for _ in range(n):
+        words = random.choices(FILLER, k=random.randint(20, 60))
+        if random.random() < 0.3:
+            words.insert(random.randrange(len(words)), random.choice(TRAPS))
+        blocked = random.random() < 0.2
+        if blocked:
+            words.insert(random.randrange(len(words)), _inject(random.choice(terms)))
+        texts.append(" ".join(words).capitalize())
+        gold.append(blocked)
+    return texts, gold
+
+
+def bench_keywords(n: int) -> bool:
+    from brand_voice import FORBIDDEN_TERMS
+
+    lists = [
+        ("business.hard_block", scoring_rules.plan("business")["keywords"]["hard_block"]),
+        ("lp.negative",         scoring_rules.plan("lp")["keywords"]["negative"]),
+        ("FORBIDDEN_TERMS",     FORBIDDEN_TERMS),
+    ]
+    print(f"🔑 Keyword blocklists — {n:,} synthetic articles per list\n")
+    print(f"  {'LIST':<22} {'ENGINE':<10} {'TIME':>8} {'BLOCKED':>8} {'FALSE +':>8} {'FALSE -':>8}")
+    print(f"  {'-' * 22} {'-' * 10} {'-' * 8} {'-' * 8} {'-' * 8} {'-' * 8}")
+
+    ok = True
+    for name, terms in lists:
+        random.seed(42)
+        texts, gold = _keyword_corpus(terms, n)
+        plain       = [t.rstrip("*") for t in terms]
+        matcher     = build_matcher({"block": terms}, word_categories=("block",))
+
+        legacy, t_legacy = _timed(_substring_scan(plain), texts)
+        engine, t_engine = _timed(lambda t: bool(scan(matcher, t)["block"]), texts)
+
+        for label, result, secs in (("substring", legacy, t_legacy), ("word", engine, t_engine)):
+            fp = sum(1 for r, g in zip(result, gold) if r and not g)
+            fn = sum(1 for r, g in zip(result, gold) if g and not r)
+            print(f"  {name:<22} {label:<10} {secs * 1000:>6.0f}ms {sum(result):>8} {fp:>8} {fn:>8}")
+            if label == "word" and (fp or fn):
+                ok = False
+    print("\n✅ Word engine matched the ground truth exactly" if ok
+          else "\n❌ Word engine disagreed with the ground truth")
+    return ok
+
+
+def _viral_corpus(n: int) -> list[dict]:
+    keywords = scoring_rules.plan("viral")["keywords"]
+    vocab    = (list(keywords["viral"]) + keywords["surprise"] + keywords["action"]
+                + FILLER + ["you", "your", "10", "3"])
+    now   = datetime.now()
+    cats  = ["Research", "Nutrition", "General Health", "Cardiology", "Public Health"]
+    articles = []
+    for _ in range(n):
+        # Half-hour offsets keep every article clear of the recency/age thresholds
+        pub = now - timedelta(hours=random.randint(0, 24 * 20) + 0.5)
+        articles.append({
+            "title":              " ".join(random.choices(vocab, k=random.randint(4, 18)))
+                                  + random.choice(["", "", "?"]),
+            "summary":            " ".join(random.choices(vocab, k=random.randint(0, 40))),
+            "published_parsed":   random.choice([list(pub.timetuple())[:9], None, [2026, 13, 40, 0, 0, 0]]),
+            "source_credibility": random.randint(1, 10),
+            "category":           random.choice(cats),
+        })
+    return articles
+
+
+def bench_viral(sizes: list[int]) -> bool:
+    from gemini_health_finder import calculate_enhanced_viral_score, score_articles_batch
+
+    print("🔥 Viral scorer — per-article loop vs score_articles_batch (same scorer + per-feature breakdown)\n")
+    print(f"  {'ARTICLES':>8}  {'ENGINE':<13} {'TIME':>9} {'SPEEDUP':>8} {'PARITY':>7}")
+    print(f"  {'-' * 8}  {'-' * 13} {'-' * 9} {'-' * 8} {'-' * 7}")
+
+    ok = True
+    for n in sizes:
+        random.seed(n)
+        articles = _viral_corpus(n)
+        scoring_rules.clear_cache()   # keyword scans are cached per text — time them cold
+        scalar, t_scalar = _timed(calculate_enhanced_viral_score, [Article(a) for a in articles])
+        print(f"  {n:>8,}  {'loop':<13} {t_scalar * 1000:>7.1f}ms {'1.0x':>8} {'—':>7}")
+        scoring_rules.clear_cache()
+        records   = [Article(a) for a in articles]   # fresh records: no cached fields
+        start     = time.perf_counter()
+        scores, _ = score_articles_batch(records)
+        secs      = time.perf_counter() - start
+        same      = scores == scalar
+        ok        = ok and same
+        print(f"  {n:>8,}  {'batch':<13} {secs * 1000:>7.1f}ms {t_scalar / secs:>7.1f}x {'ok' if same else 'FAIL':>7}")
+    print("\n✅ Batch scores identical to the per-article scorer" if ok
+          else "\n❌ Batch scores differ from the per-article scorer")
+    return ok
+
+
+def _pairwise_dedup(titles: list[str], threshold: float) -> list[int]:
+    """The pre-index dedup: every title against every title kept so far."""
+    from near_dup import shingles, jaccard
+    kept, sets = [], []
+    for i, title in enumerate(titles):
+        words = shingles(title)
+        if words and all(jaccard(words, seen) < threshold for seen in sets):
+            kept.append(i)
+            sets.append(words)
+    return kept
+
+
+def _reword(title: str) -> str:
+    """A wire-copy rewrite: same words, new order, maybe one dropped or added."""
+    words = title.split()
+    random.shuffle(words)
+    if len(words) > 9 and random.random() < 0.5:
+        words.pop(random.randrange(len(words)))
+    if random.random() < 0.3:
+        words.insert(random.randrange(len(words)), random.choice(FILLER))
+    return " ".join(words).capitalize() + random.choice(["", ",", " —", ":"])
+
+
+def _dedup_corpus(n: int, threshold: float) -> tuple[list[str], set[int]]:
+    """Random titles plus ~20% rewrites of earlier ones (the injected duplicates)."""
+    from near_dup import shingles, jaccard
+    vocab  = [f"w{i}" for i in range(20_000)] + FILLER
+    titles, dups = [], set()
+    for i in range(n):
+        if titles and random.random() < 0.2:
+            source = random.choice(titles)
+            copy   = _reword(source)
+            if jaccard(shingles(copy), shingles(source)) >= threshold:
+                titles.append(copy)
+                dups.add(i)
+                continue
+        titles.append(" ".join(random.choices(vocab, k=random.randint(8, 14))))
+    return titles, dups
+
+
+def _dropped_share(dups: set[int], kept: set[int]) -> float:
+    """Share of the injected duplicates that dedup removed."""
+    return len(dups - kept) / len(dups) if dups else 1.0
+
+
+def bench_dedup(sizes: list[int], threshold: float, pairwise_max: int) -> bool:
+    from near_dup import make_index, dedup_articles
+
+    index = make_index(threshold)
+    print(f"🧬 Near-duplicate titles — Jaccard ≥ {threshold}, "
+          f"LSH {index['bands']} bands × {index['rows']} rows\n")
+    print(f"  {'TITLES':>7}  {'ENGINE':<9} {'TIME':>9} {'µs/TITLE':>9} {'DROPPED':>8} {'RECALL':>7} {'AGREE':>7}")
+    print(f"  {'-' * 7}  {'-' * 9} {'-' * 9} {'-' * 9} {'-' * 8} {'-' * 7} {'-' * 7}")
+
+    ok = True
+    for n in sizes:
+        random.seed(n)
+        titles, dups = _dedup_corpus(n, threshold)
+        articles     = [{"title": t, "i": i} for i, t in enumerate(titles)]
+
+        start = time.perf_counter()
+        kept  = {a["i"] for a in dedup_articles(articles, threshold=threshold)}
+        t_lsh = time.perf_counter() - start
+
+        baseline = None
+        if n <= pairwise_max:
+            start    = time.perf_counter()
+            baseline = set(_pairwise_dedup(titles, threshold))
+            t_pair   = time.perf_counter() - start
+            print(f"  {n:>7,}  {'pairwise':<9} {t_pair * 1000:>7.0f}ms {t_pair / n * 1e6:>9.1f} "
+                  f"{n - len(baseline):>8,} {_dropped_share(dups, baseline):>7.1%} {'—':>7}")
+
+        recall = _dropped_share(dups, kept)
+        agree  = 1 - len(kept ^ baseline) / n if baseline is not None else None
+        ok     = ok and recall >= 0.95 and (agree is None or agree >= 0.99)
+        print(f"  {n:>7,}  {'lsh':<9} {t_lsh * 1000:>7.0f}ms {t_lsh / n * 1e6:>9.1f} "
+              f"{n - len(kept):>8,} {recall:>7.1%} {'—' if agree is None else f'{agree:.1%}':>7}")
+    print("\n✅ LSH index caught ≥95% of rewrites and agreed with the pairwise dedup" if ok
+          else "\n❌ LSH index missed too many duplicates or disagreed with the pairwise dedup")
+    return ok
+
+
+def bench_repeats(sizes: list[int], queries: int) -> bool:
+    from near_dup import REPEAT_THRESHOLD, shingles, jaccard, fingerprint, make_repeat_index, find_repeat
+
+    print(f"🔁 Post-history repeats — estimated Jaccard ≥ {REPEAT_THRESHOLD}, {queries:,} rewrites "
+          f"+ {queries:,} unrelated titles per size\n")
+    print(f"  {'HISTORY':>7}  {'BUILD':>8} {'µs/QUERY':>9} {'CAUGHT':>7} {'FALSE +':>8}")
+    print(f"  {'-' * 7}  {'-' * 8} {'-' * 9} {'-' * 7} {'-' * 8}")
+
+    vocab = [f"w{i}" for i in range(20_000)] + FILLER
+    ok    = True
+    for n in sizes:
+        random.seed(n)
+        history  = [{"title": " ".join(random.choices(vocab, k=random.randint(8, 14)))} for _ in range(n)]
+        for entry in history:
+            entry["fingerprint"] = fingerprint(entry["title"])   # as save_posted_article() stores it
+        rewrites = []
+        while len(rewrites) < queries:
+            source = random.choice(history)["title"]
+            copy   = _reword(source)
+            if jaccard(shingles(copy), shingles(source)) >= REPEAT_THRESHOLD + 0.1:
+                rewrites.append(copy)
+        unrelated = [" ".join(random.choices(vocab, k=random.randint(8, 14))) for _ in range(queries)]
+
+        start   = time.perf_counter()
+        index   = make_repeat_index(history)
+        t_build = time.perf_counter() - start
+        caught, t_hit  = _timed(lambda t: find_repeat(index, t) is not None, rewrites)
+        false, t_miss  = _timed(lambda t: find_repeat(index, t) is not None, unrelated)
+        per_query = (t_hit + t_miss) / (2 * queries) * 1e6
+        recall    = sum(caught) / queries
+        ok        = ok and recall >= 0.95 and sum(false) <= queries // 100 and per_query < 1000
+        print(f"  {n:>7,}  {t_build * 1000:>6.0f}ms {per_query:>9.1f} {recall:>7.1%} {sum(false):>8}")
+    print("\n✅ Sub-millisecond lookups, ≥95% of rewrites caught, ≤1% false repeats" if ok
+          else "\n❌ Repeat index too slow or inaccurate")
+    return ok
+
+
+# Imported only when a run actually needs them — never by `import main`
+HEAVY_IMPORTS = ("requests", "PIL", "feedparser", "google.genai")
+IMPORT_MAX_MS = 150   # cold import budget per entry point (also enforced by tests/test_import_time.py)
+
+
+def _import_profile(module: str, cwd: Path) -> dict[str, int]:
+    """
+    {name: cumulative µs} for `module` and everything its import pulled in,
+    from a fresh `python -X importtime -c "import <module>"`.
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=cwd, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []   # (depth, name, µs) — children are listed before their parent, indented deeper
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            name = parts[2].rstrip()
+            rows.append((len(name) - len(name.lstrip()), name.strip(), int(parts[1])))
+    end   = max(i for i, (_, name, _) in enumerate(rows) if name == module)
+    depth = rows[end][0]
+    start = end
+    while start > 0 and rows[start - 1][0] > depth:   # the module's own subtree
+        start -= 1
+    return {name: us for _, name, us in rows[start:end + 1]}
+
+
+def bench_importtime(max_ms: float, repeat: int) -> bool:
+    targets = [("main", ROOT), ("lp_main", ROOT / "lp")]
+    print(f"📦 Cold import time — best of {repeat} fresh interpreters, limit {max_ms:.0f}ms\n")
+    print(f"  {'MODULE':<9} {'IMPORT':>8}  {'SLOWEST DEPENDENCIES':<56} HEAVY")
+    print(f"  {'-' * 9} {'-' * 8}  {'-' * 56} {'-' * 5}")
+
+    ok = True
+    for module, cwd in targets:
+        runs    = [_import_profile(module, cwd) for _ in range(repeat)]
+        best    = min(runs, key=lambda t: t.get(module, 0))
+        ms      = best.get(module, 0) / 1000
+        heavy   = sorted({h for h in HEAVY_IMPORTS for name in best if name == h or name.startswith(h + ".")})
+        slowest = sorted((n for n in best if n != module), key=lambda n: -best[n])[:3]
+        ok      = ok and ms <= max_ms and not heavy
+        deps    = ", ".join(f"{n} {best[n] / 1000:.0f}ms" for n in slowest)
+        print(f"  {module:<9} {ms:>6.0f}ms  {deps[:56]:<56} {', '.join(heavy) or '—'}")
+    print(f"\n✅ Both entry points import in ≤{max_ms:.0f}ms without {', '.join(HEAVY_IMPORTS)}" if ok
+          else f"\n❌ An entry point is slower than {max_ms:.0f}ms or imports a heavy dependency up front")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="News-generator micro-benchmarks")
+    sub    = parser.add_subparsers(dest="bench", required=True)
+    kw     = sub.add_parser("keywords", help="Word-boundary blocklists vs substring scans")
+    kw.add_argument("--n", type=int, default=10_000, help="Synthetic articles per list")
+    vs     = sub.add_parser("viral", help="Per-feature breakdown overhead of the batch scorer, with parity check")
+    vs.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    dd     = sub.add_parser("dedup", help="MinHash/LSH near-dup index vs pairwise compare")
+    dd.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000, 10_000, 50_000])
+    dd.add_argument("--threshold", type=float, default=0.7, help="Jaccard threshold")
+    dd.add_argument("--pairwise-max", type=int, default=5_000,
+                    help="Largest size the quadratic baseline is run on")
+    rp     = sub.add_parser("repeats", help="Post-history repeat lookups from stored fingerprints")
+    rp.add_argument("--sizes", type=int, nargs="+", default=[200, 2_000, 20_000])
+    rp.add_argument("--queries", type=int, default=1_000, help="Rewritten (and unrelated) titles per size")
+    it     = sub.add_parser("importtime", help="Cold import of main / lp_main, with no heavy deps")
+    it.add_argument("--max-ms", type=float, default=IMPORT_MAX_MS, help="Slowest acceptable import, in ms")
+    it.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module (best is kept)")
+    args = parser.parse_args()
+
+    if args.bench == "keywords":
+        passed = bench_keywords(args.n)
+    elif args.bench == "viral":
+        passed = bench_viral(args.sizes)
+    elif args.bench == "dedup":
+        passed = bench_dedup(args.sizes, args.threshold, args.pairwise_max)
+    elif args.bench == "repeats":
+        passed = bench_repeats(args.sizes, args.queries)
+    elif args.bench == "importtime":
+        passed = bench_importtime(args.max_ms, args.repeat)
+    sys.exit(0 if passed else 1)
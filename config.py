@@ -0,0 +1,112 @@
+"""
+config.py
+Every setting the repo reads from the environment, loaded once.
+
+The .env file at the repo root is read on first import (when python-dotenv
+is installed — in CI the values come from the workflow's env instead); real
+environment variables win over .env. Modules take what they need from the
+one `settings` object instead of each calling load_dotenv() and os.getenv()
+on import:
+
+  from config import settings
+  GEMINI_API_KEY = settings.gemini_api_key
+
+Settings are read at first import, so tests / benches that change the
+environment must do so before importing the pipeline modules.
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    from dotenv import load_dotenv
+    DOTENV_AVAILABLE = True
+except ImportError:
+    DOTENV_AVAILABLE = False
+
+ROOT     = Path(__file__).resolve().parent
+ENV_FILE = ROOT / ".env"
+
+
+def _yes(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class Settings:
+    # ── API keys / page credentials ───────────────────────────────────────────
+    gemini_api_key:          str
+    openrouter_api_key:      str
+    hf_api_token:            str
+    news_api_key:            str
+    fb_page_id:              str
+    fb_access_token:         str
+    fb_lp_page_id:           str
+    fb_lp_page_access_token: str
+
+    # ── LP CLI defaults ───────────────────────────────────────────────────────
+    post_format:             str
+    post_hook:               str
+
+    # ── Fetching ──────────────────────────────────────────────────────────────
+    feed_fetch_deadline:     float
+    feed_connect_timeout:    float
+    feed_read_timeout:       float
+    feed_breaker_threshold:  int
+    full_rescan:             bool
+
+    # ── Scoring / dedup ───────────────────────────────────────────────────────
+    scoring_rules_file:      str
+    dedup_jaccard:           float
+    repeat_jaccard:          float
+
+    # ── LLM ───────────────────────────────────────────────────────────────────
+    llm_hedge:               bool
+    llm_cache:               bool
+    llm_cache_ttl_hours:     float
+    llm_cache_max_mb:        float
+
+    # ── Runs ──────────────────────────────────────────────────────────────────
+    run_budget:              float
+    serve_catch_up_hours:    float
+
+
+def load() -> Settings:
+    """Read .env (if present) and the environment into a Settings."""
+    if DOTENV_AVAILABLE and ENV_FILE.exists():
+        load_dotenv(ENV_FILE)
+    return Settings(
+        gemini_api_key          = os.getenv("GEMINI_API_KEY", ""),
+        openrouter_api_key      = os.getenv("OPENROUTER_API_KEY", ""),
+        hf_api_token            = os.getenv("HF_API_TOKEN", ""),
+        news_api_key            = os.getenv("NEWS_API_KEY", ""),
+        fb_page_id              = os.getenv("FB_PAGE_ID", ""),
+        fb_access_token         = os.getenv("FB_ACCESS_TOKEN", ""),
+        fb_lp_page_id           = os.getenv("FB_LP_PAGE_ID", ""),
+        fb_lp_page_access_token = os.getenv("FB_LP_PAGE_ACCESS_TOKEN", ""),
+
+        post_format             = os.getenv("POST_FORMAT", "any"),
+        post_hook               = os.getenv("POST_HOOK", "any"),
+
+        feed_fetch_deadline     = float(os.getenv("FEED_FETCH_DEADLINE", "45")),
+        feed_connect_timeout    = float(os.getenv("FEED_CONNECT_TIMEOUT", "5")),
+        feed_read_timeout       = float(os.getenv("FEED_READ_TIMEOUT", "10")),
+        feed_breaker_threshold  = int(os.getenv("FEED_BREAKER_THRESHOLD", "3")),
+        full_rescan             = _yes("FULL_RESCAN"),
+
+        scoring_rules_file      = os.getenv("SCORING_RULES_FILE", str(ROOT / "scoring_rules.toml")),
+        dedup_jaccard           = float(os.getenv("DEDUP_JACCARD", "0.7")),
+        repeat_jaccard          = float(os.getenv("REPEAT_JACCARD", "0.6")),
+
+        llm_hedge               = _yes("LLM_HEDGE"),
+        llm_cache               = os.getenv("LLM_CACHE", "1").lower() not in ("0", "false", "no"),
+        llm_cache_ttl_hours     = float(os.getenv("LLM_CACHE_TTL_HOURS", "24")),
+        llm_cache_max_mb        = float(os.getenv("LLM_CACHE_MAX_MB", "20")),
+
+        run_budget              = float(os.getenv("RUN_BUDGET", "300")),
+        serve_catch_up_hours    = float(os.getenv("SERVE_CATCH_UP_HOURS", "6")),
+    )
+
+
+settings = load()
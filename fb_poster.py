@@ -7,14 +7,11 @@ Requires in .env:
   FB_ACCESS_TOKEN  (Page access token with pages_manage_posts + pages_manage_engagement)
 """
 
-import os
-import requests
-from dotenv import load_dotenv
+import http_client
+from config import settings
 
-load_dotenv()
-
-FB_PAGE_ID      = os.getenv("FB_PAGE_ID", "")
-FB_ACCESS_TOKEN = os.getenv("FB_ACCESS_TOKEN", "")
+FB_PAGE_ID      = settings.fb_page_id
+FB_ACCESS_TOKEN = settings.fb_access_token
 GRAPH_API_URL   = "https://graph.facebook.com/v19.0"
 
 
@@ -32,7 +29,7 @@ def post_to_facebook(image_path: str, caption: str, article_url: str = "") -> bo
         # Step 1: Upload photo (unpublished)
         print("  📤 Uploading image to Facebook...")
         with open(image_path, "rb") as f:
-            upload_resp = requests.post(
+            upload_resp = http_client.post(
                 f"{GRAPH_API_URL}/{FB_PAGE_ID}/photos",
                 data={
                     "access_token": FB_ACCESS_TOKEN,
@@ -52,7 +49,7 @@ def post_to_facebook(image_path: str, caption: str, article_url: str = "") -> bo
 
         # Step 2: Publish post with photo attached
         print("  📢 Publishing post...")
-        post_resp = requests.post(
+        post_resp = http_client.post(
             f"{GRAPH_API_URL}/{FB_PAGE_ID}/feed",
             data={
                 "access_token":       FB_ACCESS_TOKEN,
@@ -60,6 +57,7 @@ def post_to_facebook(image_path: str, caption: str, article_url: str = "") -> bo
                 "attached_media[0]":  f'{{"media_fbid":"{photo_id}"}}',
             },
             timeout=30,
+            retries=0,   # a retried 5xx could publish the post twice
         )
 
         post_data = post_resp.json()
@@ -76,13 +74,14 @@ def post_to_facebook(image_path: str, caption: str, article_url: str = "") -> bo
             # Small delay to ensure post is fully published before commenting
             import time
             time.sleep(3)
-            comment_resp = requests.post(
+            comment_resp = http_client.post(
                 f"{GRAPH_API_URL}/{post_id}/comments",
                 data={
                     "access_token": FB_ACCESS_TOKEN,
                     "message":      f"🔗 Read the full article here: {article_url}",
                 },
                 timeout=15,
+                retries=0,
             )
             comment_data = comment_resp.json()
             if "id" in comment_data:
@@ -0,0 +1,117 @@
+"""
+feed_cache.py
+Conditional-GET cache shared by every RSS reader in the repo.
+
+Stores each feed's ETag, Last-Modified and parsed entries in
+.cache/feed_cache.json. On the next run the validators are sent back
+(If-None-Match / If-Modified-Since) and a 304 returns the cached entries
+without downloading or parsing the body again.
+
+Every download has explicit connect/read timeouts — feedparser.parse(url)
+has none, so one hanging host could stall the whole job — and is tried
+once (no retries), so a dead host costs at most one connect timeout.
+  FEED_CONNECT_TIMEOUT  seconds to establish the connection (default 5)
+  FEED_READ_TIMEOUT     seconds between bytes once connected (default 10)
+
+Usage:
+  entries = parse_feed(url)   # list of plain entry dicts
+  save_feed_cache()           # once, after the fetch stage
+"""
+
+import os
+import json
+import threading
+import http_client
+from config import settings
+
+_BASE_DIR  = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR  = os.path.join(_BASE_DIR, ".cache")
+CACHE_FILE = os.path.join(CACHE_DIR, "feed_cache.json")
+
+# Only the fields our readers use are kept — keeps the cache file small
+ENTRY_FIELDS = ("id", "title", "link", "summary", "description", "published", "published_parsed")
+
+FEED_CONNECT_TIMEOUT = settings.feed_connect_timeout
+FEED_READ_TIMEOUT    = settings.feed_read_timeout
+
+_lock  = threading.Lock()
+_cache = None
+_dirty = False
+
+
+def _load() -> dict:
+    global _cache
+    if _cache is None:
+        try:
+            with open(CACHE_FILE) as f:
+                _cache = json.load(f)
+        except Exception:
+            _cache = {}
+    return _cache
+
+
+def _entry_to_dict(entry) -> dict:
+    out = {}
+    for key in ENTRY_FIELDS:
+        value = entry.get(key)
+        if value is None:
+            continue
+        # time.struct_time → list so it round-trips through JSON
+        out[key] = list(value) if key == "published_parsed" else value
+    return out
+
+
+def parse_feed(url: str) -> list[dict]:
+    """
+    Fetch a feed with conditional GET. Returns entries as plain dicts.
+    On 304 Not Modified the cached entries are returned unchanged.
+    Raises requests exceptions (timeouts, HTTP errors) to the caller.
+    """
+    import feedparser   # on first fetch — a run that never reads a feed skips the import
+    global _dirty
+    with _lock:
+        cached = dict(_load().get(url) or {})
+
+    headers = {"User-Agent": feedparser.USER_AGENT}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("modified"):
+        headers["If-Modified-Since"] = cached["modified"]
+
+    # No retries: a dead host must cost one connect timeout, not three plus backoff —
+    # the feed is simply retried on the next run
+    resp = http_client.get(url, headers=headers, timeout=(FEED_CONNECT_TIMEOUT, FEED_READ_TIMEOUT),
+                           retries=0)
+    if resp.status_code == 304 and "entries" in cached:
+        return cached["entries"]
+    resp.raise_for_status()
+
+    response_headers = {k.lower(): v for k, v in resp.headers.items()}
+    response_headers.setdefault("content-location", resp.url)
+    feed = feedparser.parse(resp.content, response_headers=response_headers)
+
+    entries = [_entry_to_dict(e) for e in feed.entries]
+    if entries:
+        with _lock:
+            _load()[url] = {
+                "etag":     resp.headers.get("ETag"),
+                "modified": resp.headers.get("Last-Modified"),
+                "entries":  entries,
+            }
+            _dirty = True
+    return entries
+
+
+def save_feed_cache() -> None:
+    """Persist validators + entries fetched during this run."""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(CACHE_FILE, "w") as f:
+                json.dump(_cache, f)
+            _dirty = False
+        except Exception as e:
+            print(f"  ⚠️  Could not save feed cache: {e}")
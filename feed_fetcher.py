@@ -0,0 +1,201 @@
+"""
+feed_fetcher.py
+Shared asyncio fan-out engine for RSS feeds.
+
+feedparser is blocking, so each feed is parsed (through the feed_cache
+conditional-GET layer) in a worker thread while asyncio enforces a global
+concurrency cap plus a per-host limit (several feeds on the same domain
+never hit it all at once).
+Results come back in input order with per-feed latency, ready for
+print_fetch_summary() instead of interleaved progress prints.
+
+Deadlines:
+  per feed    — connect/read timeouts in feed_cache (FEED_CONNECT_TIMEOUT / FEED_READ_TIMEOUT)
+  whole stage — FEED_FETCH_DEADLINE seconds (default 45). Feeds still running
+                when it hits are reported as "cut off" and the pipeline carries
+                on with whatever has returned.
+                Inside a run it is also cut to the run budget (run_budget).
+
+Feeds whose circuit breaker is open (see feed_health.py) are not requested
+at all; every attempt is recorded back into the health file.
+
+Incremental mode: pass watermark=<page> and each result's "entries" holds
+only the entries past that page's per-feed watermark (article_store), with
+"total" still counting the whole feed. full_rescan=True (or FULL_RESCAN=1)
+emits everything.
+"""
+
+import asyncio
+import threading
+import contextvars
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+from feed_cache import parse_feed, save_feed_cache
+from feed_health import is_open, record_result, save_feed_health
+from article_store import take_new_entries
+from config import settings
+import run_budget
+
+MAX_CONCURRENCY     = 10   # feeds in flight across all hosts
+MAX_PER_HOST        = 2    # feeds in flight against any single host
+FEED_FETCH_DEADLINE = settings.feed_fetch_deadline
+
+
+def _feed_name(feed: dict) -> str:
+    return feed.get("name") or feed.get("source") or feed["url"]
+
+
+def _run_in_daemon_thread(fn, *args) -> asyncio.Future:
+    """
+    Like asyncio.to_thread, but on a daemon thread — a feed abandoned at the
+    stage deadline can never keep the interpreter (or the job) alive.
+    """
+    loop    = asyncio.get_running_loop()
+    future  = loop.create_future()
+    context = contextvars.copy_context()   # keep run_trace spans under the fetch stage
+
+    def _resolve(result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _worker():
+        try:
+            result, error = context.run(fn, *args), None
+        except Exception as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(_resolve, result, error)
+        except RuntimeError:
+            pass  # loop already closed — stage deadline passed
+
+    threading.Thread(target=_worker, daemon=True).start()
+    return future
+
+
+def _error_label(e: Exception) -> str:
+    if "Timeout" in type(e).__name__:
+        return "timeout"
+    return str(e)[:80] or type(e).__name__
+
+
+async def _fetch_one(feed: dict, global_sem: asyncio.Semaphore, host_sems: dict) -> dict:
+    host = urlparse(feed["url"]).netloc
+    async with global_sem, host_sems[host]:
+        start = time.perf_counter()
+        try:
+            entries = await _run_in_daemon_thread(parse_feed, feed["url"])
+            error   = ""
+        except Exception as e:
+            entries = []
+            error   = _error_label(e)
+        return {
+            "feed":    feed,
+            "name":    _feed_name(feed),
+            "entries": entries,
+            "total":   len(entries),
+            "latency": time.perf_counter() - start,
+            "error":   error,
+            "cut_off": False,
+            "skipped": False,
+        }
+
+
+async def _fetch_all(feeds: list[dict], max_concurrency: int, max_per_host: int,
+                     deadline: float) -> list[dict]:
+    global_sem = asyncio.Semaphore(max_concurrency)
+    host_sems  = defaultdict(lambda: asyncio.Semaphore(max_per_host))
+    tasks      = [
+        None if is_open(f["url"]) else asyncio.create_task(_fetch_one(f, global_sem, host_sems))
+        for f in feeds
+    ]
+
+    pending = [t for t in tasks if t]
+    if pending:
+        await asyncio.wait(pending, timeout=deadline)
+
+    results = []
+    for feed, task in zip(feeds, tasks):
+        if task and task.done():
+            results.append(task.result())
+            continue
+        if task:
+            task.cancel()
+        results.append({
+            "feed":    feed,
+            "name":    _feed_name(feed),
+            "entries": [],
+            "total":   0,
+            "latency": deadline if task else 0.0,
+            "error":   "cut off (stage deadline)" if task else "circuit open",
+            "cut_off": bool(task),
+            "skipped": not task,
+        })
+    return results
+
+
+def fetch_feeds(feeds: list[dict], max_concurrency: int = MAX_CONCURRENCY,
+                max_per_host: int = MAX_PER_HOST,
+                deadline: float = FEED_FETCH_DEADLINE,
+                watermark: str | None = None, full_rescan: bool = False) -> list[dict]:
+    """
+    Fetch every feed concurrently, giving up on stragglers after `deadline` seconds.
+    Each feed dict needs a "url" key. Returns one result dict per feed,
+    in the same order: {feed, name, entries, total, latency, error, cut_off, skipped}.
+    With `watermark` set, entries are only those new since that page's last run.
+    """
+    if not feeds:
+        return []
+    deadline = run_budget.timeout(deadline, floor=5)
+    results  = asyncio.run(_fetch_all(feeds, max_concurrency, max_per_host, deadline))
+    save_feed_cache()
+
+    for r in results:
+        if not r["skipped"]:
+            record_result(r["feed"]["url"], r["name"], not r["error"], r["latency"], r["total"])
+    save_feed_health()
+
+    if watermark:
+        for r in results:
+            if r["entries"]:
+                r["entries"] = take_new_entries(watermark, r["feed"]["url"], r["entries"], full_rescan)
+    return results
+
+
+def print_fetch_summary(results: list[dict]) -> None:
+    """Print a per-feed latency / success table."""
+    width = max([len(r["name"]) for r in results] + [6])
+    print(f"  {'SOURCE':<{width}}  {'STATUS':<7} {'ENTRIES':>7} {'NEW':>5} {'LATENCY':>9}")
+    print(f"  {'-' * width}  {'-' * 7} {'-' * 7} {'-' * 5} {'-' * 9}")
+    for r in results:
+        if r["skipped"]:
+            status = "skipped"
+        elif r["cut_off"]:
+            status = "cut off"
+        elif r["error"]:
+            status = "timeout" if r["error"] == "timeout" else "error"
+        else:
+            status = "ok" if r["total"] else "empty"
+        print(f"  {r['name']:<{width}}  {status:<7} {r['total']:>7} {len(r['entries']):>5} {r['latency'] * 1000:>7.0f}ms")
+    ok    = sum(1 for r in results if r["total"])
+    new   = sum(len(r["entries"]) for r in results)
+    total = sum(r["latency"] for r in results)
+    slow  = max((r["latency"] for r in results), default=0)
+    print(f"  {ok}/{len(results)} feeds ok, {new} new entries — slowest {slow:.1f}s, sequential total would be {total:.1f}s")
+
+    skipped = [r["name"] for r in results if r["skipped"]]
+    if skipped:
+        print(f"  🔌 Skipped — circuit open ({len(skipped)}): {', '.join(skipped)}")
+
+    cut = [r["name"] for r in results if r["cut_off"]]
+    if cut:
+        print(f"  ⏱️  Cut off at the fetch deadline ({len(cut)}): {', '.join(cut)}")
+
+
+if __name__ == "__main__":
+    from news_fetcher import RSS_FEEDS
+    print_fetch_summary(fetch_feeds(RSS_FEEDS))
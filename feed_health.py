@@ -0,0 +1,126 @@
+"""
+feed_health.py
+Persistent per-feed health record + circuit breaker.
+
+Tracks success rate, median latency, last success and entries yielded for
+every feed the fetch layer touches (.cache/feed_health.json). A feed that
+fails — or returns zero entries — FEED_BREAKER_THRESHOLD times in a row has
+its breaker opened: it is skipped until the next probe time, and each failed
+probe doubles the interval (6h → 12h → 24h … capped at 7 days). One good
+probe closes the breaker again.
+
+CLI report:
+  python feed_health.py
+"""
+
+import os
+import json
+import statistics
+from datetime import datetime, timedelta
+from config import settings
+
+_BASE_DIR   = os.path.dirname(os.path.abspath(__file__))
+HEALTH_FILE = os.path.join(_BASE_DIR, ".cache", "feed_health.json")
+
+FEED_BREAKER_THRESHOLD = settings.feed_breaker_threshold
+BASE_PROBE_HOURS       = 6
+MAX_PROBE_HOURS        = 24 * 7
+LATENCY_SAMPLES        = 20   # rolling window for the median
+
+_records = None
+
+
+def _load() -> dict:
+    global _records
+    if _records is None:
+        try:
+            with open(HEALTH_FILE) as f:
+                _records = json.load(f)
+        except Exception:
+            _records = {}
+    return _records
+
+
+def save_feed_health() -> None:
+    if _records is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(HEALTH_FILE), exist_ok=True)
+        with open(HEALTH_FILE, "w") as f:
+            json.dump(_records, f, indent=1)
+    except Exception as e:
+        print(f"  ⚠️  Could not save feed health: {e}")
+
+
+def is_open(url: str, now: datetime | None = None) -> bool:
+    """True while the breaker is open — the feed should not be requested."""
+    rec = _load().get(url)
+    if not rec or not rec.get("next_probe"):
+        return False
+    now = now or datetime.now()
+    return now.isoformat() < rec["next_probe"]
+
+
+def record_result(url: str, name: str, ok: bool, latency: float, entries: int,
+                  now: datetime | None = None) -> None:
+    """Record one fetch attempt. Zero entries counts as a failure."""
+    now = now or datetime.now()
+    rec = _load().setdefault(url, {
+        "name":                 name,
+        "attempts":             0,
+        "successes":            0,
+        "consecutive_failures": 0,
+        "latencies":            [],
+        "entries_total":        0,
+        "last_entries":         0,
+        "last_success":         "",
+        "last_attempt":         "",
+        "next_probe":           "",
+    })
+    rec["name"]          = name
+    rec["attempts"]     += 1
+    rec["last_attempt"]  = now.isoformat()
+    rec["last_entries"]  = entries
+    rec["entries_total"] += entries
+    rec["latencies"]     = (rec["latencies"] + [round(latency, 3)])[-LATENCY_SAMPLES:]
+
+    if ok and entries:
+        rec["successes"]           += 1
+        rec["consecutive_failures"] = 0
+        rec["last_success"]         = now.isoformat()
+        rec["next_probe"]           = ""
+        return
+
+    rec["consecutive_failures"] += 1
+    over = rec["consecutive_failures"] - FEED_BREAKER_THRESHOLD
+    if over >= 0:
+        hours = min(BASE_PROBE_HOURS * 2 ** over, MAX_PROBE_HOURS)
+        rec["next_probe"] = (now + timedelta(hours=hours)).isoformat()
+
+
+def print_health_report() -> None:
+    records = _load()
+    if not records:
+        print("No feed health recorded yet — run a fetch first.")
+        return
+    rows  = sorted(records.values(), key=lambda r: (r["successes"] / max(r["attempts"], 1), r["name"]))
+    width = max([len(r["name"]) for r in rows] + [6])
+    print(f"{'SOURCE':<{width}}  {'OK%':>4} {'RUNS':>4} {'MEDIAN':>7} {'AVG ENT':>7}  {'LAST SUCCESS':<16} BREAKER")
+    print(f"{'-' * width}  {'-' * 4} {'-' * 4} {'-' * 7} {'-' * 7}  {'-' * 16} {'-' * 20}")
+    now = datetime.now().isoformat()
+    for r in rows:
+        rate    = 100 * r["successes"] / max(r["attempts"], 1)
+        median  = statistics.median(r["latencies"]) if r["latencies"] else 0
+        avg_ent = r["entries_total"] / max(r["attempts"], 1)
+        last    = r["last_success"][:16].replace("T", " ") or "never"
+        if r["next_probe"] and now < r["next_probe"]:
+            breaker = f"open → {r['next_probe'][:16].replace('T', ' ')}"
+        elif r["consecutive_failures"]:
+            breaker = f"closed ({r['consecutive_failures']} fail)"
+        else:
+            breaker = "closed"
+        print(f"{r['name']:<{width}}  {rate:>3.0f}% {r['attempts']:>4} {median:>6.1f}s {avg_ent:>7.1f}  {last:<16} {breaker}")
+
+
+if __name__ == "__main__":
+    print_health_report()
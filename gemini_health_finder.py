@@ -1,9 +1,18 @@
 import os
+import sys
 from datetime import datetime, timedelta
 import json
-import feedparser
 import re
 from urllib.parse import urlparse
+from feed_fetcher import fetch_feeds, print_fetch_summary
+from article_store import upsert_articles, record_run, new_since
+from keyword_matcher import within
+from scoring_rules import plan as scoring_plan, hits as keyword_hits, total, curve_points, band_points
+from article_record import Article, as_article
+from near_dup import dedup_articles
+
+# Scored articles first seen within this window stay in the top-3 pool
+CARRY_OVER_HOURS = 48
 
 def get_comprehensive_health_feeds():
     """Comprehensive list of reliable health news RSS feeds organized by category"""
@@ -185,53 +194,48 @@ def get_comprehensive_health_feeds():
     
     return all_feeds
 
-def fetch_from_all_sources():
-    """Fetch articles from all reliable health sources"""
+def fetch_from_all_sources(full_rescan=False):
+    """Fetch articles new since the last run from all reliable health sources"""
     
     all_feeds = get_comprehensive_health_feeds()
     articles = []
     
     print(f"📡 Fetching from {len(all_feeds)} reliable health sources...\n")
     
+    # Concurrent fan-out (global + per-host caps); results keep feed order.
+    # Only entries past each feed's watermark come back.
+    results = fetch_feeds(all_feeds, watermark='health_digest', full_rescan=full_rescan)
+    
     successful_feeds = 0
     failed_feeds = []
     
-    for feed_info in all_feeds:
-        try:
-            print(f"  Fetching from {feed_info['name']}... ", end='')
-            feed = feedparser.parse(feed_info['url'])
-            
-            if feed.entries:
-                count = 0
-                for entry in feed.entries[:10]:  # Get top 10 from each source
-                    article = {
-                        'title': entry.get('title', ''),
-                        'url': entry.get('link', ''),
-                        'summary': entry.get('summary', entry.get('description', '')),
-                        'published_parsed': entry.get('published_parsed'),
-                        'source': feed_info['name'],
-                        'source_credibility': feed_info['credibility_score'],
-                        'category': feed_info['category']
-                    }
-                    
-                    # Only add if we have minimum required fields
-                    if article['title'] and article['url']:
-                        articles.append(article)
-                        count += 1
-                
-                print(f"✅ Got {count} articles")
-                successful_feeds += 1
-            else:
-                print(f"⚠️ No entries found")
-                failed_feeds.append(feed_info['name'])
-                
-        except Exception as e:
-            print(f"❌ Failed: {str(e)[:50]}")
+    for result in results:
+        feed_info = result['feed']
+        if not result['total']:
             failed_feeds.append(feed_info['name'])
             continue
+        
+        for entry in result['entries'][:10]:  # Get top 10 from each source
+            article = Article({
+                'title': entry.get('title', ''),
+                'url': entry.get('link', ''),
+                'summary': entry.get('summary', entry.get('description', '')),
+                'published_parsed': entry.get('published_parsed'),
+                'source': feed_info['name'],
+                'source_credibility': feed_info['credibility_score'],
+                'category': feed_info['category']
+            })
+            
+            # Only add if we have minimum required fields
+            if article['title'] and article['url']:
+                articles.append(article)
+        
+        successful_feeds += 1
+    
+    print_fetch_summary(results)
     
     print(f"\n✅ Successfully fetched from {successful_feeds}/{len(all_feeds)} sources")
-    print(f"📊 Total articles collected: {len(articles)}")
+    print(f"📊 New articles collected: {len(articles)}")
     
     if failed_feeds:
         print(f"\n⚠️ Failed sources ({len(failed_feeds)}):")
@@ -240,7 +244,12 @@ def fetch_from_all_sources():
     
     return articles
 
-def calculate_enhanced_viral_score(article):
+# Viral keyword weights, the engagement word lists, credibility bands, the
+# recency curve and the age penalty live in scoring_rules.toml, profile
+# [viral]. All keyword sets are compiled into one automaton, so a single pass
+# over title + summary feeds both the score and the "why viral" reasons.
+
+def calculate_enhanced_viral_score(article, now=None, contributions=None):
     """
     Enhanced viral score calculation that includes:
     - Keyword matching
@@ -248,202 +257,118 @@ def calculate_enhanced_viral_score(article):
     - Title characteristics
     - Source credibility
     - Category relevance
+    When a `contributions` dict is passed it is filled with the points each
+    of VIRAL_FEATURES added (before the clamp).
     """
-    score = 0
-    title = article.get('title', '').lower()
-    summary = article.get('summary', '').lower()
-    text = f"{title} {summary}"
-    
-    # Core viral keywords with weights
-    viral_keywords = {
-        # High impact discoveries
-        'breakthrough': 6,
-        'discover': 5,
-        'discovered': 5,
-        'new study': 5,
-        'scientists find': 5,
-        'research shows': 5,
-        'first time': 4,
-        'game changer': 5,
-        'revolutionary': 5,
-        
-        # Shocking/Surprising
-        'shocking': 4,
-        'surprising': 4,
-        'unexpected': 4,
-        'hidden': 3,
-        'secret': 3,
-        'myth': 3,
-        'debunked': 4,
-        'truth about': 3,
-        
-        # Major health conditions (high engagement)
-        'cancer': 4,
-        'alzheimer': 4,
-        'heart disease': 4,
-        'diabetes': 3,
-        'covid': 3,
-        'stroke': 3,
-        'dementia': 3,
-        
-        # Popular wellness topics
-        'weight loss': 4,
-        'lose weight': 4,
-        'burn fat': 3,
-        'anti-aging': 4,
-        'longevity': 4,
-        'live longer': 4,
-        'sleep better': 3,
-        'sleep': 2,
-        'mental health': 3,
-        'depression': 3,
-        'anxiety': 3,
-        'stress': 2,
-        
-        # Nutrition trending
-        'diet': 2,
-        'nutrition': 2,
-        'gut health': 3,
-        'microbiome': 3,
-        'superfood': 3,
-        'vitamin': 2,
-        'supplement': 2,
-        
-        # Exercise & fitness
-        'exercise': 2,
-        'workout': 2,
-        'fitness': 2,
-        'muscle': 2,
-        
-        # Preventive & actionable
-        'prevent': 3,
-        'cure': 5,
-        'treatment': 3,
-        'risk': 2,
-        'reduce risk': 3,
-        'warning': 3,
-        'signs of': 3,
-        'symptoms': 2,
-        
-        # Medical authority
-        'fda': 4,
-        'approved': 3,
-        'clinical trial': 4,
-        'study': 2,
-        'research': 2,
-        'expert': 2,
-        'doctor': 2,
-        
-        # Specific trending topics
-        'immune system': 3,
-        'inflammation': 3,
-        'blood pressure': 2,
-        'cholesterol': 2,
-        'hormone': 2,
-        'metabolism': 2,
-        'brain health': 3,
-    }
+    article = as_article(article)
+    rules = scoring_plan('viral')
+    now = now or datetime.now()
+    parts = dict.fromkeys(VIRAL_FEATURES, 0)
+    title = article.title_lower
+    
+    hits = keyword_hits('viral', article.text)
     
     # Score based on keywords
-    for keyword, weight in viral_keywords.items():
-        if keyword in text:
-            score += weight
+    parts['keywords'] = total(rules['matcher'], hits, 'viral')
     
     # Recency boost (articles published recently are more viral)
-    pub_date = article.get('published_parsed')
-    if pub_date:
-        try:
-            pub_datetime = datetime(*pub_date[:6])
-            hours_old = (datetime.now() - pub_datetime).total_seconds() / 3600
-            
-            if hours_old < 12:
-                score += 15  # Very recent
-            elif hours_old < 24:
-                score += 12
-            elif hours_old < 48:
-                score += 8
-            elif hours_old < 72:
-                score += 4
-            elif hours_old < 168:  # Less than a week
-                score += 2
-        except:
-            pass
+    pub_datetime = article.published_at
+    if pub_datetime:
+        hours_old = (now - pub_datetime).total_seconds() / 3600
+        parts['recency'] = curve_points(rules['recency'], hours_old)
     
     # Title engagement factors
     if '?' in title:
-        score += 3  # Questions drive curiosity
+        parts['question'] = rules['question_points']  # Questions drive curiosity
     
-    if any(word in title for word in ['you', 'your']):
-        score += 4  # Personal relevance
+    if within(hits, 'personal', len(title)):
+        parts['personal'] = rules['personal_points']  # Personal relevance
     
     # Numbers in title (listicles, stats)
-    numbers = re.findall(r'\b\d+\b', title)
-    if numbers:
-        score += 3
+    if _NUMBER_RE.search(title):
+        parts['numbers'] = rules['numbers_points']
     
     # Title length (optimal is 10-15 words)
+    length = rules['length']
     word_count = len(title.split())
-    if 10 <= word_count <= 15:
-        score += 2
-    elif word_count > 15:
-        score += 1
+    if length['min_words'] <= word_count <= length['max_words']:
+        parts['length'] = length['in_range']
+    elif word_count > length['max_words']:
+        parts['length'] = length['over']
     
     # Emotional/clickbait indicators (use carefully)
-    surprise_words = ['surprising', 'unexpected', 'shocking', 'contrary', 'debunked', 'myth', 'secret', 'hidden', 'truth']
-    surprise_count = sum(1 for word in surprise_words if word in text)
-    score += min(surprise_count * 3, 9)  # Max 9 points from this
+    surprise = rules['surprise']
+    parts['surprise'] = min(len(hits['surprise']) * surprise['points_each'], surprise['cap'])
     
     # Action words (practical value)
-    action_words = ['how to', 'ways to', 'tips', 'avoid', 'prevent', 'boost', 'improve', 'increase', 'reduce', 'lower']
-    if any(word in text for word in action_words):
-        score += 4
+    if hits['action']:
+        parts['action'] = rules['action_points']
     
     # Source credibility boost
     # Higher credibility sources get a boost because they're more shareable
-    credibility = article.get('source_credibility', 5)
-    if credibility >= 9:
-        score += 8  # Very trusted sources
-    elif credibility >= 7:
-        score += 5
-    elif credibility >= 5:
-        score += 2
+    credibility = article.get('source_credibility', rules['default_credibility'])
+    parts['credibility'] = band_points(rules['credibility'], credibility)
     
     # Category-specific boosts
     category = article.get('category', '').lower()
-    high_engagement_categories = ['research', 'oncology', 'cardiology', 'mental health', 'nutrition']
-    if any(cat in category for cat in high_engagement_categories):
-        score += 3
+    if any(cat in category for cat in rules['categories']['names']):
+        parts['category'] = rules['categories']['points']
     
     # Penalty for very old articles
-    if pub_date:
-        try:
-            pub_datetime = datetime(*pub_date[:6])
-            days_old = (datetime.now() - pub_datetime).days
-            if days_old > 7:
-                score -= min((days_old - 7) * 2, 20)  # Penalty for old news
-        except:
-            pass
-    
-    return max(min(score, 100), 0)  # Keep between 0-100
+    if pub_datetime:
+        days_old = (now - pub_datetime).days
+        parts['age_penalty'] = _age_penalty(rules['age_penalty'], days_old)
+    
+    if contributions is not None:
+        contributions.update(parts)
+    low, high = rules['clamp']
+    return max(min(sum(parts.values()), high), low)
+
+def _age_penalty(penalty, days_old):
+    if days_old > penalty['after_days']:
+        return -min((days_old - penalty['after_days']) * penalty['per_day'], penalty['cap'])
+    return 0
+
+# Keys of the per-feature breakdown filled by calculate_enhanced_viral_score()
+VIRAL_FEATURES = ['keywords', 'recency', 'question', 'personal', 'numbers', 'length',
+                  'surprise', 'action', 'credibility', 'category', 'age_penalty']
+_NUMBER_RE = re.compile(r'\b\d+\b')
+
+def score_articles_batch(articles, now=None):
+    """
+    Score a list of articles with calculate_enhanced_viral_score(), against
+    one clock reading, and collect each article's per-feature points.
+    Returns (scores, contributions) where contributions maps each name in
+    VIRAL_FEATURES to a per-article list of points.
+    """
+    now = now or datetime.now()
+    scores = []
+    contributions = {feature: [] for feature in VIRAL_FEATURES}
+    for article in articles:
+        parts = {}
+        scores.append(calculate_enhanced_viral_score(article, now=now, contributions=parts))
+        for feature in VIRAL_FEATURES:
+            contributions[feature].append(parts[feature])
+    return scores, contributions
 
 def generate_why_viral(article):
     """Generate explanation for why article is viral"""
-    title = article.get('title', '').lower()
-    summary = article.get('summary', '').lower()
-    text = f"{title} {summary}"
+    article = as_article(article)
+    title = article.title_lower
     
+    hits = keyword_hits('viral', article.text)
     reasons = []
     
     # Discovery/breakthrough
-    if any(word in text for word in ['breakthrough', 'discover', 'first time', 'revolutionary']):
+    if hits['why_discovery']:
         reasons.append("Major scientific breakthrough")
     
     # Major health conditions
-    if any(word in title for word in ['cancer', 'alzheimer', 'heart disease', 'diabetes']):
+    if within(hits, 'why_condition', len(title)):
         reasons.append("Critical health condition with high public interest")
     
     # Popular topics
-    if any(word in title for word in ['weight loss', 'diet', 'exercise', 'sleep']):
+    if within(hits, 'why_popular', len(title)):
         reasons.append("High engagement topic with practical value")
     
     # Curiosity drivers
@@ -451,19 +376,19 @@ def generate_why_viral(article):
         reasons.append("Question format drives curiosity")
     
     # Personal relevance
-    if any(word in title for word in ['you', 'your']):
+    if within(hits, 'personal', len(title)):
         reasons.append("Personal relevance to readers")
     
     # Research backing
-    if any(word in text for word in ['new study', 'scientists', 'research shows', 'clinical trial']):
+    if hits['why_research']:
         reasons.append("Backed by research credibility")
     
     # Surprising/controversial
-    if any(word in text for word in ['surprising', 'shocking', 'unexpected', 'debunked', 'myth']):
+    if hits['why_surprising']:
         reasons.append("Surprising findings challenge common beliefs")
     
     # Actionable content
-    if any(word in text for word in ['how to', 'prevent', 'avoid', 'tips', 'ways to']):
+    if hits['why_actionable']:
         reasons.append("Provides actionable health advice")
     
     # Source credibility
@@ -471,52 +396,20 @@ def generate_why_viral(article):
         reasons.append(f"Published by highly trusted source ({article['source']})")
     
     # Recency
-    pub_date = article.get('published_parsed')
-    if pub_date:
-        try:
-            pub_datetime = datetime(*pub_date[:6])
-            hours_old = (datetime.now() - pub_datetime).total_seconds() / 3600
-            if hours_old < 24:
-                reasons.append("Breaking news (published within 24 hours)")
-        except:
-            pass
+    if article.published_at:
+        hours_old = (datetime.now() - article.published_at).total_seconds() / 3600
+        breaking_hours = scoring_plan('viral')['breaking_hours']
+        if hours_old < breaking_hours:
+            reasons.append(f"Breaking news (published within {breaking_hours:g} hours)")
     
     if not reasons:
         reasons.append("Relevant health topic with shareability potential")
     
     return "; ".join(reasons[:4])  # Max 4 reasons
 
-def deduplicate_articles(articles):
-    """Remove duplicate articles based on title similarity"""
-    
-    unique_articles = []
-    seen_titles = set()
-    
-    for article in articles:
-        # Normalize title for comparison
-        normalized_title = article['title'].lower().strip()
-        normalized_title = re.sub(r'[^\w\s]', '', normalized_title)  # Remove punctuation
-        
-        # Check for similarity with existing titles
-        is_duplicate = False
-        for seen in seen_titles:
-            # Calculate simple similarity (if 80% of words match, it's a duplicate)
-            seen_words = set(seen.split())
-            new_words = set(normalized_title.split())
-            
-            if len(seen_words) > 0:
-                overlap = len(seen_words.intersection(new_words))
-                similarity = overlap / len(seen_words)
-                
-                if similarity > 0.8:
-                    is_duplicate = True
-                    break
-        
-        if not is_duplicate:
-            unique_articles.append(article)
-            seen_titles.add(normalized_title)
-    
-    return unique_articles
+def deduplicate_articles(articles, seen=()):
+    """Remove near-duplicate articles (title Jaccard >= near_dup threshold), keeping the first of each"""
+    return dedup_articles([as_article(a) for a in articles], seen=seen)
 
 def extract_key_insight(article):
     """Extract the main health insight from the article"""
@@ -704,8 +597,7 @@ Category: {article['category']}
 def generate_image_suggestions(article):
     """Generate image suggestions based on article content"""
     
-    title_lower = article['title'].lower()
-    summary_lower = article.get('summary', '').lower()
+    title_lower = as_article(article).title_lower
     
     suggestions = {
         'style': '',
@@ -1137,27 +1029,36 @@ if __name__ == "__main__":
     print("🔍 Starting health article aggregation from 30+ reliable sources...\n")
     
     try:
-        # Fetch from all sources
-        all_articles = fetch_from_all_sources()
+        # Fetch from all sources (new entries only unless --full-rescan)
+        record_run('health_digest')
+        cutoff = (datetime.now() - timedelta(hours=CARRY_OVER_HOURS)).isoformat()
+        carried = [Article(a) for a in new_since(cutoff, page='health_digest')]
+        all_articles = fetch_from_all_sources(full_rescan='--full-rescan' in sys.argv)
         
-        if not all_articles:
+        if not all_articles and not carried:
             print("❌ No articles found")
             with open('daily_articles.txt', 'w') as f:
                 f.write("No articles found from RSS feeds")
         else:
-            print(f"\n📝 Processing {len(all_articles)} articles...\n")
+            print(f"\n📝 Processing {len(all_articles)} new articles...\n")
             
             # Deduplicate
             print(f"🔄 Removing duplicates...")
-            unique_articles = deduplicate_articles(all_articles)
+            unique_articles = deduplicate_articles(all_articles, seen=carried)
             print(f"✅ {len(unique_articles)} unique articles after deduplication\n")
             
-            # Score all articles
+            # Score only the new articles — carried-over ones keep their stored score
             print(f"📊 Calculating viral scores...")
-            for article in unique_articles:
-                article['viral_score'] = calculate_enhanced_viral_score(article)
+            scores, _ = score_articles_batch(unique_articles)
+            for article, score in zip(unique_articles, scores):
+                article['viral_score'] = score
                 article['why_viral'] = generate_why_viral(article)
             print(f"✅ All articles scored\n")
+            upsert_articles(unique_articles, page='health_digest', score_key='viral_score')
+            
+            new_urls = {a['url'] for a in unique_articles}
+            unique_articles += [a for a in carried if a['url'] not in new_urls and 'viral_score' in a]
+            print(f"♻️ {len(unique_articles)} articles in pool (incl. carried over from the last {CARRY_OVER_HOURS}h)\n")
             
             # Sort and get top 3
             top_articles = sorted(unique_articles, key=lambda x: x['viral_score'], reverse=True)[:3]
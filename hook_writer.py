@@ -3,18 +3,14 @@ hook_writer.py
 Generates an engaging Facebook hook caption for a health article.
 Audience: Filipino professionals (nurses, IT, engineers, etc.) in SG + PH.
 Tone: Peer-to-peer, ambitious, analytical — not OFW hardship framing.
-Uses Gemini → OpenRouter → template fallback.
+Uses Gemini → OpenRouter (llm_client) → template fallback.
 """
 
-import os
 import hashlib
-import requests
-from dotenv import load_dotenv
+import llm_client
+import run_budget
 
-load_dotenv()
-
-GEMINI_API_KEY     = os.getenv("GEMINI_API_KEY", "")
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
+HOOK_BUDGET = 15   # seconds of run budget needed to ask the LLM
 
 HOOK_PROMPT = """You are writing a Facebook post caption for Filipino professionals — nurses, 
 IT workers, engineers, architects, pharmacists — based in Singapore and the Philippines.
@@ -51,43 +47,6 @@ Article summary: {summary}
 Write ONLY the caption. No preamble, no quotes."""
 
 
-def _call_gemini(prompt: str) -> str | None:
-    if not GEMINI_API_KEY:
-        return None
-    try:
-        resp = requests.post(
-            f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={GEMINI_API_KEY}",
-            json={"contents": [{"parts": [{"text": prompt}]}]},
-            timeout=30,
-        )
-        return resp.json()["candidates"][0]["content"]["parts"][0]["text"].strip()
-    except Exception as e:
-        print(f"  ⚠️  Gemini hook error: {e}")
-        return None
-
-
-def _call_openrouter(prompt: str) -> str | None:
-    if not OPENROUTER_API_KEY:
-        return None
-    try:
-        resp = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                "Content-Type":  "application/json",
-            },
-            json={
-                "model":    "mistralai/mistral-7b-instruct:free",
-                "messages": [{"role": "user", "content": prompt}],
-            },
-            timeout=30,
-        )
-        return resp.json()["choices"][0]["message"]["content"].strip()
-    except Exception as e:
-        print(f"  ⚠️  OpenRouter hook error: {e}")
-        return None
-
-
 def _template_hook(article: dict) -> str:
     """Simple, human-sounding fallback templates for Filipino professionals."""
     title = article["title"]
@@ -119,13 +78,11 @@ def generate_hook(article: dict) -> str:
     )
 
     hook = None
-    if GEMINI_API_KEY:
-        hook = _call_gemini(prompt)
-    elif OPENROUTER_API_KEY:
-        hook = _call_openrouter(prompt)
+    if run_budget.allows("hook", HOOK_BUDGET, "template hook"):
+        hook = llm_client.generate(prompt, cache=False, label="Hook")   # creative — fresh on a re-run
 
     if not hook:
-        print("  ⚠️  Using template hook (no AI key configured).")
+        print("  ⚠️  Using template hook (no AI key configured or no AI answer).")
         hook = _template_hook(article)
 
     # URL is posted as first comment in fb_poster.py — not in caption
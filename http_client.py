@@ -0,0 +1,121 @@
+"""
+http_client.py
+One shared, pooled HTTP client for every outbound call in the repo.
+
+A single requests.Session keeps a keep-alive connection pool per host, so
+the 3+ Gemini calls and 3 Graph API calls in a run reuse one TCP+TLS
+connection each instead of handshaking every time.
+
+  - unified timeouts  (connect, read) — callers may override per call
+  - retry with jittered exponential backoff on 429 / 5xx and connection errors
+    (Retry-After is honoured, capped at MAX_RETRY_AFTER)
+  - gzip/deflate response bodies
+  - every call is a run_trace span (time, bytes, status, attempts)
+
+Drop-in for requests.get / requests.post:
+  import http_client
+  resp = http_client.post(url, json=payload, timeout=30)
+
+Pass retries=0 for non-idempotent calls where a retried 5xx could double
+post (e.g. publishing to a Facebook feed).
+
+requests itself is imported on first use, not at import time — it is the
+single largest import of a run and modules that only might make a call
+(or a `--help`) should not pay for it.
+"""
+
+import time
+import random
+import threading
+import run_trace
+
+DEFAULT_TIMEOUT = (5, 30)   # (connect, read) seconds
+MAX_RETRIES     = 2
+BACKOFF_BASE    = 0.75      # seconds — 0.75, 1.5, 3 … plus up to BACKOFF_BASE jitter
+MAX_RETRY_AFTER = 20
+RETRY_STATUSES  = {429, 500, 502, 503, 504}
+POOL_SIZE       = 10        # connections kept alive per host
+
+_session = None
+_lock    = threading.Lock()
+
+
+def get_session() -> "requests.Session":
+    """Process-wide session, created on first use."""
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            s       = requests.Session()
+            adapter = HTTPAdapter(pool_connections=20, pool_maxsize=POOL_SIZE)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers.update({"Accept-Encoding": "gzip, deflate"})
+            _session = s
+    return _session
+
+
+def _backoff(attempt: int, resp: "requests.Response | None" = None) -> float:
+    if resp is not None:
+        retry_after = resp.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER)
+    return BACKOFF_BASE * 2 ** attempt + random.uniform(0, BACKOFF_BASE)
+
+
+def _rewind_files(files) -> None:
+    """Multipart file objects are consumed by a send — rewind before a retry."""
+    if not files:
+        return
+    values = files.values() if isinstance(files, dict) else [v for _, v in files]
+    for value in values:
+        handle = value[1] if isinstance(value, tuple) else value
+        if hasattr(handle, "seek"):
+            handle.seek(0)
+
+
+def request(method: str, url: str, timeout=DEFAULT_TIMEOUT, retries: int = MAX_RETRIES,
+            **kwargs) -> "requests.Response":
+    """
+    Send a request through the shared pool.
+    Returns the last response (even a 429/5xx once retries run out);
+    raises the last connection/timeout error if no response was ever received.
+    """
+    import requests
+    session = get_session()
+    with run_trace.span(f"{method} {url.split('?')[0][:80]}", kind="http",
+                        service=run_trace.service(url, method)) as trace:
+        for attempt in range(retries + 1):
+            _rewind_files(kwargs.get("files"))
+            trace["attempts"] = attempt + 1
+            try:
+                resp = session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == retries:
+                    raise
+                time.sleep(_backoff(attempt))
+                continue
+            _count_bytes(trace, resp)
+            if resp.status_code not in RETRY_STATUSES or attempt == retries:
+                trace["status"] = resp.status_code
+                if not resp.ok:
+                    trace["outcome"] = f"http {resp.status_code}"
+                return resp
+            time.sleep(_backoff(attempt, resp))
+        return resp
+
+
+def _count_bytes(trace: dict, resp: "requests.Response") -> None:
+    """Add a response's body sizes to its trace span."""
+    body = resp.request.body if resp.request is not None else None
+    trace["bytes_out"] += len(body) if isinstance(body, (bytes, str)) else 0
+    trace["bytes_in"]  += len(resp.content or b"")
+
+
+def get(url: str, **kwargs) -> "requests.Response":
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> "requests.Response":
+    return request("POST", url, **kwargs)
@@ -13,20 +13,24 @@ Font    : Montserrat (fonts/ folder) → Liberation/DejaVu fallback
 import os
 import time
 import hashlib
-import requests
+import http_client
+import llm_client
+import run_budget
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
-from dotenv import load_dotenv
-
-load_dotenv()
+from config import settings
 
 IMAGE_WIDTH  = 1080
 IMAGE_HEIGHT = 1080
 
-HF_API_TOKEN      = os.getenv("HF_API_TOKEN", "")
+HF_API_TOKEN      = settings.hf_api_token
 HF_SDXL_LIGHTNING = "https://router.huggingface.co/hf-inference/models/ByteDance/SDXL-Lightning"
 HF_SD15           = "https://router.huggingface.co/hf-inference/models/stable-diffusion-v1-5/stable-diffusion-v1-5"
+HF_TIMEOUT        = 120   # per HF request, cut to the run budget
+HF_LOAD_WAIT      = 20    # after a 503 (model loading)
+HF_BUDGET         = 30    # seconds of run budget needed to try an HF model
+PROMPT_BUDGET     = 10    # … to ask Gemini for the image prompt
 
 SAFE_PROMPT = (
     "vibrant fresh healthy food flatlay, fruits vegetables superfoods, "
@@ -54,7 +58,7 @@ FONT_MEDIUM = [
     "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
 ]
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+GEMINI_API_KEY = settings.gemini_api_key
 
 # ── Image prompt generator ─────────────────────────────────────────────────────
 # Gemini reads the actual headline and writes a specific, vivid image prompt.
@@ -128,7 +132,17 @@ STYLE_POOL = [
 ]
 
 
+_fonts = {}   # (paths, size) → font; kept for the life of the process (newsgen serve)
+
+
 def _load_font(paths: list, size: int) -> ImageFont.FreeTypeFont:
+    key = (tuple(paths), size)
+    if key not in _fonts:
+        _fonts[key] = _open_font(paths, size)
+    return _fonts[key]
+
+
+def _open_font(paths: list, size: int) -> ImageFont.FreeTypeFont:
     for path in paths:
         if os.path.exists(path):
             try:
@@ -140,27 +154,20 @@ def _load_font(paths: list, size: int) -> ImageFont.FreeTypeFont:
 
 def _build_prompt_via_gemini(headline: str) -> str | None:
     """Ask Gemini to write a specific image prompt based on the actual headline."""
-    if not GEMINI_API_KEY:
+    if not GEMINI_API_KEY or not run_budget.allows("image prompt", PROMPT_BUDGET, "style pool prompt"):
         return None
-    try:
-        prompt = IMAGE_PROMPT_REQUEST.format(headline=headline)
-        resp   = requests.post(
-            f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={GEMINI_API_KEY}",
-            json={"contents": [{"parts": [{"text": prompt}]}]},
-            timeout=15,
-        )
-        result = resp.json()["candidates"][0]["content"]["parts"][0]["text"].strip()
-        # Make sure it has the required suffix
-        if "no text" not in result.lower():
-            result += ", square composition, photorealistic, high resolution, no text, no words"
-        print(f"  🎨 Gemini image prompt: {result[:80]}...")
-        return result
-    except Exception as e:
-        print(f"  ⚠️  Gemini image prompt error: {e}")
+    prompt = IMAGE_PROMPT_REQUEST.format(headline=headline)
+    result = llm_client.generate(prompt, providers=("gemini",), deadline=15, label="Image prompt")
+    if not result:
         return None
+    # Make sure it has the required suffix
+    if "no text" not in result.lower():
+        result += ", square composition, photorealistic, high resolution, no text, no words"
+    print(f"  🎨 Gemini image prompt: {result[:80]}...")
+    return result
 
 
-def _build_prompt(headline: str) -> str:
+def build_prompt(headline: str) -> str:
     """Try Gemini first for a headline-specific prompt, fall back to style pool."""
     gemini_prompt = _build_prompt_via_gemini(headline)
     if gemini_prompt:
@@ -193,7 +200,7 @@ def _hf_call(prompt: str, api_url: str) -> Image.Image | None:
     w = (min(IMAGE_WIDTH,  1024) // 8) * 8
     h = (min(IMAGE_HEIGHT, 1024) // 8) * 8
     try:
-        resp = requests.post(
+        resp = http_client.post(
             api_url,
             headers={"Authorization": f"Bearer {HF_API_TOKEN}"},
             json={"inputs": prompt, "parameters": {
@@ -201,17 +208,19 @@ def _hf_call(prompt: str, api_url: str) -> Image.Image | None:
                 "num_inference_steps": 4,
                 "guidance_scale": 0,
             }},
-            timeout=120,
+            timeout=run_budget.timeout(HF_TIMEOUT),
+            retries=0,   # 503 = model loading, handled below
         )
         if resp.status_code == 200:
             img = Image.open(BytesIO(resp.content)).convert("RGB")
             return img.resize((IMAGE_WIDTH, IMAGE_HEIGHT), Image.LANCZOS)
-        if resp.status_code == 503:
-            print("  ⏳ HF model loading, waiting 20s...")
-            time.sleep(20)
-            resp2 = requests.post(api_url,
+        if resp.status_code == 503 and run_budget.allows("HF model loading", HF_LOAD_WAIT + HF_BUDGET,
+                                                          "no retry"):
+            print(f"  ⏳ HF model loading, waiting {HF_LOAD_WAIT}s...")
+            time.sleep(HF_LOAD_WAIT)
+            resp2 = http_client.post(api_url,
                 headers={"Authorization": f"Bearer {HF_API_TOKEN}"},
-                json={"inputs": prompt}, timeout=120)
+                json={"inputs": prompt}, timeout=run_budget.timeout(HF_TIMEOUT), retries=0)
             if resp2.status_code == 200:
                 img = Image.open(BytesIO(resp2.content)).convert("RGB")
                 return img.resize((IMAGE_WIDTH, IMAGE_HEIGHT), Image.LANCZOS)
@@ -243,17 +252,19 @@ def _stock_image(headline: str) -> Image.Image | None:
 
 
 def generate_background(prompt: str, headline: str = "") -> Image.Image | None:
-    print("  🤗 Trying HuggingFace SDXL-Lightning...")
-    img = _hf_call(prompt, HF_SDXL_LIGHTNING)
-    if img:
-        print(f"  ✅ SDXL-Lightning ({img.size[0]}x{img.size[1]}px)")
-        return img
-
-    print("  🤗 Trying HuggingFace SD 1.5...")
-    img = _hf_call(SAFE_PROMPT, HF_SD15)
-    if img:
-        print(f"  ✅ SD 1.5 ({img.size[0]}x{img.size[1]}px)")
-        return img
+    if run_budget.allows("background (SDXL)", HF_BUDGET, "SD 1.5 / stock image"):
+        print("  🤗 Trying HuggingFace SDXL-Lightning...")
+        img = _hf_call(prompt, HF_SDXL_LIGHTNING)
+        if img:
+            print(f"  ✅ SDXL-Lightning ({img.size[0]}x{img.size[1]}px)")
+            return img
+
+    if run_budget.allows("background (SD 1.5)", HF_BUDGET, "stock image / dark card"):
+        print("  🤗 Trying HuggingFace SD 1.5...")
+        img = _hf_call(SAFE_PROMPT, HF_SD15)
+        if img:
+            print(f"  ✅ SD 1.5 ({img.size[0]}x{img.size[1]}px)")
+            return img
 
     print("  ⚠️  HF failed — trying stock image...")
     img = _stock_image(headline)
@@ -374,10 +385,16 @@ def create_post_image(headline: str, output_path: str, category: str = "health",
                       source: str = "", tag: str = "HEALTH NEWS",
                       fallback_color: tuple = (30, 30, 30)) -> str | None:
     print(f'\n📸 Creating image: "{headline[:60]}..."')
-    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-    prompt = _build_prompt(headline)
+    prompt = build_prompt(headline)
     bg     = generate_background(prompt, headline=headline)
-    final  = add_text_overlay(bg, headline, tag=tag) if bg else _create_dark_card(headline, tag=tag)
+    return render_post_image(bg, headline, output_path, tag=tag)
+
+
+def render_post_image(bg: Image.Image | None, headline: str, output_path: str,
+                      tag: str = "HEALTH NEWS") -> str:
+    """Overlay the headline on `bg` (dark card if None) and save it to output_path."""
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    final = add_text_overlay(bg, headline, tag=tag) if bg else _create_dark_card(headline, tag=tag)
     if bg is None:
         print("  ⚠️  Using dark card fallback.")
     final.save(output_path, quality=92)
@@ -0,0 +1,148 @@
+"""
+keyword_matcher.py
+Single-pass multi-keyword matching (Aho-Corasick) for every keyword scorer.
+
+The scorers used to loop over their keyword lists doing `kw in text` — one
+scan of the text per keyword, repeated per list. build_matcher() compiles
+all of a module's lists into one automaton (once, at import); scan() walks
+the text a single time and reports every keyword hit with its category.
+Scoring then becomes a lookup over the hit dict.
+
+Matching is plain substring semantics, exactly like `kw in text`
+(overlapping and nested keywords all hit). Text is lower-cased by scan().
+
+Word-boundary categories (word_categories=...) are for blocklists, where a
+substring hit on "war" inside "software" silently drops a good article:
+  "war"           whole word, plural allowed   → war, wars, post-war — not reward
+  "death toll"    phrase, same rule at both ends
+  "terror*"       stem: word start, any ending → terror, terrorist, terrorism
+
+  MATCHER = build_matcher({"negative": ["war", "crime"], "viral": {"new study": 5}})
+  hits    = scan(MATCHER, title + " " + summary)
+  hits["negative"]            → {"war": 3}      keyword → end offset of first hit
+  total(MATCHER, hits, "viral") → summed weight of the viral hits
+"""
+
+from collections import deque
+
+SUBSTRING, WORD, STEM = 0, 1, 2
+_PLURAL_ES = ("s", "x", "z", "ch", "sh")
+
+
+def _mode(kw: str, bounded: bool) -> int:
+    if not bounded:
+        return SUBSTRING
+    return STEM if kw.endswith("*") else WORD
+
+
+def build_matcher(groups: dict[str, dict[str, float] | list[str]],
+                  word_categories: tuple = ()) -> dict:
+    """
+    Compile {category: keywords} into one automaton.
+    A list weighs 1 per entry (a keyword listed twice weighs 2); a dict maps
+    keyword → weight. The same keyword may sit in several categories.
+    Categories named in word_categories match on word boundaries (see above);
+    the rest keep substring semantics.
+    """
+    goto    = [{}]
+    outputs = [[]]
+    weights = {}
+    for category, keywords in groups.items():
+        table = weights.setdefault(category, {})
+        pairs = keywords.items() if isinstance(keywords, dict) else ((kw, 1) for kw in keywords)
+        for kw, weight in pairs:
+            kw = kw.lower()
+            if kw in table:
+                table[kw] += weight
+                continue
+            table[kw] = weight
+            mode    = _mode(kw, category in word_categories)
+            pattern = kw.rstrip("*") if mode == STEM else kw
+            node    = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    outputs.append([])
+                    nxt = goto[node][ch] = len(goto) - 1
+                node = nxt
+            outputs[node].append((category, kw, len(pattern), mode,
+                                  pattern.endswith(_PLURAL_ES)))
+
+    # Failure links (BFS), folded into a full transition table so scan()
+    # is one dict lookup per character with no fail-chain walking
+    fail  = [0] * len(goto)
+    order = []
+    queue = deque(goto[0].values())
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for ch, nxt in goto[node].items():
+            queue.append(nxt)
+            f = fail[node]
+            while f and ch not in goto[f]:
+                f = fail[f]
+            fail[nxt]    = goto[f].get(ch, 0)
+            outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+
+    delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+    for node in order:
+        row = dict(delta[fail[node]])
+        row.update(goto[node])
+        delta[node] = row
+
+    return {
+        "delta":   delta,
+        "outputs": [tuple(o) for o in outputs],
+        "weights": weights,
+    }
+
+
+def _bounded(text: str, end: int, length: int, mode: int, plural_es: bool) -> bool:
+    """Word-boundary check for a hit ending at text[end - 1]."""
+    start = end - length
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    if mode == STEM:
+        return True
+    if text.startswith("es" if plural_es else "s", end):
+        end += 2 if plural_es else 1
+    return end >= len(text) or not text[end].isalnum()
+
+
+def scan(matcher: dict, text: str) -> dict[str, dict[str, int]]:
+    """
+    One pass over `text`. Returns {category: {keyword: end offset of its
+    first occurrence}} with every category present (empty when nothing hit).
+    """
+    delta   = matcher["delta"]
+    outputs = matcher["outputs"]
+    hits    = {category: {} for category in matcher["weights"]}
+    text    = text.lower()
+    node    = 0
+    for i, ch in enumerate(text):
+        node = delta[node].get(ch, 0)
+        if outputs[node]:
+            for category, kw, length, mode, plural_es in outputs[node]:
+                if mode and not _bounded(text, i + 1, length, mode, plural_es):
+                    continue
+                hits[category].setdefault(kw, i + 1)
+    return hits
+
+
+def total(matcher: dict, hits: dict, category: str) -> float:
+    """Summed weight of the keywords hit in one category."""
+    table = matcher["weights"][category]
+    return sum(table[kw] for kw in hits[category])
+
+
+def within(hits: dict, category: str, end: int) -> list[str]:
+    """Keywords of a category that occur inside text[:end] (e.g. the title part)."""
+    return [kw for kw, pos in hits[category].items() if pos <= end]
+
+
+if __name__ == "__main__":
+    m = build_matcher({"negative": ["war", "nba", "terror*"], "viral": {"new study": 5, "study": 2}},
+                      word_categories=("negative",))
+    h = scan(m, "A new study on software reward systems, wars and terrorism")
+    print(h, total(m, h, "viral"))
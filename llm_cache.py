@@ -0,0 +1,137 @@
+"""
+llm_cache.py
+Disk cache of LLM answers, content-addressed by the request.
+
+The key is a hash of (provider, model, system prompt, user prompt,
+generation config), so only an identical request can hit. A re-run after a
+late failure (image provider down, Facebook post failed) or a real run
+after a dry run the same day gets the earlier selection / verdicts / image
+prompt back instead of spending free-tier quota on it again.
+
+  - TTL        entries older than TTL_HOURS are never served
+  - size cap   total cached text is kept under MAX_BYTES by evicting the
+               least recently used entries
+  - opt-out    llm_client.generate(..., cache=False) for prompts where a
+               fresh answer is wanted — the creative generators (hook,
+               LP posts / poll / news post, faith post) all opt out;
+               LLM_CACHE=0 disables it entirely
+  - rejects    only answers `parse` accepted are stored, so a caller that
+               validates an answer must do it in `parse` (or not cache)
+
+Database: .cache/llm_cache.db  (restored between workflow runs with .cache)
+
+CLI summary:
+  python llm_cache.py            entries / size / age
+  python llm_cache.py --clear
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from config import settings
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH   = os.path.join(_BASE_DIR, ".cache", "llm_cache.db")
+ENABLED   = settings.llm_cache
+TTL_HOURS = settings.llm_cache_ttl_hours
+MAX_BYTES = int(settings.llm_cache_max_mb * 1024 * 1024)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key        TEXT PRIMARY KEY,
+    provider   TEXT NOT NULL,
+    model      TEXT NOT NULL,
+    text       TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used);
+"""
+
+_conn = None
+_lock = threading.Lock()   # hedged calls use the cache from several threads
+
+
+def _db() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        _conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _conn.executescript(_SCHEMA)
+    return _conn
+
+
+def request_key(provider: str, model: str, request: dict) -> str:
+    """sha256 of everything that shapes the answer."""
+    material = {"provider": provider, "model": model,
+                **{k: v for k, v in request.items() if v is not None}}
+    return hashlib.sha256(json.dumps(material, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+def get(key: str) -> str | None:
+    """Cached text for `key` if younger than TTL_HOURS (and mark it used)."""
+    now = time.time()
+    try:
+        with _lock, _db() as db:
+            row = db.execute("SELECT text FROM responses WHERE key = ? AND created_at >= ?",
+                             (key, now - TTL_HOURS * 3600)).fetchone()
+            if row:
+                db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+    except sqlite3.Error as e:
+        print(f"  ⚠️  LLM cache error: {e}")
+        return None
+    return row[0] if row else None
+
+
+def put(key: str, provider: str, model: str, text: str) -> None:
+    """Store an answer, then drop expired entries and evict LRU ones past MAX_BYTES."""
+    now  = time.time()
+    size = len(text.encode())
+    try:
+        with _lock, _db() as db:
+            db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (key, provider, model, text, size, now, now))
+            db.execute("DELETE FROM responses WHERE created_at < ?", (now - TTL_HOURS * 3600,))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > MAX_BYTES:
+                for old_key, old_size in db.execute(
+                        "SELECT key, size FROM responses ORDER BY last_used").fetchall():
+                    if total <= MAX_BYTES:
+                        break
+                    db.execute("DELETE FROM responses WHERE key = ?", (old_key,))
+                    total -= old_size
+    except sqlite3.Error as e:
+        print(f"  ⚠️  LLM cache error: {e}")
+
+
+def forget(key: str) -> None:
+    """Drop one entry (e.g. an answer the caller rejected)."""
+    try:
+        with _lock, _db() as db:
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+    except sqlite3.Error as e:
+        print(f"  ⚠️  LLM cache error: {e}")
+
+
+def clear() -> None:
+    with _lock, _db() as db:
+        db.execute("DELETE FROM responses")
+
+
+if __name__ == "__main__":
+    import sys
+    if "--clear" in sys.argv:
+        clear()
+        print("🧹 LLM cache cleared")
+    with _db() as db:
+        count, size, oldest = db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(created_at) FROM responses").fetchone()
+        print(f"🗄️  LLM cache: {count} answers, {size / 1024:.1f} KB / {MAX_BYTES / 1024 / 1024:.0f} MB cap"
+              + (f", oldest {(time.time() - oldest) / 3600:.1f}h" if oldest else ""))
+        for provider, model, n in db.execute(
+                "SELECT provider, model, COUNT(*) FROM responses GROUP BY provider, model"):
+            print(f"  {provider:<11} {model:<40} {n:>4}")
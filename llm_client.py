@@ -0,0 +1,351 @@
+"""
+llm_client.py
+One client for every LLM call in the repo (Gemini, OpenRouter, ...).
+
+Call sites describe what they want — prompt, optional system prompt, model
+per provider, generation settings, a deadline — and get text back (or the
+result of their own parse function). Providers are pluggable: a provider is
+a function that turns a request into text and raises LLMError on failure.
+
+  - per-call deadline   the whole call (retries and fallback included) ends
+                        by `deadline` seconds; each provider in the chain
+                        gets an equal share of what is left when it starts.
+                        Inside a run the deadline is capped by run_budget, and
+                        with under MIN_DEADLINE seconds left no call is made
+  - retries             429 / 5xx / connection errors are retried with
+                        jittered backoff (Retry-After honoured) while the
+                        provider's share of the deadline allows
+  - fallback            providers are tried in order; a failed request or
+                        an answer rejected by `parse` moves to the next
+  - hedged mode         hedge=True (or LLM_HEDGE=1): if the first provider
+                        has not answered within its p90 latency, the next
+                        one is started in parallel — first valid answer wins
+  - response cache      answers `parse` accepted are kept in llm_cache (24h
+                        TTL) and an identical request is answered from it;
+                        cache=False for creative text that should be fresh
+
+  text = llm_client.generate(prompt, cache=False, label="Hook")
+  pick = llm_client.generate(prompt, parse=json.loads, hedge=True, label="Selector")
+  text = llm_client.generate(msg, system=SYSTEM_PROMPT, temperature=0.9, max_tokens=500, cache=False,
+                             models={"gemini": "gemini-2.5-flash-lite", "openrouter": "openrouter/free"})
+
+Latency samples per provider are kept in .cache/llm_latency.json so the
+hedge delay reflects previous runs, not just this one.
+"""
+
+import os
+import json
+import time
+import queue
+import random
+import threading
+import contextvars
+from collections import deque
+import http_client
+import llm_cache
+import run_budget
+from config import settings
+
+GEMINI_API_KEY     = settings.gemini_api_key
+OPENROUTER_API_KEY = settings.openrouter_api_key
+
+DEFAULT_MODELS = {
+    "gemini":     "gemini-2.5-flash",
+    "openrouter": "mistralai/mistral-7b-instruct:free",
+}
+DEFAULT_PROVIDERS = ("gemini", "openrouter")
+DEFAULT_DEADLINE  = 30       # seconds for the whole call
+MIN_DEADLINE      = 5        # below this much run budget, don't start a call
+MAX_ATTEMPTS      = 3        # per provider
+BACKOFF_BASE      = 1.0      # seconds — 1, 2, 4 … plus jitter
+RETRY_STATUSES    = {429, 500, 502, 503, 504}
+HEDGE             = settings.llm_hedge
+HEDGE_DELAY       = 8.0      # seconds, until a provider has MIN_SAMPLES latencies
+MIN_SAMPLES       = 5
+LATENCY_SAMPLES   = 50
+
+_BASE_DIR     = os.path.dirname(os.path.abspath(__file__))
+LATENCY_FILE  = os.path.join(_BASE_DIR, ".cache", "llm_latency.json")
+
+_latency      = None          # provider → deque of seconds, loaded on first use
+_latency_lock = threading.Lock()
+
+
+class LLMError(Exception):
+    """A provider call failed; retryable errors may succeed on another attempt."""
+
+    def __init__(self, message: str, retryable: bool = False, retry_after: float | None = None):
+        super().__init__(message)
+        self.retryable   = retryable
+        self.retry_after = retry_after
+
+
+# ── Providers ──────────────────────────────────────────────────────────────────
+
+def _post(url: str, timeout: float, **kwargs) -> dict:
+    """POST once (retries happen in generate), map HTTP/API failures to LLMError."""
+    try:
+        resp = http_client.post(url, timeout=(min(5, timeout), timeout), retries=0, **kwargs)
+    except Exception as e:
+        raise LLMError(f"{type(e).__name__}: {e}", retryable=True) from e
+    retry_after = resp.headers.get("Retry-After", "")
+    try:
+        data = resp.json()
+    except ValueError:
+        data = {}
+    if resp.status_code in RETRY_STATUSES:
+        raise LLMError(f"HTTP {resp.status_code}: {resp.text[:200]}", retryable=True,
+                       retry_after=float(retry_after) if retry_after.isdigit() else None)
+    if "error" in data:
+        error = data["error"]
+        code  = error.get("code") if isinstance(error, dict) else None
+        raise LLMError(f"API error: {error.get('message', error) if isinstance(error, dict) else error}",
+                       retryable=code in RETRY_STATUSES)
+    if resp.status_code >= 400:
+        raise LLMError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+    return data
+
+
+def _gemini(request: dict, model: str, timeout: float) -> str:
+    config = {}
+    for key, field in (("temperature", "temperature"), ("max_tokens", "maxOutputTokens"), ("top_p", "topP")):
+        if request.get(key) is not None:
+            config[field] = request[key]
+    if request.get("thinking_budget") is not None:
+        config["thinkingConfig"] = {"thinkingBudget": request["thinking_budget"]}
+    body = {"contents": [{"parts": [{"text": request["prompt"]}]}]}
+    if request.get("system"):
+        body["system_instruction"] = {"parts": [{"text": request["system"]}]}
+    if config:
+        body["generationConfig"] = config
+
+    data = _post(f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+                 f"?key={GEMINI_API_KEY}", timeout, json=body)
+    candidates = data.get("candidates", [])
+    if not candidates:
+        raise LLMError(f"no candidates (blocked or MAX_TOKENS): {str(data)[:200]}")
+    if candidates[0].get("finishReason") == "MAX_TOKENS":
+        print("  ⚠️  Gemini hit MAX_TOKENS limit — response may be incomplete.")
+    parts = candidates[0].get("content", {}).get("parts", [])
+    return "".join(p.get("text", "") for p in parts)
+
+
+def _openrouter(request: dict, model: str, timeout: float) -> str:
+    # OpenRouter's free models get the system prompt inline, ahead of the message
+    prompt = request["prompt"]
+    if request.get("system"):
+        prompt = f"{request['system']}\n\n---\n\n{prompt}"
+    data = _post(
+        "https://openrouter.ai/api/v1/chat/completions", timeout,
+        headers={"Authorization": f"Bearer {OPENROUTER_API_KEY}", "Content-Type": "application/json"},
+        json={"model": model, "messages": [{"role": "user", "content": prompt}]},
+    )
+    choices = data.get("choices", [])
+    if not choices:
+        raise LLMError(f"no choices: {str(data)[:200]}")
+    return choices[0].get("message", {}).get("content") or ""
+
+
+PROVIDERS = {
+    "gemini":     {"call": _gemini,     "available": lambda: bool(GEMINI_API_KEY)},
+    "openrouter": {"call": _openrouter, "available": lambda: bool(OPENROUTER_API_KEY)},
+}
+
+
+def register_provider(name: str, call, available=lambda: True, model: str | None = None) -> None:
+    """Add a provider: call(request, model, timeout) -> text, raising LLMError on failure."""
+    PROVIDERS[name] = {"call": call, "available": available}
+    if model:
+        DEFAULT_MODELS[name] = model
+
+
+# ── Latency tracking (hedge delay) ────────────────────────────────────────────
+
+def _latencies() -> dict:
+    global _latency
+    if _latency is None:
+        try:
+            with open(LATENCY_FILE) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            saved = {}
+        _latency = {name: deque(values, maxlen=LATENCY_SAMPLES) for name, values in saved.items()}
+    return _latency
+
+
+def _record_latency(name: str, seconds: float) -> None:
+    with _latency_lock:
+        samples = _latencies().setdefault(name, deque(maxlen=LATENCY_SAMPLES))
+        samples.append(round(seconds, 3))
+        try:
+            os.makedirs(os.path.dirname(LATENCY_FILE), exist_ok=True)
+            tmp = LATENCY_FILE + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump({n: list(v) for n, v in _latency.items()}, f)
+            os.replace(tmp, LATENCY_FILE)
+        except OSError:
+            pass
+
+
+def p90_latency(name: str) -> float:
+    """90th-percentile answer time of a provider; HEDGE_DELAY until enough samples."""
+    with _latency_lock:
+        samples = sorted(_latencies().get(name, ()))
+    if len(samples) < MIN_SAMPLES:
+        return HEDGE_DELAY
+    return samples[int(0.9 * (len(samples) - 1))]
+
+
+# ── Calling ────────────────────────────────────────────────────────────────────
+
+def _cached(chain: list[str], request: dict, models: dict, parse, label: str):
+    """A still-valid cached answer from any provider in the chain, or None."""
+    for name in chain:
+        key  = llm_cache.request_key(name, models[name], request)
+        text = llm_cache.get(key)
+        if text is None:
+            continue
+        try:
+            result = parse(text) if parse else text
+        except Exception:
+            result = None
+        if result is not None:
+            print(f"  ♻️  {label}: cached {name} answer")
+            return result
+        llm_cache.forget(key)
+    return None
+
+
+def _attempt(name: str, request: dict, model: str, parse, until: float, label: str, cache: bool = False):
+    """One provider, with retries, until `until` (monotonic). Returns the parsed answer or None."""
+    call = PROVIDERS[name]["call"]
+    for attempt in range(MAX_ATTEMPTS):
+        remaining = until - time.monotonic()
+        if remaining < 1:
+            print(f"  ⚠️  {label}: {name} out of time")
+            return None
+        start = time.monotonic()
+        try:
+            text = (call(request, model, remaining) or "").strip()
+        except LLMError as e:
+            print(f"  ⚠️  {label}: {name} error: {e}")
+            if not e.retryable:
+                return None
+            wait = e.retry_after if e.retry_after is not None else BACKOFF_BASE * 2 ** attempt + random.uniform(0, BACKOFF_BASE)
+            if attempt == MAX_ATTEMPTS - 1 or time.monotonic() + wait >= until - 1:
+                return None
+            time.sleep(wait)
+            continue
+        _record_latency(name, time.monotonic() - start)
+        if not text:
+            print(f"  ⚠️  {label}: {name} returned empty content")
+            return None
+        try:
+            result = parse(text) if parse else text
+        except Exception as e:
+            print(f"  ⚠️  {label}: {name} answer rejected: {e}")
+            return None
+        if result is None:
+            print(f"  ⚠️  {label}: {name} answer rejected")
+        elif cache:
+            llm_cache.put(llm_cache.request_key(name, model, request), name, model, text)
+        return result
+    return None
+
+
+def _hedged(chain: list[str], request: dict, models: dict, parse, until: float, label: str, cache: bool):
+    """
+    Start chain[0]; start the next provider when the newest one passes its
+    p90 latency or a running one fails. First valid answer wins — the
+    others finish in the background (daemon threads, bounded by `until`).
+    """
+    results = queue.Queue()
+    state   = {"next": 0, "running": 0, "started": 0.0}
+
+    def start():
+        name = chain[state["next"]]
+        state["next"]    += 1
+        state["running"] += 1
+        state["started"]  = time.monotonic()
+        context = contextvars.copy_context()   # keep run_trace spans under the caller's stage
+        threading.Thread(
+            target=lambda: results.put(context.run(_attempt, name, request, models[name], parse, until, label, cache)),
+            daemon=True,
+        ).start()
+
+    start()
+    while state["running"]:
+        can_hedge  = state["next"] < len(chain)
+        newest     = chain[state["next"] - 1]
+        wait_until = min(until, state["started"] + p90_latency(newest)) if can_hedge else until
+        try:
+            result = results.get(timeout=max(0.0, wait_until - time.monotonic()))
+        except queue.Empty:
+            if not can_hedge or time.monotonic() >= until:
+                return None
+            print(f"  ⏱️  {label}: {newest} slower than its p90 — hedging with {chain[state['next']]}")
+            start()
+            continue
+        state["running"] -= 1
+        if result is not None:
+            return result
+        if state["next"] < len(chain):
+            start()
+    return None
+
+
+def generate(prompt: str, *, system: str | None = None, parse=None,
+             providers: tuple = DEFAULT_PROVIDERS, models: dict | None = None,
+             temperature: float | None = None, max_tokens: int | None = None,
+             top_p: float | None = None, thinking_budget: int | None = None,
+             deadline: float = DEFAULT_DEADLINE, hedge: bool | None = None,
+             cache: bool = True, label: str = "LLM"):
+    """
+    Ask the first available provider (falling back / hedging through the
+    rest) and return its answer — `parse(text)` when parse is given, the
+    stripped text otherwise. None when no provider produced a valid answer
+    before the deadline. cache=False skips the response cache both ways —
+    use it for creative text, where a re-run should get a new answer. Only
+    answers `parse` accepts are cached: validate there, not after the call,
+    or a rejected answer would be served again.
+    """
+    chain = [p for p in providers if p in PROVIDERS and PROVIDERS[p]["available"]()]
+    if not chain:
+        return None
+    request = {
+        "prompt":          prompt,
+        "system":          system,
+        "temperature":     temperature,
+        "max_tokens":      max_tokens,
+        "top_p":           top_p,
+        "thinking_budget": thinking_budget,
+    }
+    models = {name: (models or {}).get(name) or DEFAULT_MODELS.get(name) for name in chain}
+    cache  = cache and llm_cache.ENABLED
+
+    if cache:
+        result = _cached(chain, request, models, parse, label)
+        if result is not None:
+            return result
+
+    # The run budget (run_budget) caps the deadline; too little left → no call at all
+    if not run_budget.allows(label, MIN_DEADLINE, "its fallback (no LLM call)"):
+        return None
+    until = time.monotonic() + min(deadline, run_budget.remaining())
+
+    if (HEDGE if hedge is None else hedge) and len(chain) > 1:
+        return _hedged(chain, request, models, parse, until, label, cache)
+
+    for i, name in enumerate(chain):
+        share  = (until - time.monotonic()) / (len(chain) - i)
+        result = _attempt(name, request, models[name], parse, time.monotonic() + share, label, cache)
+        if result is not None:
+            return result
+        if i < len(chain) - 1:
+            print(f"  ↪️  {label}: falling back to {chain[i + 1]}")
+    return None
+
+
+if __name__ == "__main__":
+    print({name: round(p90_latency(name), 2) for name in PROVIDERS})
+    print(generate("Reply with the single word: ok", label="Smoke test", deadline=20))
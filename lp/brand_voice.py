@@ -66,10 +66,11 @@ IMAGE_BG_FALLBACK = (12, 12, 16)
 PAGE_HANDLE      = "@lawrenceprecioussia"
 
 # ── Forbidden terms — 3-layer safety ─────────────────────────────────────────
+# Word-boundary matched (plurals included); trailing * = stem rule
 FORBIDDEN_TERMS = [
     "usana", "mlm", "multi-level", "network marketing", "direct selling",
-    "business opportunity", "income opportunity", "downline", "upline",
-    "brand partner", "distributor", "gold director", "diamond director",
-    "uem", "commission", "supplement", "health product",
+    "business opportunit*", "income opportunit*", "downline", "upline",
+    "brand partner*", "distributor*", "gold director", "diamond director",
+    "uem", "commission*", "supplement*", "health product",
     "join our team", "join us", "sign up", "register now",
 ]
@@ -11,16 +11,14 @@ Verse categories: leadership, success attitude, couple relationship,
 Schedule: Sunday 7:00 AM SGT (11:00 PM Saturday UTC)
 """
 
-import os
 import re
+import sys
 import datetime
-import requests
-from dotenv import load_dotenv
+from pathlib import Path
 
-load_dotenv()
-
-GEMINI_API_KEY     = os.getenv("GEMINI_API_KEY", "")
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
+# Shared LLM client from repo root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import llm_client
 
 # ─────────────────────────────────────────────────────────────────────────────
 # DOCTRINAL SAFETY
@@ -241,55 +239,19 @@ def _get_fallback(category: str = None) -> dict:
 # GEMINI / OPENROUTER CALLERS
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _call_gemini(prompt: str) -> str | None:
-    if not GEMINI_API_KEY:
-        return None
-    try:
-        resp = requests.post(
-            f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-lite:generateContent?key={GEMINI_API_KEY}",
-            json={
-                "system_instruction": {"parts": [{"text": FAITH_SYSTEM_PROMPT}]},
-                "contents": [{"parts": [{"text": prompt}]}],
-                "generationConfig": {
-                    "temperature": 0.80,
-                    "maxOutputTokens": 600,
-                    "topP": 0.90,
-                    "thinkingConfig": {"thinkingBudget": 0},
-                },
-            },
-            timeout=30,
-        )
-        data = resp.json()
-        if "error" in data:
-            print(f"  Warning: Gemini faith error: {data['error'].get('message', '')}")
-            return None
-        return data["candidates"][0]["content"]["parts"][0]["text"].strip()
-    except Exception as e:
-        print(f"  Warning: Gemini faith error: {e}")
-        return None
-
-
-def _call_openrouter(prompt: str) -> str | None:
-    if not OPENROUTER_API_KEY:
-        return None
-    full_prompt = FAITH_SYSTEM_PROMPT + "\n\n---\n\n" + prompt
-    try:
-        resp = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers={"Authorization": f"Bearer {OPENROUTER_API_KEY}", "Content-Type": "application/json"},
-            json={"model": "openrouter/free", "messages": [{"role": "user", "content": full_prompt}]},
-            timeout=30,
-        )
-        data = resp.json()
-        if "error" in data:
-            print(f"  Warning: OpenRouter error: {data['error'].get('message', '')}")
-            return None
-        choices = data.get("choices", [])
-        if choices:
-            return choices[0].get("message", {}).get("content", "").strip()
-    except Exception as e:
-        print(f"  Warning: OpenRouter faith error: {e}")
-    return None
+def _call_llm(prompt: str) -> str | None:
+    """Gemini Flash-Lite, falling back to the free OpenRouter router."""
+    return llm_client.generate(
+        prompt,
+        system          = FAITH_SYSTEM_PROMPT,
+        models          = {"gemini": "gemini-2.5-flash-lite", "openrouter": "openrouter/free"},
+        temperature     = 0.80,
+        max_tokens      = 600,
+        top_p           = 0.90,
+        thinking_budget = 0,
+        cache           = False,   # creative — a re-run gets a new post
+        label           = "Faith post",
+    )
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -327,7 +289,7 @@ def generate_faith_post() -> dict:
         f"CAPTION: [2-5 words Taglish]"
     )
 
-    raw = _call_gemini(user_msg) or _call_openrouter(user_msg)
+    raw = _call_llm(user_msg)
 
     if raw:
         print(f"\n--- Gemini raw (faith) ---\n{raw}\n---")
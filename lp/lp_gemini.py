@@ -9,138 +9,51 @@ Root cause of previous truncation: gemini-2.5-flash has thinking ON
 by default and thinking tokens count against maxOutputTokens, eating
 the budget before output is generated. Flash-Lite avoids this entirely.
 
-Fallback: OpenRouter (mistral-7b-instruct:free)
+Fallback: OpenRouter (openrouter/free), via the shared llm_client
 """
 
-import os
-import requests
-from dotenv import load_dotenv
+import sys
+from pathlib import Path
 from brand_voice import SYSTEM_PROMPT
 
-load_dotenv()
-
-GEMINI_API_KEY     = os.getenv("GEMINI_API_KEY", "")
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
+# Shared LLM client from repo root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import llm_client
 
 # gemini-2.5-flash-lite: free tier, thinking OFF by default, fast, reliable
 # thinkingBudget:0 added as an explicit safety net in every call
 GEMINI_MODEL = "gemini-2.5-flash-lite"
-GEMINI_URL   = (
-    "https://generativelanguage.googleapis.com/v1beta/models/"
-    f"{GEMINI_MODEL}:generateContent?key={{key}}"
-)
+
+# openrouter/free: zero-cost auto-router
+# Routes to best available free model based on request type
+# Basic chat → llama-3.3-70b, vision → gemma-3-27b, etc.
+# Never bills — safe for accounts with no credits
+OPENROUTER_MODEL = "openrouter/free"
 
 
-def call_gemini(user_message: str, temperature: float = 0.92, max_tokens: int = 500) -> str | None:
+def call_gemini(user_message: str, temperature: float = 0.92, max_tokens: int = 500,
+                cache: bool = False) -> str | None:
     """
     Call Gemini with the LP brand system prompt.
-    Falls back to OpenRouter (mistral-7b) if Gemini fails.
+    Falls back to OpenRouter (free router) if Gemini fails — llm_client
+    handles retries, the deadline and hedging. Not cached by default: posts
+    and polls should be fresh on a re-run, and their safety / format checks
+    happen after the call, so a rejected answer must not be stored.
     Returns raw text or None if both fail.
     """
-    result = _try_gemini(user_message, temperature, max_tokens)
-    if result:
-        return result
-
-    print("  ⚠️ Gemini failed — trying OpenRouter fallback...")
-    result = _try_openrouter(user_message)
-    if result:
-        return result
-
-    print("  ❌ Both Gemini and OpenRouter failed.")
-    return None
-
-
-def _try_gemini(user_message: str, temperature: float, max_tokens: int) -> str | None:
-    if not GEMINI_API_KEY:
-        return None
-    try:
-        resp = requests.post(
-            GEMINI_URL.format(key=GEMINI_API_KEY),
-            json={
-                "system_instruction": {"parts": [{"text": SYSTEM_PROMPT}]},
-                "contents": [{"parts": [{"text": user_message}]}],
-                "generationConfig": {
-                    "temperature": temperature,
-                    "maxOutputTokens": max_tokens,
-                    "topP": 0.95,
-                    # Explicitly disable thinking — prevents thinking tokens
-                    # consuming the output budget on 2.5 models
-                    "thinkingConfig": {"thinkingBudget": 0},
-                },
-            },
-            timeout=30,
-        )
-        data = resp.json()
-
-        # Surface API errors clearly in logs
-        if "error" in data:
-            print(f"  ⚠️ Gemini API error: {data['error'].get('message', data['error'])}")
-            return None
-
-        candidates = data.get("candidates", [])
-        if not candidates:
-            print(f"  ⚠️ Gemini returned no candidates. finishReason may be MAX_TOKENS.")
-            print(f"  ⚠️ Full response: {data}")
-            return None
-
-        # Check finish reason — MAX_TOKENS means output was cut off
-        finish_reason = candidates[0].get("finishReason", "")
-        if finish_reason == "MAX_TOKENS":
-            print(f"  ⚠️ Gemini hit MAX_TOKENS limit — response may be incomplete.")
-
-        text = candidates[0]["content"]["parts"][0]["text"].strip()
-        return text if text else None
-
-    except Exception as e:
-        print(f"  ⚠️ Gemini error: {e}")
-        return None
-
-
-def _try_openrouter(user_message: str) -> str | None:
-    if not OPENROUTER_API_KEY:
-        return None
-
-    full_prompt = f"{SYSTEM_PROMPT}\n\n---\n\n{user_message}"
-
-    try:
-        resp = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json={
-                # openrouter/free: zero-cost auto-router
-                # Routes to best available free model based on request type
-                # Basic chat → llama-3.3-70b, vision → gemma-3-27b, etc.
-                # Never bills — safe for accounts with no credits
-                "model": "openrouter/free",
-                "messages": [{"role": "user", "content": full_prompt}],
-            },
-            timeout=30,
-        )
-
-        data = resp.json()
-
-        # OpenRouter returns errors as {"error": {...}} not as HTTP error codes
-        if "error" in data:
-            print(f"  ⚠️ OpenRouter error: {data['error'].get('message', data['error'])}")
-            return None
-
-        choices = data.get("choices", [])
-        if not choices:
-            print(f"  ⚠️ OpenRouter returned no choices. Full response: {data}")
-            return None
-
-        content = choices[0].get("message", {}).get("content", "").strip()
-        if content:
-            model_used = data.get("model", "unknown")
-            print(f"  ✅ OpenRouter succeeded (routed to: {model_used})")
-            return content
-
-        print("  ⚠️ OpenRouter returned empty content.")
-        return None
-
-    except Exception as e:
-        print(f"  ⚠️ OpenRouter exception: {e}")
-        return None
+    result = llm_client.generate(
+        user_message,
+        system          = SYSTEM_PROMPT,
+        models          = {"gemini": GEMINI_MODEL, "openrouter": OPENROUTER_MODEL},
+        temperature     = temperature,
+        max_tokens      = max_tokens,
+        top_p           = 0.95,
+        # Explicitly disable thinking — prevents thinking tokens
+        # consuming the output budget on 2.5 models
+        thinking_budget = 0,
+        cache           = cache,
+        label           = "LP Gemini",
+    )
+    if not result:
+        print("  ❌ Both Gemini and OpenRouter failed.")
+    return result
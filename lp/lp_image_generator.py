@@ -14,27 +14,39 @@ Text card (Format A/B):
 """
 
 import os
+import sys
 import time
 import hashlib
-import requests
 from datetime import datetime
+from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
-from dotenv import load_dotenv
 from brand_voice import IMAGE_TAG, IMAGE_TAG_COLOR, IMAGE_BG_FALLBACK, PAGE_HANDLE
 
-load_dotenv()
+# Shared pooled HTTP client from repo root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import http_client
+import run_budget
+from config import settings
 
 IMAGE_WIDTH  = 1080
 IMAGE_HEIGHT = 1080
 
-HF_API_TOKEN = os.getenv("HF_API_TOKEN", "")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+HF_API_TOKEN   = settings.hf_api_token
+GEMINI_API_KEY = settings.gemini_api_key
 
 # HuggingFace model endpoints
 HF_SDXL_LIGHTNING = "https://router.huggingface.co/hf-inference/models/ByteDance/SDXL-Lightning"
 HF_SD15           = "https://router.huggingface.co/hf-inference/models/stable-diffusion-v1-5/stable-diffusion-v1-5"
 
+# Run budget (../run_budget.py): timeouts are cut to it, and a provider is
+# only tried with enough of it left — otherwise the text card is used
+HF_TIMEOUT     = 120   # per HF request
+HF_LOAD_WAIT   = 20    # after a 503 (model loading)
+HF_BUDGET      = 30    # seconds of run budget needed to try an HF model
+GEMINI_TIMEOUT = 60    # Gemini image request
+GEMINI_BUDGET  = 20    # seconds of run budget needed to try Gemini image
+
 SAFE_PROMPT = (
     "happy couple walking together in city park, warm golden hour sunlight, "
     "candid lifestyle photography, square composition, no text, no words"
@@ -88,7 +100,17 @@ STYLE_POOL = [
 ]
 
 
+_fonts = {}   # (paths, size) → font; kept for the life of the process (newsgen serve)
+
+
 def _load_font(paths: list, size: int) -> ImageFont.FreeTypeFont:
+    key = (tuple(paths), size)
+    if key not in _fonts:
+        _fonts[key] = _open_font(paths, size)
+    return _fonts[key]
+
+
+def _open_font(paths: list, size: int) -> ImageFont.FreeTypeFont:
     for path in paths:
         if os.path.exists(path):
             try:
@@ -225,21 +247,37 @@ def _draw_logo_bar(draw: ImageDraw.ImageDraw, w: int, y_top: int, bar_h: int = 5
     draw.rectangle([(0, y_top), (w, y_top + 2)], fill=(180, 120, 40))
 
 
+_genai = {}   # google-genai client + types, created on first use (the import alone takes ~0.7s)
+
+
+def _genai_client() -> tuple | None:
+    """(client, types) for Gemini image calls, or None if google-genai is not installed."""
+    if "client" not in _genai:
+        try:
+            from google import genai
+            from google.genai import types
+            _genai["client"] = (genai.Client(api_key=GEMINI_API_KEY), types)
+        except ImportError:
+            print("  ⚠️ google-genai not installed — skipping Gemini image")
+            _genai["client"] = None
+    return _genai["client"]
+
+
 def _gemini_image(prompt: str) -> Image.Image | None:
     """
     Primary image generator — Gemini 2.5 Flash Image Preview.
     Free tier: ~500 requests/day. Returns inline base64 PNG.
     """
-    if not GEMINI_API_KEY:
+    if not GEMINI_API_KEY or not _genai_client():
         return None
+    client, gtypes = _genai_client()
     try:
-        from google import genai as gai
-        from google.genai import types as gtypes
-        client = gai.Client(api_key=GEMINI_API_KEY)
         response = client.models.generate_content(
             model="gemini-2.5-flash-image",
             contents=prompt,
             config=gtypes.GenerateContentConfig(
+                http_options=gtypes.HttpOptions(
+                    timeout=int(run_budget.timeout(GEMINI_TIMEOUT) * 1000)),   # milliseconds
                 response_modalities=["IMAGE"],
                 image_config=gtypes.ImageConfig(
                     aspect_ratio="1:1",
@@ -265,7 +303,7 @@ def _hf_call(prompt: str, api_url: str) -> Image.Image | None:
     w = (min(IMAGE_WIDTH, 1024) // 8) * 8
     h = (min(IMAGE_HEIGHT, 1024) // 8) * 8
     try:
-        resp = requests.post(
+        resp = http_client.post(
             api_url,
             headers={"Authorization": f"Bearer {HF_API_TOKEN}"},
             json={"inputs": prompt, "parameters": {
@@ -273,19 +311,22 @@ def _hf_call(prompt: str, api_url: str) -> Image.Image | None:
                 "num_inference_steps": 4,   # SDXL-Lightning uses 4 steps
                 "guidance_scale": 0,        # Lightning requires guidance_scale=0
             }},
-            timeout=120,
+            timeout=run_budget.timeout(HF_TIMEOUT),
+            retries=0,                      # 503 = model loading, handled below
         )
         if resp.status_code == 200:
             img = Image.open(BytesIO(resp.content)).convert("RGB")
             return img.resize((IMAGE_WIDTH, IMAGE_HEIGHT), Image.LANCZOS)
-        if resp.status_code == 503:
-            print("  ⏳ HF model loading, waiting 20s...")
-            time.sleep(20)
-            resp2 = requests.post(
+        if resp.status_code == 503 and run_budget.allows("HF model loading", HF_LOAD_WAIT + HF_BUDGET,
+                                                          "no retry"):
+            print(f"  ⏳ HF model loading, waiting {HF_LOAD_WAIT}s...")
+            time.sleep(HF_LOAD_WAIT)
+            resp2 = http_client.post(
                 api_url,
                 headers={"Authorization": f"Bearer {HF_API_TOKEN}"},
                 json={"inputs": prompt},
-                timeout=120,
+                timeout=run_budget.timeout(HF_TIMEOUT),
+                retries=0,
             )
             if resp2.status_code == 200:
                 img = Image.open(BytesIO(resp2.content)).convert("RGB")
@@ -304,23 +345,26 @@ def generate_background(prompt: str) -> Image.Image | None:
     3. HuggingFace SD 1.5 (fallback 2 — reliable, lightweight)
     4. None → text card fallback handled by caller
     """
-    print("  🎨 Trying Gemini image generation...")
-    img = _gemini_image(prompt)
-    if img:
-        print(f"  ✅ Gemini image ({img.size[0]}x{img.size[1]}px)")
-        return img
-
-    print("  🤗 Trying HuggingFace SDXL-Lightning...")
-    img = _hf_call(prompt, HF_SDXL_LIGHTNING)
-    if img:
-        print(f"  ✅ SDXL-Lightning image ({img.size[0]}x{img.size[1]}px)")
-        return img
-
-    print("  🤗 Trying HuggingFace SD 1.5...")
-    img = _hf_call(SAFE_PROMPT, HF_SD15)
-    if img:
-        print(f"  ✅ SD 1.5 image ({img.size[0]}x{img.size[1]}px)")
-        return img
+    if run_budget.allows("background (Gemini image)", GEMINI_BUDGET, "HF / text card"):
+        print("  🎨 Trying Gemini image generation...")
+        img = _gemini_image(prompt)
+        if img:
+            print(f"  ✅ Gemini image ({img.size[0]}x{img.size[1]}px)")
+            return img
+
+    if run_budget.allows("background (SDXL)", HF_BUDGET, "SD 1.5 / text card"):
+        print("  🤗 Trying HuggingFace SDXL-Lightning...")
+        img = _hf_call(prompt, HF_SDXL_LIGHTNING)
+        if img:
+            print(f"  ✅ SDXL-Lightning image ({img.size[0]}x{img.size[1]}px)")
+            return img
+
+    if run_budget.allows("background (SD 1.5)", HF_BUDGET, "text card"):
+        print("  🤗 Trying HuggingFace SD 1.5...")
+        img = _hf_call(SAFE_PROMPT, HF_SD15)
+        if img:
+            print(f"  ✅ SD 1.5 image ({img.size[0]}x{img.size[1]}px)")
+            return img
 
     print("  ❌ All image providers failed — will use text card.")
     return None
@@ -13,6 +13,11 @@ Run modes:
   python lp_main.py --type cta             → rotating pre-written CTA post
   python lp_main.py --type text --dry-run  → generate + print, skip FB post
 
+Every run writes a timing trace (../run_trace.py) next to its image in
+lp_output_images/ (lp-<type>_<time>.trace.json for text-only posts). The run
+has one time budget (../run_budget.py, RUN_BUDGET seconds); when it runs low,
+LLM calls fall back to the pre-written posts and images to the text card.
+
 Env vars (GitHub Secrets):
   GEMINI_API_KEY            — shared with news-generator
   OPENROUTER_API_KEY        — shared with news-generator (optional fallback)
@@ -22,28 +27,23 @@ Env vars (GitHub Secrets):
 """
 
 import argparse
-import os
 import sys
 import datetime
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load .env from repo root (one level up from lp/)
-load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env")
+# Shared modules from repo root; settings (incl. the root .env) load once in config
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import settings
+import http_client
+import run_trace
+import run_budget
 
-# All imports from the lp/ subfolder
+# All imports from the lp/ subfolder. The image generator (PIL) and the news
+# fetcher (feed stack) are imported by the post types that use them.
 from lp_post_generator import generate_text_post, generate_poll_post, generate_news_hook
-from lp_news_fetcher import fetch_top_articles, save_posted_article
-from lp_image_generator import create_post_image, create_text_card
 from lp_faith_generator import generate_faith_post
 from brand_voice import WEEKLY_CALENDAR
 
-# Shared fb_poster from repo root — safe to reuse, uses different env var names
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from fb_poster import post_to_facebook as _post_image, FB_PAGE_ID as _HEALTH_ID
-
-import requests
-
 OUTPUT_DIR = Path(__file__).parent.parent / "lp_output_images"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
@@ -56,8 +56,8 @@ GRAPH_API = "https://graph.facebook.com/v19.0"
 
 def _lp_creds() -> tuple[str, str]:
     return (
-        os.environ.get("FB_LP_PAGE_ID", ""),
-        os.environ.get("FB_LP_PAGE_ACCESS_TOKEN", ""),
+        settings.fb_lp_page_id,
+        settings.fb_lp_page_access_token,
     )
 
 
@@ -71,7 +71,7 @@ def lp_post_image(image_path: str, caption: str, first_comment: str = "") -> boo
         import time
         print("  📤 Uploading image...")
         with open(image_path, "rb") as f:
-            up = requests.post(
+            up = http_client.post(
                 f"{GRAPH_API}/{page_id}/photos",
                 data={"access_token": token, "published": "false"},
                 files={"source": f}, timeout=60,
@@ -83,11 +83,11 @@ def lp_post_image(image_path: str, caption: str, first_comment: str = "") -> boo
         print(f"  ✅ Photo uploaded (id: {photo_id})")
 
         print("  📢 Publishing post...")
-        pr = requests.post(
+        pr = http_client.post(
             f"{GRAPH_API}/{page_id}/feed",
             data={"access_token": token, "message": caption,
                   "attached_media[0]": f'{{"media_fbid":"{photo_id}"}}'},
-            timeout=30,
+            timeout=30, retries=0,   # a retried 5xx could publish twice
         )
         pd = pr.json()
         if "id" not in pd:
@@ -97,9 +97,9 @@ def lp_post_image(image_path: str, caption: str, first_comment: str = "") -> boo
 
         if first_comment:
             time.sleep(3)
-            cr = requests.post(
+            cr = http_client.post(
                 f"{GRAPH_API}/{post_id}/comments",
-                data={"access_token": token, "message": first_comment}, timeout=15,
+                data={"access_token": token, "message": first_comment}, timeout=15, retries=0,
             )
             if "id" in cr.json():
                 print("  💬 First comment added.")
@@ -116,9 +116,9 @@ def lp_post_text(message: str) -> bool:
         print("  ❌ FB_LP_PAGE_ID or FB_LP_PAGE_ACCESS_TOKEN not set.")
         return False
     try:
-        resp = requests.post(
+        resp = http_client.post(
             f"{GRAPH_API}/{page_id}/feed",
-            data={"access_token": token, "message": message}, timeout=30,
+            data={"access_token": token, "message": message}, timeout=30, retries=0,
         )
         data = resp.json()
         if "id" in data:
@@ -132,7 +132,17 @@ def lp_post_text(message: str) -> bool:
 # PIPELINES
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _traced_post(post_fn, *args, **kwargs) -> bool:
+    """Run an lp_post_* call as the run trace's "post" stage."""
+    with run_trace.span("post") as trace:
+        ok = post_fn(*args, **kwargs)
+        if not ok:
+            trace["outcome"] = "failed"
+    return ok
+
+
 def run_text_post(fmt: str, hook: str, dry_run: bool):
+    from lp_image_generator import create_post_image
     # New format system — route by day if not specified
     if fmt == "any":
         day = datetime.date.today().weekday()
@@ -141,7 +151,8 @@ def run_text_post(fmt: str, hook: str, dry_run: bool):
         print(f"  📅 Calendar: {['Mon','Tue','Wed','Thu','Fri','Sat','Sun'][day]} → Format {fmt}")
 
     print("\n[1/4] Generating text post...")
-    result = generate_text_post(post_format=fmt)
+    with run_trace.span("generate"):
+        result = generate_text_post(post_format=fmt)
 
     # All new formats use text card — clean, bold, no photo needed
     use_text_card = True
@@ -150,7 +161,9 @@ def run_text_post(fmt: str, hook: str, dry_run: bool):
     ts       = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     img_path = str(OUTPUT_DIR / f"lp_post_{ts}.jpg")
     image_text = result.get("image_hook") or result["post"][:80]
-    saved = create_post_image(post_text=image_text, output_path=img_path, use_text_card=True)
+    run_trace.set_output(img_path)
+    with run_trace.span("image"):
+        saved = create_post_image(post_text=image_text, output_path=img_path, use_text_card=True)
     if not saved:
         print("❌ Image creation failed."); sys.exit(1)
 
@@ -164,13 +177,14 @@ def run_text_post(fmt: str, hook: str, dry_run: bool):
         return
 
     print("\n[3/4] Posting to Facebook...")
-    ok = lp_post_image(saved, fb_msg)
+    ok = _traced_post(lp_post_image, saved, fb_msg)
     print("\n✅ Done!" if ok else "\n❌ Post failed.")
 
 
 def run_poll_post(dry_run: bool):
     print("\n[1/2] Generating poll post...")
-    result = generate_poll_post()
+    with run_trace.span("generate"):
+        result = generate_poll_post()
     print(f"\n  QUESTION: {result['question']}")
     for opt in result["options"]:
         print(f"  {opt}")
@@ -181,13 +195,16 @@ def run_poll_post(dry_run: bool):
         return
 
     print("\n[2/2] Posting to Facebook...")
-    ok = lp_post_text(result["fb_message"])
+    ok = _traced_post(lp_post_text, result["fb_message"])
     print("\n✅ Done!" if ok else "\n❌ Post failed.")
 
 
-def run_news_post(dry_run: bool):
+def run_news_post(dry_run: bool, full_rescan: bool = False):
+    from lp_news_fetcher import fetch_top_articles, save_posted_article
+    from lp_image_generator import create_post_image
     print("\n[1/5] Fetching LP news articles...")
-    articles = fetch_top_articles(max_articles=5)
+    with run_trace.span("fetch"):
+        articles = fetch_top_articles(max_articles=5, full_rescan=full_rescan)
     if not articles:
         print("  ⚠️ No relevant articles found today. Skipping news post.")
         print("  (This is normal — the filter rejected all articles as off-topic.)")
@@ -199,14 +216,17 @@ def run_news_post(dry_run: bool):
     print(f"  Source:   {best['source']} | Score: {best['score']}")
 
     print("\n[2/5] Generating news hook...")
-    result = generate_news_hook(best)
+    with run_trace.span("generate"):
+        result = generate_news_hook(best)
     print(f"\n  POST:    {result['post']}")
     print(f"  CAPTION: {result['caption']}")
 
     print("\n[3/5] Generating image...")
     ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     img_path = str(OUTPUT_DIR / f"lp_news_{ts}.jpg")
-    saved = create_post_image(post_text=result["post"], output_path=img_path, tone="serious")
+    run_trace.set_output(img_path)
+    with run_trace.span("image"):
+        saved = create_post_image(post_text=result["post"], output_path=img_path, tone="serious")
     if not saved:
         print("❌ Image generation failed."); sys.exit(1)
 
@@ -224,7 +244,7 @@ def run_news_post(dry_run: bool):
 
     print("\n[4/5] Posting to Facebook...")
     first_comment = f"🔗 Read more: {result['article_url']}" if result["article_url"] else ""
-    ok = lp_post_image(saved, fb_msg, first_comment=first_comment)
+    ok = _traced_post(lp_post_image, saved, fb_msg, first_comment=first_comment)
 
     if ok:
         print("\n[5/5] Saving article to LP history...")
@@ -253,13 +273,15 @@ def run_cta_post(dry_run: bool):
         return
 
     print("\n[2/2] Posting to Facebook...")
-    ok = lp_post_text(fb_msg)
+    ok = _traced_post(lp_post_text, fb_msg)
     print("\n✅ Done!" if ok else "\n❌ Post failed.")
 
 
 def run_faith_post(dry_run: bool):
+    from lp_image_generator import create_text_card
     print("\n[1/3] Generating Sunday faith post...")
-    result = generate_faith_post()
+    with run_trace.span("generate"):
+        result = generate_faith_post()
     print(f"\n  CATEGORY: {result.get('category', 'N/A')}")
     print(f"  VERSE:    {result.get('verse', 'N/A')}")
     print(f"  CAPTION:  {result['caption']}")
@@ -270,7 +292,9 @@ def run_faith_post(dry_run: bool):
     print("\n[2/3] Creating text card...")
     ts       = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     img_path = str(OUTPUT_DIR / f"lp_faith_{ts}.jpg")
-    saved    = create_text_card(post_text=result["verse_text"], output_path=img_path)
+    run_trace.set_output(img_path)
+    with run_trace.span("image"):
+        saved = create_text_card(post_text=result["verse_text"], output_path=img_path)
     if not saved:
         print("  Warning: Text card failed. Posting as text only.")
 
@@ -285,9 +309,9 @@ def run_faith_post(dry_run: bool):
 
     print("\n[3/3] Posting to Facebook...")
     if saved:
-        ok = lp_post_image(saved, fb_msg)
+        ok = _traced_post(lp_post_image, saved, fb_msg)
     else:
-        ok = lp_post_text(fb_msg)
+        ok = _traced_post(lp_post_text, fb_msg)
     print("\nDone!" if ok else "\nPost failed.")
     # Bi-weekly gate — skip on odd ISO weeks
     week = datetime.date.today().isocalendar()[1]
@@ -307,7 +331,7 @@ def run_faith_post(dry_run: bool):
         return
 
     print("\n[2/2] Posting to Facebook...")
-    ok = lp_post_text(fb_msg)
+    ok = _traced_post(lp_post_text, fb_msg)
     print("\n✅ Done!" if ok else "\n❌ Post failed.")
 
 
@@ -315,6 +339,27 @@ def run_faith_post(dry_run: bool):
 # ENTRY POINT
 # ─────────────────────────────────────────────────────────────────────────────
 
+def run_post(post_type: str, fmt: str = "any", hook: str = "any", dry_run: bool = False,
+             full_rescan: bool = False):
+    """Run one post type with its run trace and run budget (CLI and newsgen serve)."""
+    run_trace.start_run(f"lp-{post_type}")
+    run_budget.start()
+    try:
+        if post_type == "text":
+            run_text_post(fmt, hook, dry_run)
+        elif post_type == "poll":
+            run_poll_post(dry_run)
+        elif post_type == "news":
+            run_news_post(dry_run, full_rescan)
+        elif post_type == "cta":
+            run_cta_post(dry_run)
+        elif post_type == "faith":
+            run_faith_post(dry_run)
+    finally:
+        run_trace.finish(OUTPUT_DIR)
+        run_budget.stop()
+
+
 def main():
     print("\n" + "=" * 60)
     print(f"  🌟 @lawrenceprecioussia | {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}")
@@ -323,26 +368,19 @@ def main():
     parser = argparse.ArgumentParser(description="@lawrenceprecioussia Facebook Automation")
     parser.add_argument("--type",    default="text", choices=["text", "poll", "news", "cta", "faith"],
                         help="Post type")
-    parser.add_argument("--format",  default=os.environ.get("POST_FORMAT", "any"),
+    parser.add_argument("--format",  default=settings.post_format,
                         help="Format: A / B / BW / C / D / E / any")
-    parser.add_argument("--hook",    default=os.environ.get("POST_HOOK", "any"),
+    parser.add_argument("--hook",    default=settings.post_hook,
                         help="Hook: HUMOR / PAIN / DREAM / WISDOM / PRIDE / any")
     parser.add_argument("--dry-run", action="store_true",
                         help="Generate without posting to Facebook")
+    parser.add_argument("--full-rescan", action="store_true",
+                        help="News: ignore feed watermarks, re-score every entry")
     args = parser.parse_args()
 
     print(f"  Type: {args.type} | Format: {args.format} | Hook: {args.hook} | Dry-run: {args.dry_run}\n")
 
-    if args.type == "text":
-        run_text_post(args.format, args.hook, args.dry_run)
-    elif args.type == "poll":
-        run_poll_post(args.dry_run)
-    elif args.type == "news":
-        run_news_post(args.dry_run)
-    elif args.type == "cta":
-        run_cta_post(args.dry_run)
-    elif args.type == "faith":
-        run_faith_post(args.dry_run)
+    run_post(args.type, args.format, args.hook, args.dry_run, args.full_rescan)
 
 
 if __name__ == "__main__":
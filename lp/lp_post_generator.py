@@ -8,11 +8,18 @@ Each designed to make Filipino professionals feel seen and want to share.
 """
 
 import re
+import sys
 import datetime
 import random
+from pathlib import Path
 from lp_gemini import call_gemini
 from brand_voice import SYSTEM_PROMPT, FORMATS, FORBIDDEN_TERMS
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from keyword_matcher import build_matcher, scan
+
+_FORBIDDEN = build_matcher({"forbidden": FORBIDDEN_TERMS}, word_categories=("forbidden",))
+
 # ─────────────────────────────────────────────────────────────────────────────
 # CONTENT SEEDS — topic pools per format, rotated weekly
 # ─────────────────────────────────────────────────────────────────────────────
@@ -180,10 +187,9 @@ def _parse(raw: str, field: str, stop: str = None) -> str:
 
 
 def _safety_check(text: str) -> tuple:
-    lower = text.lower()
-    for term in FORBIDDEN_TERMS:
-        if term in lower:
-            return False, f"Forbidden term: '{term}'"
+    hits = scan(_FORBIDDEN, text)["forbidden"]
+    if hits:
+        return False, f"Forbidden term: '{next(iter(hits))}'"
     return True, ""
 
 
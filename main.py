@@ -9,6 +9,15 @@ Flow:
   4. image_generator.py— create post image (Pollinations bg + Pillow text overlay)
   5. fb_poster.py      — post image + caption to Facebook Page
 
+Steps 3 and 4 only need the selected article, so they run as a stage graph
+(stage_graph.py) — the hook alongside image prompt → background → overlay.
+
+Every run writes a timing trace (run_trace.py) next to the post image —
+output_images/post_<time>.trace.json — and prints a summary at the end.
+The run has one time budget (run_budget.py, RUN_BUDGET seconds); when it runs
+low, stages take their cheap fallback — heuristic selection, template hook,
+stock image / dark card — and the summary lists each one.
+
 Run modes
   python main.py            → full automated pipeline
   python main.py --dry-run  → runs everything except the FB post (for testing)
@@ -19,35 +28,43 @@ import argparse
 import os
 import sys
 from datetime import datetime
-from dotenv import load_dotenv
+from stage_graph import run_stages
+import run_trace
+import run_budget
+
+# The pipeline modules (requests, feedparser, PIL, ...) are imported where a
+# run needs them, so `--help` and `import main` stay fast. Settings, including
+# .env, are loaded once by config on first use.
 
-load_dotenv()
 
-from news_fetcher    import fetch_top_articles
-from ai_selector     import select_best_article, save_posted_article
-from hook_writer     import generate_hook
-from image_generator import create_post_image
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "output_images")
+os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# Optional — only needed for actual posting
-try:
-    from fb_poster import post_to_facebook
-    FB_AVAILABLE = True
-except ImportError:
-    FB_AVAILABLE = False
 
+def run_pipeline(dry_run: bool = False, image_only: bool = False, full_rescan: bool = False):
+    run_trace.start_run("health")
+    run_budget.start()
+    try:
+        _run_steps(dry_run, image_only, full_rescan)
+    finally:
+        run_trace.finish(OUTPUT_DIR)
+        run_budget.stop()
 
-OUTPUT_DIR = "output_images"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+def _run_steps(dry_run: bool, image_only: bool, full_rescan: bool):
+    from news_fetcher    import fetch_top_articles
+    from ai_selector     import select_best_article, save_posted_article
+    from hook_writer     import generate_hook
+    from image_generator import build_prompt, generate_background, render_post_image
 
-def run_pipeline(dry_run: bool = False, image_only: bool = False):
     print("\n" + "=" * 60)
     print("  🏥  Health News Auto-Poster  |  " + datetime.now().strftime("%Y-%m-%d %H:%M"))
     print("=" * 60)
 
     # ── Step 1: Fetch articles ────────────────────────────────────
     print("\n[1/5] Fetching top health articles...")
-    articles = fetch_top_articles()
+    with run_trace.span("fetch"):
+        articles = fetch_top_articles(full_rescan=full_rescan)
     if not articles:
         print("❌ No articles fetched. Exiting.")
         sys.exit(1)
@@ -55,7 +72,8 @@ def run_pipeline(dry_run: bool = False, image_only: bool = False):
 
     # ── Step 2: AI selects best article ──────────────────────────
     print("\n[2/5] AI selecting most viral article...")
-    best = select_best_article(articles)
+    with run_trace.span("select"):
+        best = select_best_article(articles)
     if not best:
         best = articles[0]   # fallback to first article
         print("  ⚠️  AI selection failed — using first article as fallback.")
@@ -68,23 +86,23 @@ def run_pipeline(dry_run: bool = False, image_only: bool = False):
         _test_image_only(best)
         return
 
-    # ── Step 3: Generate hook caption ────────────────────────────
-    print("\n[3/5] Generating Facebook hook caption...")
-    hook = generate_hook(best)
+    # ── Steps 3 + 4: Hook caption ∥ post image ──────────────────
+    print("\n[3-4/5] Generating Facebook hook caption and post image...")
+    timestamp  = datetime.now().strftime("%Y%m%d_%H%M%S")
+    image_path = os.path.join(OUTPUT_DIR, f"post_{timestamp}.jpg")
+    headline   = best["title"]
+    run_trace.set_output(image_path)
+    stages     = run_stages({
+        "hook":         (lambda: generate_hook(best),                                   ()),
+        "image_prompt": (lambda: build_prompt(headline),                                ()),
+        "background":   (lambda prompt: generate_background(prompt, headline=headline), ("image_prompt",)),
+        "image":        (lambda bg: render_post_image(bg, headline, image_path, tag="HEALTH NEWS"),
+                         ("background",)),
+    })
+    hook        = stages["hook"]
+    result_path = stages["image"]
     print(f"  ✅ Hook ready ({len(hook)} chars)")
     print(f"  📝 {hook[:120]}...")
-
-    # ── Step 4: Generate post image ──────────────────────────────
-    print("\n[4/5] Generating post image...")
-    timestamp    = datetime.now().strftime("%Y%m%d_%H%M%S")
-    image_path   = os.path.join(OUTPUT_DIR, f"post_{timestamp}.jpg")
-    result_path  = create_post_image(
-        headline    = best["title"],
-        output_path = image_path,
-        category    = best.get("category", "health"),
-        source      = best.get("source", ""),
-        tag         = "HEALTH NEWS",
-    )
     if not result_path:
         print("❌ Image generation failed. Exiting.")
         sys.exit(1)
@@ -98,15 +116,20 @@ def run_pipeline(dry_run: bool = False, image_only: bool = False):
         return
 
     print("\n[5/5] Posting to Facebook...")
-    if not FB_AVAILABLE:
+    try:   # optional — only needed for actual posting
+        from fb_poster import post_to_facebook
+    except ImportError:
         print("  ⚠️  fb_poster.py not available — skipping post.")
         return
 
-    success = post_to_facebook(
-        image_path  = result_path,
-        caption     = hook,
-        article_url = best.get("url", ""),
-    )
+    with run_trace.span("post") as trace:
+        success = post_to_facebook(
+            image_path  = result_path,
+            caption     = hook,
+            article_url = best.get("url", ""),
+        )
+        if not success:
+            trace["outcome"] = "failed"
     if success:
         print("  🎉 Posted successfully to Facebook!")
         save_posted_article(best)
@@ -116,14 +139,17 @@ def run_pipeline(dry_run: bool = False, image_only: bool = False):
 
 def _test_image_only(article: dict):
     """Quick standalone image generation test."""
+    from image_generator import create_post_image
     print("\n[IMAGE TEST] Generating test image...")
     path = os.path.join(OUTPUT_DIR, "test_image.jpg")
-    create_post_image(
-        headline    = article["title"],
-        output_path = path,
-        category    = article.get("category", "health"),
-        source      = article.get("source", ""),
-    )
+    run_trace.set_output(path)
+    with run_trace.span("image"):
+        create_post_image(
+            headline    = article["title"],
+            output_path = path,
+            category    = article.get("category", "health"),
+            source      = article.get("source", ""),
+        )
     print(f"\n✅ Image saved to: {path}")
 
 
@@ -131,6 +157,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Health News Auto-Poster")
     parser.add_argument("--dry-run",     action="store_true", help="Run without posting to Facebook")
     parser.add_argument("--image-only",  action="store_true", help="Test image generation only")
+    parser.add_argument("--full-rescan", action="store_true", help="Ignore feed watermarks, re-process every entry")
     args = parser.parse_args()
 
-    run_pipeline(dry_run=args.dry_run, image_only=args.image_only)
+    run_pipeline(dry_run=args.dry_run, image_only=args.image_only, full_rescan=args.full_rescan)
@@ -0,0 +1,237 @@
+"""
+near_dup.py
+Near-duplicate detection for article titles (shingling + MinHash + LSH).
+
+The fetchers used to dedup either by comparing every title's word set to
+every title kept so far (quadratic) or by the first 60 characters (so a
+reworded wire copy — "Coffee cuts heart risk, study finds" vs "Study finds
+coffee cuts heart risk" — got through). Here each title becomes a set of
+word shingles, the set a MinHash signature, and the signature is split into
+LSH bands: two titles only get compared when some band hashes to the same
+bucket. Each lookup touches a handful of buckets, so dedup is ~linear.
+
+Candidates are confirmed with the exact Jaccard similarity of their shingle
+sets, so a pair is never reported below the threshold; the banding is tuned
+so pairs above it are missed only rarely (see `python bench.py dedup`).
+
+  index = make_index(threshold=0.7)
+  add(index, "Study finds coffee cuts heart risk")   → None   (new, indexed)
+  add(index, "Coffee cuts heart risk, study finds")  → 0      (duplicate of #0)
+  dedup_articles(articles, seen=carried)             → first of each cluster
+
+Post histories store a fingerprint — the signature packed to 16 bits per
+permutation — with each entry when it is saved. A repeat index over those
+fingerprints answers "is this title a near-repeat of anything posted?"
+from the stored signatures alone (similarity = share of equal minima):
+
+  entry["fingerprint"] = fingerprint(article["title"])          # at save time
+  repeats = make_repeat_index(recent_history)
+  find_repeat(repeats, "WHO warns of rising dengue cases in Asia") → entry | None
+
+Thresholds: DEDUP_JACCARD (default 0.7) and REPEAT_JACCARD (default 0.6)
+env vars, or threshold=...
+"""
+
+import re
+import random
+import zlib
+from functools import lru_cache
+from config import settings
+
+DEFAULT_THRESHOLD = settings.dedup_jaccard
+REPEAT_THRESHOLD  = settings.repeat_jaccard
+NUM_PERM          = 64        # MinHash permutations per signature
+SHINGLE_WORDS     = 1         # words per shingle — titles are short, word sets work best
+MIN_RECALL        = 0.95      # chance a pair exactly at the threshold is compared
+
+_PRIME    = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_FP_MASK  = 0xFFFF          # fingerprints keep 16 bits of each minimum
+_WORD_RE  = re.compile(r"\w+")
+
+_rng    = random.Random(20240611)   # fixed seed: signatures are comparable across indexes
+_COEFFS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> frozenset:
+    """Word k-shingles of lower-cased text (a shorter text is one shingle)."""
+    words = _WORD_RE.findall(text.lower())
+    if k <= 1:
+        return frozenset(words)
+    if len(words) <= k:
+        return frozenset([" ".join(words)]) if words else frozenset()
+    return frozenset(" ".join(words[i:i + k]) for i in range(len(words) - k + 1))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@lru_cache(maxsize=65536)
+def _shingle_hashes(shingle: str) -> tuple[int, ...]:
+    """The shingle's hash under every permutation — titles share most words, so cached."""
+    h = zlib.crc32(shingle.encode())
+    return tuple(((a * h + b) % _PRIME) & _MAX_HASH for a, b in _COEFFS)
+
+
+def signature(shingle_set: frozenset) -> list[int]:
+    """MinHash signature: per permutation, the smallest hash over the shingles."""
+    return list(map(min, zip(*map(_shingle_hashes, shingle_set))))
+
+
+def _band_layout(threshold: float) -> tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows = NUM_PERM for the threshold.
+    A pair with similarity s becomes a candidate with probability
+    1 - (1 - s**rows) ** bands. Take the most rows (fewest spurious
+    candidates) that still catch a pair right at the threshold
+    MIN_RECALL of the time — candidates are verified exactly anyway.
+    """
+    layouts = [(NUM_PERM // rows, rows) for rows in range(NUM_PERM, 0, -1) if NUM_PERM % rows == 0]
+    for bands, rows in layouts:
+        if 1 - (1 - threshold ** rows) ** bands >= MIN_RECALL:
+            return bands, rows
+    return layouts[-1]
+
+
+def make_index(threshold: float | None = None, k: int = SHINGLE_WORDS) -> dict:
+    threshold   = DEFAULT_THRESHOLD if threshold is None else threshold
+    bands, rows = _band_layout(threshold)
+    return {
+        "threshold": threshold,
+        "k":         k,
+        "bands":     bands,
+        "rows":      rows,
+        "buckets":   [{} for _ in range(bands)],
+        "sets":      [],
+    }
+
+
+def _band_keys(index: dict, sig: list[int]) -> list[tuple]:
+    rows = index["rows"]
+    return [tuple(sig[i * rows:(i + 1) * rows]) for i in range(index["bands"])]
+
+
+def query(index: dict, shingle_set: frozenset, keys: list[tuple] | None = None) -> int | None:
+    """Id of an indexed set with Jaccard >= threshold, or None."""
+    if not shingle_set:
+        return None
+    keys    = keys or _band_keys(index, signature(shingle_set))
+    checked = set()
+    for bucket, key in zip(index["buckets"], keys):
+        for doc in bucket.get(key, ()):
+            if doc in checked:
+                continue
+            checked.add(doc)
+            if jaccard(shingle_set, index["sets"][doc]) >= index["threshold"]:
+                return doc
+    return None
+
+
+def add(index: dict, text: str | frozenset) -> int | None:
+    """
+    Index `text` unless it near-duplicates something already indexed.
+    Returns the id of that earlier entry, or None when `text` was new.
+    Empty texts are never duplicates and are not indexed.
+    """
+    shingle_set = text if isinstance(text, frozenset) else shingles(text, index["k"])
+    if not shingle_set:
+        return None
+    keys = _band_keys(index, signature(shingle_set))
+    dup  = query(index, shingle_set, keys)
+    if dup is not None:
+        return dup
+    doc = len(index["sets"])
+    index["sets"].append(shingle_set)
+    for bucket, key in zip(index["buckets"], keys):
+        bucket.setdefault(key, []).append(doc)
+    return None
+
+
+def dedup_articles(articles: list[dict], seen: list[dict] = (),
+                   threshold: float | None = None, key: str = "title") -> list[dict]:
+    """
+    First article of each near-duplicate cluster, in input order.
+    `seen` articles (e.g. the carried-over pool) are indexed first and are
+    never returned, so anything close to them is dropped too.
+    """
+    index = make_index(threshold)
+    for article in seen:
+        add(index, article.get(key, ""))
+    unique = []
+    for article in articles:
+        if article.get(key) and add(index, article[key]) is None:
+            unique.append(article)
+    return unique
+
+
+# ── Repeat index over stored fingerprints ─────────────────────────────────────
+
+def fingerprint(text: str) -> str:
+    """Signature packed for storage: 4 hex digits per permutation, "" for empty text."""
+    shingle_set = shingles(text)
+    if not shingle_set:
+        return ""
+    return "".join(f"{v & _FP_MASK:04x}" for v in signature(shingle_set))
+
+
+def _unpack(fp: str) -> tuple[int, ...]:
+    return tuple(int(fp[i:i + 4], 16) for i in range(0, len(fp), 4))
+
+
+def make_repeat_index(entries: list[dict], threshold: float | None = None) -> dict:
+    """
+    LSH index over history entries' fingerprints. Entries saved before
+    fingerprints existed get one derived from their title, once, here.
+    """
+    threshold   = REPEAT_THRESHOLD if threshold is None else threshold
+    bands, rows = _band_layout(threshold)
+    index = {
+        "threshold": threshold,
+        "bands":     bands,
+        "rows":      rows,
+        "buckets":   [{} for _ in range(bands)],
+        "sigs":      [],
+        "entries":   [],
+    }
+    for entry in entries:
+        fp = entry.get("fingerprint") or fingerprint(entry.get("title", ""))
+        if len(fp) != NUM_PERM * 4:
+            continue
+        sig = _unpack(fp)
+        doc = len(index["sigs"])
+        index["sigs"].append(sig)
+        index["entries"].append(entry)
+        for bucket, key in zip(index["buckets"], _band_keys(index, sig)):
+            bucket.setdefault(key, []).append(doc)
+    return index
+
+
+def find_repeat(index: dict, text: str) -> dict | None:
+    """The indexed entry `text` near-repeats (estimated Jaccard >= threshold), or None."""
+    fp = fingerprint(text)
+    if not fp or not index["sigs"]:
+        return None
+    sig     = _unpack(fp)
+    checked = set()
+    for bucket, key in zip(index["buckets"], _band_keys(index, sig)):
+        for doc in bucket.get(key, ()):
+            if doc in checked:
+                continue
+            checked.add(doc)
+            same = sum(a == b for a, b in zip(sig, index["sigs"][doc]))
+            if same >= index["threshold"] * NUM_PERM:
+                return index["entries"][doc]
+    return None
+
+
+if __name__ == "__main__":
+    idx = make_index()
+    for t in ["Study finds coffee cuts heart risk", "Coffee cuts heart risk, study finds",
+              "Coffee cuts heart risk in women, study finds", "New vaccine approved for RSV"]:
+        print(f"{add(idx, t)!s:>5}  {t}")
+    print(f"bands={idx['bands']} rows={idx['rows']} threshold={idx['threshold']}")
+    repeats = make_repeat_index([{"title": "WHO warns of rising dengue cases in Asia"}])
+    print(find_repeat(repeats, "WHO warns of rising dengue cases across Southeast Asia"))
@@ -3,17 +3,23 @@ news_fetcher.py
 Fetches top health articles from free RSS feeds.
 No API key required for basic operation.
 Optional: set NEWS_API_KEY in .env for more sources.
-"""
 
-import os
-import feedparser
-import requests
-from datetime import datetime, timezone
-from dotenv import load_dotenv
+Incremental: only feed entries new since the last run are parsed and
+deduplicated; articles first seen within CARRY_OVER_HOURS come back from
+the article store so the candidate pool never runs dry on a quiet day.
+Force a full rescan with fetch_top_articles(full_rescan=True) or FULL_RESCAN=1.
+"""
 
-load_dotenv()
+import http_client
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from config import settings
+from feed_fetcher import fetch_feeds, print_fetch_summary
+from article_store import upsert_articles, record_run, new_since
+from article_record import Article
+from near_dup import dedup_articles
 
-NEWS_API_KEY = os.getenv("NEWS_API_KEY", "")
+NEWS_API_KEY = settings.news_api_key
 
 # Free RSS feeds — no key needed
 RSS_FEEDS = [
@@ -26,24 +32,21 @@ RSS_FEEDS = [
 
 MAX_ARTICLES_PER_FEED = 5
 MAX_TOTAL_ARTICLES    = 20
+CARRY_OVER_HOURS      = 48
 
 
-def _parse_feed(feed_info: dict) -> list[dict]:
-    """Parse a single RSS feed and return article dicts."""
+def _parse_feed(feed_info: dict, entries: list[dict]) -> list[dict]:
+    """Turn one feed's fetched entries into article dicts."""
     articles = []
-    try:
-        feed = feedparser.parse(feed_info["url"])
-        for entry in feed.entries[:MAX_ARTICLES_PER_FEED]:
-            articles.append({
-                "title":       entry.get("title", "").strip(),
-                "url":         entry.get("link", ""),
-                "summary":     entry.get("summary", "")[:300],
-                "source":      feed_info["source"],
-                "category":    "health",
-                "published":   entry.get("published", ""),
-            })
-    except Exception as e:
-        print(f"  ⚠️  RSS feed error ({feed_info['source']}): {e}")
+    for entry in entries[:MAX_ARTICLES_PER_FEED]:
+        articles.append(Article({
+            "title":       entry.get("title", "").strip(),
+            "url":         entry.get("link", ""),
+            "summary":     entry.get("summary", "")[:300],
+            "source":      feed_info["source"],
+            "category":    "health",
+            "published":   entry.get("published", ""),
+        }))
     return articles
 
 
@@ -52,7 +55,7 @@ def _fetch_newsapi(query: str = "health wellness nutrition", page_size: int = 10
     if not NEWS_API_KEY:
         return []
     try:
-        resp = requests.get(
+        resp = http_client.get(
             "https://newsapi.org/v2/everything",
             params={
                 "q":        query,
@@ -68,47 +71,52 @@ def _fetch_newsapi(query: str = "health wellness nutrition", page_size: int = 10
         for a in data.get("articles", []):
             if not a.get("title") or a["title"] == "[Removed]":
                 continue
-            articles.append({
+            articles.append(Article({
                 "title":    a["title"].strip(),
                 "url":      a.get("url", ""),
                 "summary":  (a.get("description") or "")[:300],
                 "source":   a.get("source", {}).get("name", "NewsAPI"),
                 "category": "health",
                 "published": a.get("publishedAt", ""),
-            })
+            }))
         return articles
     except Exception as e:
         print(f"  ⚠️  NewsAPI error: {e}")
         return []
 
 
-def fetch_top_articles() -> list[dict]:
-    """Fetch articles from all configured sources and return deduplicated list."""
+def fetch_top_articles(full_rescan: bool = False) -> list[dict]:
+    """
+    Fetch new articles from all configured sources, dedup them, and return
+    them followed by recent carried-over articles from the store.
+    """
     all_articles = []
-
-    # RSS feeds
-    for feed in RSS_FEEDS:
-        articles = _parse_feed(feed)
-        all_articles.extend(articles)
-        print(f"  📰 {feed['source']}: {len(articles)} articles")
-
-    # NewsAPI (optional)
-    if NEWS_API_KEY:
-        na_articles = _fetch_newsapi()
-        all_articles.extend(na_articles)
-        print(f"  📰 NewsAPI: {len(na_articles)} articles")
-
-    # Deduplicate by title
-    seen   = set()
-    unique = []
-    for a in all_articles:
-        key = a["title"].lower()[:60]
-        if key not in seen and a["title"]:
-            seen.add(key)
-            unique.append(a)
-
-    print(f"  📊 Total unique articles: {len(unique)}")
-    return unique[:MAX_TOTAL_ARTICLES]
+    record_run("health")
+    cutoff  = (datetime.now() - timedelta(hours=CARRY_OVER_HOURS)).isoformat()
+    carried = [Article(a) for a in new_since(cutoff, page="health")]
+
+    # RSS feeds + NewsAPI (optional) — downloaded concurrently under the
+    # shared fetch deadline, merged in RSS_FEEDS order so dedup keeps the
+    # same winner on every run
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        na_job  = pool.submit(_fetch_newsapi) if NEWS_API_KEY else None
+        results = fetch_feeds(RSS_FEEDS, watermark="health", full_rescan=full_rescan)
+
+        for result in results:
+            all_articles.extend(_parse_feed(result["feed"], result["entries"]))
+        print_fetch_summary(results)
+
+        if na_job:
+            na_articles = na_job.result()
+            all_articles.extend(na_articles)
+            print(f"  📰 NewsAPI: {len(na_articles)} articles")
+
+    # Drop near-duplicate titles in the delta (against itself and the carried-over pool)
+    unique = dedup_articles(all_articles, seen=carried)
+
+    print(f"  📊 New unique articles: {len(unique)} (+{len(carried)} carried over from the last {CARRY_OVER_HOURS}h)")
+    upsert_articles(unique, page="health")
+    return (unique + carried)[:MAX_TOTAL_ARTICLES]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,12 @@
+"""
+newsgen
+Long-running entry point for both Facebook pages.
+
+  python -m newsgen serve     in-process scheduler (see newsgen/scheduler.py)
+  python -m newsgen status    schedule, last and next run of every job
+  python -m newsgen run JOB   run one job now (health, lp-text, lp-poll, ...)
+
+The one-shot scripts (main.py, lp/lp_main.py) and their workflows are
+unchanged; serve runs the same pipelines at the same times from one warm
+process. Use one or the other — not both — or posts go out twice.
+"""
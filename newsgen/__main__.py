@@ -0,0 +1,38 @@
+"""
+newsgen/__main__.py
+Command line for the newsgen daemon.
+
+  python -m newsgen serve [--dry-run] [--once]
+  python -m newsgen status
+  python -m newsgen run <job> [--dry-run]
+"""
+
+import argparse
+from newsgen import scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m newsgen", description="News-generator scheduler")
+    sub    = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="Run every job at its scheduled time")
+    serve.add_argument("--dry-run", action="store_true", help="Generate everything, post nothing")
+    serve.add_argument("--once",    action="store_true", help="Run whatever is due now, then exit")
+
+    sub.add_parser("status", help="Show the schedule with last / next runs")
+
+    run = sub.add_parser("run", help="Run one job now")
+    run.add_argument("job", choices=[job["name"] for job in scheduler.build_schedule()])
+    run.add_argument("--dry-run", action="store_true", help="Generate everything, post nothing")
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        scheduler.serve(dry_run=args.dry_run, once=args.once)
+    elif args.command == "status":
+        scheduler.print_status()
+    elif args.command == "run":
+        scheduler.run_now(args.job, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+newsgen/scheduler.py
+In-process scheduler for `python -m newsgen serve`.
+
+Replaces one cold start per post (fresh interpreter, pip install, PIL /
+feedparser / google-genai imports, new TLS connections) with one process
+that keeps all of that warm between runs: the pooled HTTP session
+(http_client), loaded fonts, compiled scoring matchers (scoring_rules),
+the SQLite connections of article_store / llm_cache and the post-history
+indexes stay in memory.
+
+Schedule (Singapore time, same slots as the workflows):
+  health     every day  HEALTH_TIME             main.run_pipeline
+  lp-<type>  brand_voice.WEEKLY_CALENDAR days   lp_main.run_post (text format per day)
+             at LP_TIMES[type]
+  lp-cta     Sunday CTA_TIME                    (bi-weekly gate is in run_cta_post)
+
+Run state — the last slot each job ran for, when and with what outcome — is
+written to .cache/scheduler_state.json before and after every run, so a
+restart neither repeats a slot nor forgets one: a slot missed while the
+daemon was down is still run if it is less than CATCH_UP old. A job's slot
+is marked as taken before it runs — a crash mid-run is not retried
+(posting twice is worse than missing a day). On the very first start, slots
+already past are skipped rather than caught up.
+
+SIGTERM finishes the running job, then exits.
+"""
+
+import os
+import sys
+import json
+import signal
+import threading
+import traceback
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT   = Path(__file__).resolve().parent.parent
+LP_DIR = ROOT / "lp"
+for _path in (str(ROOT), str(LP_DIR)):   # lp/ modules import each other by bare name
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+from brand_voice import WEEKLY_CALENDAR
+from config import settings
+
+SGT         = timezone(timedelta(hours=8))
+HEALTH_TIME = "09:00"   # daily_post.yml       01:00 UTC
+LP_TIMES    = {         # lp_*.yml crons, in SGT
+    "text":  "20:00",
+    "poll":  "12:00",
+    "news":  "11:00",
+    "faith": "07:00",
+}
+CTA_DAY     = 6         # Sunday — lp_cta_post.yml 11:00 UTC
+CTA_TIME    = "19:00"
+CATCH_UP    = timedelta(hours=settings.serve_catch_up_hours)
+MAX_SLEEP   = 60        # seconds — re-check the clock at least this often
+STATE_FILE  = ROOT / ".cache" / "scheduler_state.json"
+
+
+# ── Schedule ───────────────────────────────────────────────────────────────────
+
+def build_schedule() -> list[dict]:
+    """Jobs: {name, type, days (weekdays), time "HH:MM", formats {weekday: format}}."""
+    jobs = {"health": {"name": "health", "type": "health", "days": set(range(7)),
+                       "time": HEALTH_TIME, "formats": {}}}
+    for day, entry in sorted(WEEKLY_CALENDAR.items()):
+        kind = entry["type"]
+        job  = jobs.setdefault(f"lp-{kind}", {"name": f"lp-{kind}", "type": kind, "days": set(),
+                                              "time": LP_TIMES.get(kind, "12:00"), "formats": {}})
+        job["days"].add(day)
+        job["formats"][day] = entry["format"]
+    jobs["lp-cta"] = {"name": "lp-cta", "type": "cta", "days": {CTA_DAY}, "time": CTA_TIME, "formats": {}}
+    return list(jobs.values())
+
+
+def _slot_on(job: dict, day: datetime) -> datetime:
+    hour, minute = map(int, job["time"].split(":"))
+    return day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+
+def last_slot(job: dict, now: datetime) -> datetime | None:
+    """The job's most recent scheduled time at or before `now`."""
+    for back in range(8):
+        slot = _slot_on(job, now - timedelta(days=back))
+        if slot.weekday() in job["days"] and slot <= now:
+            return slot
+    return None
+
+
+def next_slot(job: dict, now: datetime) -> datetime | None:
+    """The job's first scheduled time after `now`."""
+    for ahead in range(8):
+        slot = _slot_on(job, now + timedelta(days=ahead))
+        if slot.weekday() in job["days"] and slot > now:
+            return slot
+    return None
+
+
+# ── State ──────────────────────────────────────────────────────────────────────
+
+def load_state() -> dict:
+    try:
+        with open(STATE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"Scheduler state {STATE_FILE} is unreadable ({e}) — repair or remove it; "
+                           f"starting from an empty state could repost today's slots") from e
+
+
+def save_state(state: dict) -> None:
+    """Write the state atomically (temp file + rename)."""
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_FILE.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, STATE_FILE)
+
+
+def due_slot(job: dict, state: dict, now: datetime) -> datetime | None:
+    """The slot to run now: past, not yet taken, and less than CATCH_UP old."""
+    slot = last_slot(job, now)
+    if slot is None or now - slot > CATCH_UP:
+        return None
+    done = state.get(job["name"], {}).get("slot", "")
+    return slot if done < slot.isoformat() else None
+
+
+# ── Running ────────────────────────────────────────────────────────────────────
+
+def warm() -> None:
+    """Import the pipelines and open shared resources once, up front."""
+    import main, news_fetcher, ai_selector, hook_writer, image_generator, fb_poster
+    import lp_main, lp_news_fetcher, lp_image_generator
+    import http_client
+    import scoring_rules
+    http_client.get_session()
+    for profile in ("viral", "business", "lp"):
+        scoring_rules.plan(profile)
+
+
+def run_job(job: dict, slot: datetime | None = None, dry_run: bool = False) -> str:
+    """Run one job in-process; returns its outcome ("ok", "exit 1", "error: ...")."""
+    day = (slot or datetime.now(SGT)).weekday()
+    try:
+        if job["type"] == "health":
+            import main
+            main.run_pipeline(dry_run=dry_run)
+        else:
+            import lp_main
+            lp_main.run_post(job["type"], fmt=job["formats"].get(day, "any"), dry_run=dry_run)
+        return "ok"
+    except SystemExit as e:   # the pipelines exit on "nothing to post" / hard failures
+        return "ok" if not e.code else f"exit {e.code}"
+    except Exception as e:
+        traceback.print_exc()
+        return f"error: {type(e).__name__}: {e}"
+
+
+def _run_slot(job: dict, slot: datetime, state: dict, dry_run: bool) -> None:
+    print(f"\n🗓️  {job['name']} — slot {slot:%a %Y-%m-%d %H:%M} SGT")
+    state[job["name"]] = {"slot": slot.isoformat(), "started": datetime.now(SGT).isoformat(),
+                          "finished": None, "outcome": "running"}
+    save_state(state)
+    outcome = run_job(job, slot, dry_run)
+    state[job["name"]].update(finished=datetime.now(SGT).isoformat(), outcome=outcome)
+    save_state(state)
+    print(f"🗓️  {job['name']} → {outcome}")
+
+
+def serve(dry_run: bool = False, once: bool = False) -> None:
+    """Run every job at its slot until SIGTERM / Ctrl-C (or once, with once=True)."""
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    jobs  = build_schedule()
+    state = load_state()
+    now   = datetime.now(SGT)
+    for job in jobs:   # first start: don't catch up on slots from before the daemon existed
+        if job["name"] not in state and last_slot(job, now):
+            state[job["name"]] = {"slot": last_slot(job, now).isoformat(), "started": None,
+                                  "finished": None, "outcome": "before first start"}
+    save_state(state)
+
+    print(f"🚀 newsgen serve{' (dry run)' if dry_run else ''} — warming up...")
+    warm()
+    print_status(jobs, state)
+
+    try:
+        while not stop.is_set():
+            for job in jobs:
+                slot = due_slot(job, state, datetime.now(SGT))
+                if slot:
+                    _run_slot(job, slot, state, dry_run)
+                if stop.is_set():
+                    break
+            if once:
+                break
+            now  = datetime.now(SGT)
+            wake = min(next_slot(job, now) for job in jobs)
+            stop.wait(max(1.0, min(MAX_SLEEP, (wake - now).total_seconds())))
+    except KeyboardInterrupt:
+        pass
+    print("👋 newsgen serve stopped")
+
+
+def run_now(name: str, dry_run: bool = False) -> None:
+    """Run one job immediately, outside its schedule (state is not touched)."""
+    job = next(j for j in build_schedule() if j["name"] == name)
+    print(f"🗓️  {name} → {run_job(job, dry_run=dry_run)}")
+
+
+def print_status(jobs: list[dict] | None = None, state: dict | None = None) -> None:
+    jobs  = jobs or build_schedule()
+    state = load_state() if state is None else state
+    now   = datetime.now(SGT)
+    names = "MTWTFSS"
+    print(f"\n  {'job':<10} {'days':<8} {'time':<6} {'last slot':<17} {'outcome':<20} next")
+    for job in jobs:
+        last = state.get(job["name"], {})
+        days = "".join(names[d] if d in job["days"] else "·" for d in range(7))
+        slot = last.get("slot", "")[:16].replace("T", " ")
+        print(f"  {job['name']:<10} {days:<8} {job['time']:<6} {slot or '-':<17} "
+              f"{(last.get('outcome') or '-')[:20]:<20} {next_slot(job, now):%a %m-%d %H:%M}")
@@ -0,0 +1,248 @@
+"""
+post_history.py
+Post history shared by the health page (ai_selector) and the LP page.
+
+One store per history file, loaded once per process into memory: a hash
+index (title hash → newest post date) and a near-repeat index over the
+stored fingerprints (near_dup), so "was this posted?" never touches disk.
+
+On disk the history is an append-only journal — one JSON line per post —
+instead of a JSON list rewritten on every save. The retention window
+(days / max_entries) is applied on read; expired lines are dropped when the
+journal is compacted, which happens once it holds COMPACT_SLACK lines more
+than the window keeps. A legacy .json list next to the journal is imported
+the first time the journal is missing.
+
+Workflow runs can overlap, so every read and write of a journal holds an
+advisory lock on "<journal>.lock" (fcntl; no-op where unavailable). Appends
+are fsync'd; compaction re-reads the journal under the lock (picking up
+other runs' appends), writes a temp file, fsyncs it and renames it over the
+journal — a crash leaves the old journal or the new one, never half of it.
+Unreadable lines are skipped with a warning and the journal is copied to
+"<journal>.corrupt-<time>" before being rewritten without them; a torn last
+line from a crashed append is simply dropped. A corrupt legacy .json raises
+instead of silently starting from an empty history.
+
+  history = open_history("post_history.jsonl", days=30, max_entries=200)
+  find_posted(history, article["title"])   → entry | None   (same or reworded title)
+  record_post(history, article["title"])   → appends one line
+"""
+
+import os
+import json
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from article_record import content_hash
+from near_dup import fingerprint, make_repeat_index, find_repeat
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+COMPACT_SLACK = 50   # journal lines beyond the retained ones before compacting
+
+_stores = {}
+
+
+@contextmanager
+def _locked(path: str):
+    """
+    Exclusive advisory lock on "<path>.lock". Loading takes it too: it may
+    rewrite the journal (quarantine, legacy import), and compaction's rename
+    keeps readers from ever seeing a half-written file anyway.
+    """
+    if not FCNTL_AVAILABLE:
+        yield
+        return
+    with open(path + ".lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _read_journal(path: str) -> tuple[list[dict], int]:
+    """Entries of the journal and the number of unreadable lines (a torn last line is not counted)."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        lines = f.read().split("\n")
+    entries, bad = [], 0
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            if i < len(lines) - 1:   # the last piece has no newline: an interrupted append
+                bad += 1
+    return entries, bad
+
+
+def _write_atomic(path: str, entries: list[dict]) -> None:
+    """Write the journal to a temp file, fsync it, rename it over `path`."""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    try:
+        dir_fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return   # e.g. Windows — the rename itself is still atomic
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def _quarantine(path: str, bad: int) -> None:
+    backup = f"{path}.corrupt-{datetime.now():%Y%m%d%H%M%S}"
+    shutil.copy2(path, backup)
+    print(f"  ⚠️  {path}: {bad} unreadable history line(s) skipped — original kept as {backup}")
+
+
+def _read_legacy(path: str) -> list[dict]:
+    legacy = os.path.splitext(path)[0] + ".json"
+    if not os.path.exists(legacy):
+        return []
+    try:
+        with open(legacy, encoding="utf-8") as f:
+            entries = json.load(f)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"History {legacy} is corrupt ({e}) — repair or remove it; "
+                           f"starting from an empty history would repost old articles") from e
+    print(f"  📦 Imported {len(entries)} history entries from {legacy}")
+    return entries
+
+
+def open_history(path: str, days: int = 30, max_entries: int = 200) -> dict:
+    """The process-wide store for `path`, loaded from disk on first use."""
+    key = os.path.abspath(path)
+    if key in _stores:
+        return _stores[key]
+
+    store = {
+        "path":        path,
+        "days":        days,
+        "max_entries": max_entries,
+        "entries":     [],
+        "hashes":      {},
+        "repeats":     None,   # built lazily over the retained entries
+        "repeats_key": None,
+    }
+    with _locked(path):
+        if os.path.exists(path):
+            entries, bad = _read_journal(path)
+            if bad:
+                _quarantine(path, bad)
+                _write_atomic(path, entries)
+        else:
+            entries = _read_legacy(path)
+            for entry in entries:
+                entry.setdefault("fingerprint", fingerprint(entry.get("title", "")))
+            if entries:
+                _write_atomic(path, entries)
+    _reset(store, entries)
+
+    _stores[key] = store
+    if len(store["entries"]) > len(recent(store)) + COMPACT_SLACK:
+        compact(store)
+    return store
+
+
+def _index(store: dict, entry: dict) -> None:
+    store["entries"].append(entry)
+    if entry.get("hash"):
+        store["hashes"][entry["hash"]] = max(entry.get("date", ""), store["hashes"].get(entry["hash"], ""))
+
+
+def _reset(store: dict, entries: list[dict]) -> None:
+    store["entries"]     = []
+    store["hashes"]      = {}
+    store["repeats_key"] = None
+    for entry in entries:
+        _index(store, entry)
+
+
+def _cutoff(store: dict) -> str:
+    return (datetime.now() - timedelta(days=store["days"])).isoformat()
+
+
+def recent(store: dict) -> list[dict]:
+    """Entries inside the retention window (last `days`, at most `max_entries`)."""
+    cutoff = _cutoff(store)
+    return [e for e in store["entries"] if e.get("date", "") >= cutoff][-store["max_entries"]:]
+
+
+def find_posted(store: dict, title: str) -> dict | None:
+    """
+    The retained entry `title` repeats — same normalised title, or a
+    reworded copy (near_dup fingerprint) — or None.
+    """
+    cutoff = _cutoff(store)
+    h      = content_hash(title)
+    if store["hashes"].get(h, "") >= cutoff:
+        return next((e for e in reversed(store["entries"]) if e.get("hash") == h), {"hash": h})
+
+    key = (len(store["entries"]), cutoff[:10])
+    if store["repeats_key"] != key:
+        store["repeats"]     = make_repeat_index(recent(store))
+        store["repeats_key"] = key
+    return find_repeat(store["repeats"], title)
+
+
+def record_post(store: dict, title: str) -> dict:
+    """Append a post to the journal (and the in-memory indexes)."""
+    entry = {
+        "hash":        content_hash(title),
+        "title":       title[:100],
+        "date":        datetime.now().isoformat(),
+        "fingerprint": fingerprint(title),
+    }
+    line = json.dumps(entry, ensure_ascii=False) + "\n"
+    with _locked(store["path"]):
+        with open(store["path"], "a+b") as f:
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = "\n" + line   # never glue onto a torn last line
+            f.write(line.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+    _index(store, entry)
+    if len(store["entries"]) > len(recent(store)) + COMPACT_SLACK:
+        compact(store)
+    return entry
+
+
+def compact(store: dict) -> None:
+    """
+    Rewrite the journal with only the retained entries. Re-reads it under
+    the lock first, so posts appended by an overlapping run are kept.
+    """
+    with _locked(store["path"]):
+        if os.path.exists(store["path"]):
+            _reset(store, _read_journal(store["path"])[0])
+        kept = recent(store)
+        _write_atomic(store["path"], kept)
+    _reset(store, kept)
+
+
+if __name__ == "__main__":
+    import sys
+    for path in sys.argv[1:] or ["post_history.jsonl"]:
+        store = open_history(path)
+        print(f"{path}: {len(store['entries'])} lines, {len(recent(store))} within {store['days']} days")
@@ -0,0 +1,78 @@
+"""
+run_budget.py
+One wall-clock budget for a whole run, consulted by every slow stage.
+
+Without it the stages' own timeouts add up: a single create_post_image can
+spend 15s on the Gemini prompt, 120s on SDXL, 20s waiting for a model to
+load, 120s on the retry and 120s on SD 1.5 — before any LLM text or Graph
+API call. With a budget each stage asks before starting something
+expensive and takes its cheaper fallback when too little is left:
+
+  selection   Gemini / OpenRouter  → heuristic scoring
+  hook        LLM caption          → template hook
+  image       HF SDXL / SD 1.5     → stock image / dark card (LP: text card)
+
+Every such skip is recorded and listed in the run report (run_trace).
+POST_RESERVE seconds are held back so there is always time left to post.
+
+  run_budget.start()                                       # RUN_BUDGET seconds (env)
+  if run_budget.allows("hook", 15, "template hook"): ...
+  timeout = run_budget.timeout(120)                        # never past the budget
+
+Outside a run (start() not called) everything is allowed and timeouts are
+unchanged.
+"""
+
+import time
+import threading
+from config import settings
+
+RUN_BUDGET   = settings.run_budget   # seconds for a whole run (env RUN_BUDGET)
+POST_RESERVE = 45                    # kept back for posting + saving history
+
+_state = {"deadline": None, "degraded": []}
+_lock  = threading.Lock()   # stages run concurrently (stage_graph)
+
+
+def start(seconds: float | None = None) -> None:
+    """Start the budget: `seconds` (default RUN_BUDGET) from now."""
+    with _lock:
+        _state["deadline"] = time.monotonic() + (RUN_BUDGET if seconds is None else seconds)
+        _state["degraded"] = []
+
+
+def remaining() -> float:
+    """Seconds left for work before the posting reserve (inf outside a run)."""
+    if _state["deadline"] is None:
+        return float("inf")
+    return max(0.0, _state["deadline"] - POST_RESERVE - time.monotonic())
+
+
+def timeout(preferred: float, floor: float = 1.0) -> float:
+    """`preferred`, cut down to what the budget has left (at least `floor`)."""
+    return max(floor, min(preferred, remaining()))
+
+
+def allows(stage: str, needs: float, fallback: str) -> bool:
+    """
+    True if at least `needs` seconds are left. Otherwise record that `stage`
+    fell back to `fallback`, say so, and return False.
+    """
+    left = remaining()
+    if left >= needs:
+        return True
+    with _lock:
+        _state["degraded"].append({"stage": stage, "fallback": fallback, "remaining_s": round(left, 1)})
+    print(f"  ⏳ {stage}: {left:.0f}s of run budget left (needs {needs:.0f}s) — using {fallback}")
+    return False
+
+
+def degradations() -> list[dict]:
+    """Fallbacks taken because of the budget, in order."""
+    with _lock:
+        return list(_state["degraded"])
+
+
+def stop() -> None:
+    with _lock:
+        _state["deadline"] = None
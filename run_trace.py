@@ -0,0 +1,260 @@
+"""
+run_trace.py
+Where a run spent its time: stage and outbound-call timing, written as a
+JSON trace per run.
+
+A span records wall time, CPU time (of the thread that ran it), bytes sent
+/ received and an outcome. Stages are marked by the orchestrators; every
+outbound HTTP call (feeds, Gemini, OpenRouter, HF, Graph API) gets a span
+from http_client, nested under the stage that made it. A stage's bytes
+include those of its calls.
+
+  run_trace.start_run("health")
+  with run_trace.span("fetch"):
+      articles = fetch_top_articles()
+  run_trace.set_output(image_path)           # trace goes next to this file
+  run_trace.finish(OUTPUT_DIR)               # writes <image>.trace.json, prints a summary
+
+  @run_trace.traced("select")                # decorator form
+  def select(...): ...
+
+Fallbacks taken because the run budget ran low (run_budget) are listed in
+the trace ("degraded") and the summary.
+
+Spans outside a run (start_run not called) cost nothing and are not kept;
+they still yield a record with the usual fields, so callers need no checks.
+The current span lives in a contextvar; stage_graph, llm_client and
+feed_fetcher copy it into their worker threads.
+
+Across runs (e.g. the daily post-image artifacts):
+  python run_trace.py output_images/*.trace.json   → p50 / p95 per stage and service
+"""
+
+import os
+import json
+import time
+import threading
+import contextvars
+import run_budget
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from urllib.parse import urlsplit
+
+# Outbound hosts → service name in the summary (other GETs are feeds)
+SERVICES = {
+    "generativelanguage.googleapis.com": "gemini",
+    "openrouter.ai":                     "openrouter",
+    "router.huggingface.co":             "hf",
+    "api-inference.huggingface.co":      "hf",
+    "graph.facebook.com":                "graph",
+    "newsapi.org":                       "newsapi",
+}
+
+_state   = {"run": None, "spans": [], "output": None}
+_lock    = threading.Lock()
+_current = contextvars.ContextVar("run_trace_span", default=None)
+
+
+def start_run(name: str) -> None:
+    """Begin recording a run (drops anything recorded before)."""
+    with _lock:
+        _state["run"] = {
+            "name":    name,
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "t0":      time.perf_counter(),
+            "cpu0":    time.process_time(),
+        }
+        _state["spans"]  = []
+        _state["output"] = None
+
+
+def set_output(path: str | None) -> None:
+    """The run's output file — the trace is written next to it."""
+    if path:
+        _state["output"] = str(path)
+
+
+def service(url: str, method: str = "GET") -> str:
+    host = urlsplit(url).hostname or ""
+    return SERVICES.get(host, "feed" if method == "GET" else "other")
+
+
+@contextmanager
+def span(name: str, kind: str = "stage", **attrs):
+    """
+    Time the block. Yields the span record — set "outcome" or add
+    "bytes_in" / "bytes_out" / other fields on it; an exception sets
+    outcome "error: <Type>" and is re-raised.
+    """
+    run = _state["run"]
+    if run is None:   # not recording — callers may still fill in a throwaway record
+        yield {"attempts": 0, "bytes_in": 0, "bytes_out": 0, "outcome": "ok", **attrs}
+        return
+
+    parent = _current.get()
+    record = {
+        "id":        0,
+        "parent":    parent["id"] if parent else None,
+        "name":      name,
+        "kind":      kind,
+        "start_s":   round(time.perf_counter() - run["t0"], 4),
+        "wall_s":    None,
+        "cpu_s":     None,
+        "bytes_in":  0,
+        "bytes_out": 0,
+        "outcome":   "ok",
+        "thread":    threading.current_thread().name,
+        **attrs,
+    }
+    with _lock:
+        record["id"] = len(_state["spans"]) + 1
+        _state["spans"].append(record)
+    token = _current.set(record)
+    t0, cpu0 = time.perf_counter(), time.thread_time()
+    try:
+        yield record
+    except BaseException as e:
+        if not (isinstance(e, SystemExit) and not e.code):
+            record["outcome"] = f"error: {type(e).__name__}"
+        raise
+    finally:
+        record["wall_s"] = round(time.perf_counter() - t0, 4)
+        record["cpu_s"]  = round(time.thread_time() - cpu0, 4)
+        _current.reset(token)
+
+
+def traced(name: str | None = None, kind: str = "stage"):
+    """Decorator form of span() — the function name unless `name` is given."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name or fn.__name__, kind=kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ── Writing ────────────────────────────────────────────────────────────────────
+
+def _rolled_up(spans: list[dict]) -> list[dict]:
+    """Copies of the spans with each one's bytes including its descendants'."""
+    out   = [dict(s) for s in spans]
+    by_id = {s["id"]: s for s in out}
+    for s in sorted(spans, key=lambda s: -s["id"]):   # children were created after parents
+        parent = by_id.get(s["parent"])
+        if parent is not None:
+            parent["bytes_in"]  += by_id[s["id"]]["bytes_in"]
+            parent["bytes_out"] += by_id[s["id"]]["bytes_out"]
+    return out
+
+
+def _trace_path(default_dir: str) -> str:
+    if _state["output"]:
+        return os.path.splitext(_state["output"])[0] + ".trace.json"
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(str(default_dir), f"{_state['run']['name']}_{stamp}.trace.json")
+
+
+def finish(default_dir: str = ".") -> str | None:
+    """Write the trace JSON, print the summary, stop recording. Returns the trace path."""
+    run = _state["run"]
+    if run is None:
+        return None
+    with _lock:
+        spans = _rolled_up(_state["spans"])
+    trace = {
+        "run":      run["name"],
+        "started":  run["started"],
+        "wall_s":   round(time.perf_counter() - run["t0"], 4),
+        "cpu_s":    round(time.process_time() - run["cpu0"], 4),
+        "degraded": run_budget.degradations(),
+        "spans":    spans,
+    }
+    path = _trace_path(default_dir)
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, indent=2, ensure_ascii=False)
+    except OSError as e:
+        print(f"  ⚠️  Could not write run trace: {e}")
+        path = None
+    print_summary(trace)
+    if path:
+        print(f"  🧾 Trace → {path}")
+    _state["run"] = None
+    return path
+
+
+def _kb(n: int) -> str:
+    return f"{n / 1024:.1f}" if n else "-"
+
+
+def print_summary(trace: dict) -> None:
+    spans  = trace["spans"]
+    stages = [s for s in spans if s["kind"] == "stage"]
+    calls  = [s for s in spans if s["kind"] == "http"]
+    depth  = {}
+    for s in spans:
+        depth[s["id"]] = depth.get(s["parent"], -1) + 1 if s["parent"] else 0
+
+    print(f"\n⏱️  Run trace — {trace['run']}: {trace['wall_s']:.2f}s wall, {trace['cpu_s']:.2f}s CPU")
+    print(f"  {'stage':<28} {'wall s':>8} {'cpu s':>7} {'KB in':>8} {'KB out':>7}  outcome")
+    for s in stages:
+        label = "  " * depth[s["id"]] + s["name"]
+        print(f"  {label[:28]:<28} {s['wall_s'] or 0:>8.2f} {s['cpu_s'] or 0:>7.2f} "
+              f"{_kb(s['bytes_in']):>8} {_kb(s['bytes_out']):>7}  {s['outcome']}")
+
+    if calls:
+        print(f"  {'service':<28} {'calls':>8} {'wall s':>7} {'KB in':>8} {'KB out':>7}  failed")
+        groups = {}
+        for c in calls:
+            groups.setdefault(c.get("service", "?"), []).append(c)
+        for name, group in sorted(groups.items()):
+            failed = sum(c["outcome"] != "ok" for c in group)
+            print(f"  {name:<28} {len(group):>8} {sum(c['wall_s'] or 0 for c in group):>7.2f} "
+                  f"{_kb(sum(c['bytes_in'] for c in group)):>8} "
+                  f"{_kb(sum(c['bytes_out'] for c in group)):>7}  {failed}")
+
+    for d in trace.get("degraded", []):
+        print(f"  ⏳ Degraded: {d['stage']} → {d['fallback']} ({d['remaining_s']:.0f}s of budget left)")
+
+
+# ── Across runs ────────────────────────────────────────────────────────────────
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def aggregate(paths: list[str]) -> dict[str, list[float]]:
+    """{"stage <name>" / "http <service>" / "run <name>": [wall seconds per occurrence]}."""
+    samples = {}
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  Skipping {path}: {e}")
+            continue
+        samples.setdefault(f"run {trace['run']}", []).append(trace["wall_s"])
+        for s in trace["spans"]:
+            if s["wall_s"] is None:
+                continue
+            key = f"http {s.get('service', '?')}" if s["kind"] == "http" else f"{s['kind']} {s['name']}"
+            samples.setdefault(key, []).append(s["wall_s"])
+    return samples
+
+
+if __name__ == "__main__":
+    import sys
+    paths = sys.argv[1:]
+    if not paths:
+        print("usage: python run_trace.py <trace.json> ...")
+        sys.exit(1)
+    samples = aggregate(paths)
+    print(f"📈 {len(paths)} trace(s)")
+    print(f"  {'stage / service':<32} {'n':>5} {'p50 s':>8} {'p95 s':>8} {'max s':>8}")
+    for key, values in sorted(samples.items()):
+        print(f"  {key:<32} {len(values):>5} {_percentile(values, 0.5):>8.2f} "
+              f"{_percentile(values, 0.95):>8.2f} {max(values):>8.2f}")
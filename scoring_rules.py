@@ -0,0 +1,117 @@
+"""
+scoring_rules.py
+Loads scoring_rules.toml and compiles every profile (business / viral / lp)
+into a scoring plan: the profile's own settings plus one keyword automaton
+(keyword_matcher) built from all of its keyword sets.
+
+Compiled once, then cached by the file's mtime — it is re-checked at most
+every RECHECK_SECONDS, so a weekly weight tweak is live on the next run (or
+the next scoring call in a long-lived process) without a code change. A
+broken edit keeps the previously compiled rules and prints why; with no
+previous version it raises.
+
+  plan("lp")["min_score"]              → 4
+  hits("lp", article.text)["negative"] → {keyword: offset}  (cached per text)
+"""
+
+import os
+import time
+import tomllib
+from functools import lru_cache
+from keyword_matcher import build_matcher, scan, total
+from config import settings
+
+_BASE_DIR       = os.path.dirname(os.path.abspath(__file__))
+RULES_FILE      = settings.scoring_rules_file
+RECHECK_SECONDS = 2.0
+
+_state = {"mtime": None, "checked": 0.0, "version": 0, "plans": {}}
+
+__all__ = ["plan", "hits", "total", "curve_points", "band_points", "clear_cache", "RULES_FILE"]
+
+
+def _compile(rules: dict) -> dict:
+    plans = {}
+    for name, profile in rules.items():
+        if not isinstance(profile, dict) or "keywords" not in profile:
+            raise ValueError(f"profile [{name}] has no [{name}.keywords] table")
+        compiled            = dict(profile)
+        compiled["name"]    = name
+        compiled["matcher"] = build_matcher(profile["keywords"],
+                                            word_categories=tuple(profile.get("word_categories", ())))
+        plans[name] = compiled
+    return plans
+
+
+def _load() -> dict:
+    with open(RULES_FILE, "rb") as f:
+        return _compile(tomllib.load(f))
+
+
+def _refresh() -> None:
+    now = time.monotonic()
+    if _state["plans"] and now - _state["checked"] < RECHECK_SECONDS:
+        return
+    _state["checked"] = now
+    try:
+        mtime = os.stat(RULES_FILE).st_mtime_ns
+    except OSError:
+        mtime = None
+    if _state["plans"] and mtime == _state["mtime"]:
+        return
+
+    try:
+        plans = _load()
+    except (OSError, ValueError, tomllib.TOMLDecodeError) as e:
+        if not _state["plans"]:
+            raise RuntimeError(f"Cannot load scoring rules from {RULES_FILE}: {e}") from e
+        print(f"  ⚠️  Scoring rules not reloaded ({e}) — keeping the previous version")
+        _state["mtime"] = mtime   # retry once the file changes again
+        return
+
+    _state.update(mtime=mtime, plans=plans, version=_state["version"] + 1)
+    _cached_scan.cache_clear()
+
+
+def plan(name: str) -> dict:
+    """Compiled plan for one profile — settings from the file plus "matcher"."""
+    _refresh()
+    return _state["plans"][name]
+
+
+@lru_cache(maxsize=2048)
+def _cached_scan(name: str, version: int, text: str) -> dict:
+    return scan(_state["plans"][name]["matcher"], text)
+
+
+def hits(name: str, text: str) -> dict:
+    """Keyword hits of one profile for `text`; cached per text until the rules change."""
+    _refresh()
+    return _cached_scan(name, _state["version"], text)
+
+
+def curve_points(curve: list, value: float) -> int:
+    """[[limit, points], ...] — points of the first row with value < limit, else 0."""
+    for limit, points in curve:
+        if value < limit:
+            return points
+    return 0
+
+
+def band_points(bands: list, value: float) -> int:
+    """[[minimum, points], ...] — points of the first row with value >= minimum, else 0."""
+    for minimum, points in bands:
+        if value >= minimum:
+            return points
+    return 0
+
+
+def clear_cache() -> None:
+    """Drop cached keyword scans (benchmarks time them cold)."""
+    _cached_scan.cache_clear()
+
+
+if __name__ == "__main__":
+    for name in ("business", "viral", "lp"):
+        p = plan(name)
+        print(f"{name:<9} " + ", ".join(f"{cat}: {len(kws)}" for cat, kws in p["keywords"].items()))
@@ -0,0 +1,12 @@
+"""
+tests/conftest.py
+Puts the repo root and lp/ on sys.path, as the scripts themselves do.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for _path in (str(ROOT), str(ROOT / "lp")):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
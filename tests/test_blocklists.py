@@ -0,0 +1,87 @@
+"""
+tests/test_blocklists.py
+The word-boundary blocklists must still block what the old substring scan
+(`term in text.lower()`) blocked wherever the term starts a word — e.g.
+"commissioned", "distributorship", "warfare" — except the trap words listed
+in TRAPS. Mid-word hits ("software", "unbalanced") are what word matching
+exists to drop.
+"""
+
+import re
+
+import pytest
+
+import scoring_rules
+from brand_voice import FORBIDDEN_TERMS
+from keyword_matcher import scan
+from lp_post_generator import _FORBIDDEN, _safety_check
+
+BLOCKLISTS = {
+    "forbidden":  (lambda: FORBIDDEN_TERMS,
+                   lambda text: bool(scan(_FORBIDDEN, text)["forbidden"])),
+    "hard_block": (lambda: scoring_rules.plan("business")["keywords"]["hard_block"],
+                   lambda text: bool(scoring_rules.hits("business", text)["hard_block"])),
+    "negative":   (lambda: scoring_rules.plan("lp")["keywords"]["negative"],
+                   lambda text: bool(scoring_rules.hits("lp", text)["negative"])),
+}
+
+# Real words / phrases containing a blocklisted term
+PROBES = [
+    # forbidden (LP brand safety)
+    "We were commissioned to", "commissions paid weekly", "the commissioner said",
+    "Become a distributorship owner", "our distributors", "brand partnership",
+    "brand partners wanted", "business opportunities", "supplements", "supplementary",
+    "USANA-backed", "usana's", "MLMs", "my downlines", "Join us today", "sign up now",
+    # business hard_block
+    "warfare erupts", "wartime economy", "warzone", "a warlord", "post-war", "wars",
+    "conflicts", "conflicting reports", "attackers", "attacked", "shootings",
+    "elections", "scandals", "scandalous", "statins", "fillers", "antidepressants",
+    "GLP-1 drugs", "glp1", "Ozempic's rise", "weight loss medications", "clinical trials",
+    # lp negative
+    "crimes", "murderer", "bombing", "terrorists", "floods", "flooding", "typhoons",
+    "earthquakes", "celebrities", "Oscars", "missiles", "impeachment", "recipes",
+    "death tolls", "nba's", "corruption",
+]
+
+# Substring hits that word matching deliberately lets through
+TRAPS = {
+    "software", "reward", "award", "toward", "warranty", "warning", "aware", "warm",
+    "hardware", "stewardship", "dwarf", "swarm", "skilled", "unbalanced", "miranda",
+    "grape", "therapeutic", "trumpet", "join usual", "crimean", "bankrupt",
+}
+
+
+def _old_scan_at_word_start(terms: list[str], text: str) -> bool:
+    """The substring scan, counting only hits where the term starts a word."""
+    lower = text.lower()
+    return any(re.search(r"(?<![a-z0-9])" + re.escape(term.rstrip("*")), lower) for term in terms)
+
+
+@pytest.mark.parametrize("name", BLOCKLISTS)
+def test_every_term_is_blocked(name):
+    terms, blocked = BLOCKLISTS[name]
+    for term in terms():
+        word = term.rstrip("*")
+        for text in (word, f"Report: {word} today", f"{word}'s impact", f"{word}-related news"):
+            assert blocked(text), f"{name}: {text!r} not blocked"
+
+
+@pytest.mark.parametrize("name", BLOCKLISTS)
+def test_no_regression_from_substring_scan(name):
+    terms, blocked = BLOCKLISTS[name]
+    for text in PROBES + sorted(TRAPS):
+        if _old_scan_at_word_start(terms(), text) and text not in TRAPS:
+            assert blocked(text), f"{name}: {text!r} was blocked by the substring scan"
+
+
+@pytest.mark.parametrize("name", BLOCKLISTS)
+def test_trap_words_pass(name):
+    terms, blocked = BLOCKLISTS[name]
+    for text in TRAPS:
+        assert not blocked(text), f"{name}: trap word {text!r} blocked"
+
+
+@pytest.mark.parametrize("text", ["We were commissioned to...", "Become a distributorship owner"])
+def test_safety_check_regressions(text):
+    safe, reason = _safety_check(text)
+    assert not safe and reason.startswith("Forbidden term")
@@ -0,0 +1,54 @@
+"""
+tests/test_feed_cache.py
+parse_feed against a local HTTP server (no network).
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+import feed_cache
+
+RSS = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>
+<item><title>First</title><link>https://example.com/1</link></item>
+</channel></rss>"""
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Serves `state["status"]`, counting requests."""
+    monkeypatch.setattr(feed_cache, "_cache", {})
+    state = {"status": 200, "hits": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["hits"] += 1
+            body = RSS if state["status"] == 200 else b""
+            self.send_response(state["status"])
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{httpd.server_port}/rss"
+    yield state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_parse_feed(server):
+    entries = feed_cache.parse_feed(server["url"])
+    assert [e["title"] for e in entries] == ["First"]
+
+
+def test_failing_feed_is_not_retried(server):
+    server["status"] = 503
+    with pytest.raises(requests.HTTPError):
+        feed_cache.parse_feed(server["url"])
+    assert server["hits"] == 1
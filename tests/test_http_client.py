@@ -0,0 +1,54 @@
+"""
+tests/test_http_client.py
+Calls through the shared client, against a local HTTP server (no network).
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import http_client
+import run_trace
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"hello"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/feed"
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_outside_a_run(server_url):
+    assert run_trace._state["run"] is None
+    resp = http_client.get(server_url, retries=0)
+    assert resp.status_code == 200
+    assert resp.content == b"hello"
+
+
+def test_get_inside_a_run_is_traced(server_url, tmp_path):
+    run_trace.start_run("test")
+    try:
+        http_client.get(server_url, retries=0)
+        spans = list(run_trace._state["spans"])
+    finally:
+        run_trace.finish(tmp_path)
+    call = next(s for s in spans if s["kind"] == "http")
+    assert call["attempts"] == 1
+    assert call["status"] == 200
+    assert call["bytes_in"] == 5
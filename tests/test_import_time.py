@@ -0,0 +1,27 @@
+"""
+tests/test_import_time.py
+Cold `import main` / `import lp_main` stay fast and free of heavy
+dependencies (requests, PIL, feedparser, google-genai are imported lazily).
+Same measurement as `python bench.py importtime`.
+"""
+
+import pytest
+
+import bench
+
+ENTRY_POINTS = [("main", bench.ROOT), ("lp_main", bench.ROOT / "lp")]
+
+
+@pytest.mark.parametrize("module,cwd", ENTRY_POINTS, ids=[m for m, _ in ENTRY_POINTS])
+def test_entry_point_imports_no_heavy_dependency(module, cwd):
+    profile = bench._import_profile(module, cwd)
+    heavy   = [name for name in profile
+               if any(name == h or name.startswith(h + ".") for h in bench.HEAVY_IMPORTS)]
+    assert not heavy, f"import {module} pulls in {heavy}"
+
+
+@pytest.mark.parametrize("module,cwd", ENTRY_POINTS, ids=[m for m, _ in ENTRY_POINTS])
+def test_entry_point_import_time(module, cwd):
+    # Best of three fresh interpreters — the first may be compiling bytecode
+    best_ms = min(bench._import_profile(module, cwd)[module] for _ in range(3)) / 1000
+    assert best_ms <= bench.IMPORT_MAX_MS, f"import {module} took {best_ms:.0f}ms"
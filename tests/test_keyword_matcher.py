@@ -0,0 +1,102 @@
+"""
+tests/test_keyword_matcher.py
+Fixed cases for keyword_matcher's substring, word, phrase and stem rules.
+"""
+
+import pytest
+
+from keyword_matcher import build_matcher, scan, total, within
+
+BLOCK = build_matcher({
+    "block": ["war", "warfare", "nba", "killed", "rape", "crime", "church", "tax",
+              "death toll", "weight loss drug", "terror*", "commission*", "distributor*",
+              "glp-1", "usana", "multi-level"],
+    "score": {"new study": 5, "study": 2, "war": 1},
+}, word_categories=("block",))
+
+
+def blocked(text: str) -> set[str]:
+    return set(scan(BLOCK, text)["block"])
+
+
+@pytest.mark.parametrize("text", ["software update", "a reward scheme", "toward recovery",
+                                  "skilled workers", "unbalanced diet", "grape juice",
+                                  "therapeutic dose", "crimean history"])
+def test_trap_words_are_not_blocked(text):
+    assert blocked(text) == set()
+
+
+@pytest.mark.parametrize("text,term", [
+    ("war", "war"), ("The war ends", "war"), ("Wars abroad", "war"), ("post-war Manila", "war"),
+    ("war's toll", "war"), ("warfare erupts", "warfare"), ("crimes rise", "crime"),
+    ("churches", "church"), ("taxes", "tax"),   # -es plural after ch / x
+    ("NBA.", "nba"), ("(killed)", "killed"),
+])
+def test_whole_words_and_plurals(text, term):
+    assert term in blocked(text)
+
+
+def test_es_plural_only_after_sibilants():
+    assert blocked("wares") == set()   # "war" + "es" is not a plural of war
+    assert "tax" in blocked("taxes")
+
+
+@pytest.mark.parametrize("text,term", [
+    ("terror", "terror*"), ("terrorists", "terror*"), ("Terrorism", "terror*"),
+    ("We were commissioned to", "commission*"), ("commissioner", "commission*"),
+    ("Become a distributorship owner", "distributor*"),
+])
+def test_stems_match_any_ending(text, term):
+    assert term in blocked(text)
+
+
+def test_stems_still_need_a_word_start():
+    assert blocked("antiterrorism") == set()
+    assert blocked("decommissioned") == set()
+
+
+@pytest.mark.parametrize("text,term", [
+    ("the death toll rose", "death toll"), ("death tolls", "death toll"),
+    ("new weight loss drugs", "weight loss drug"),
+])
+def test_phrases(text, term):
+    assert term in blocked(text)
+
+
+def test_phrases_need_boundaries_at_both_ends():
+    assert blocked("undeath toll") == set()
+    assert blocked("death tollbooth") == set()
+    assert blocked("death and toll") == set()
+
+
+@pytest.mark.parametrize("text,term", [
+    ("GLP-1 drugs", "glp-1"), ("a glp-1s boom", "glp-1"), ("USANA-backed", "usana"),
+    ("multi-level marketing", "multi-level"),
+])
+def test_hyphenated(text, term):
+    assert term in blocked(text)
+
+
+def test_hyphenated_terms_keep_boundaries():
+    assert blocked("glp-12") == set()
+    assert blocked("xusana-backed") == set()
+
+
+def test_unbounded_categories_keep_substring_semantics():
+    hits = scan(BLOCK, "A new study on software rewards")
+    assert set(hits["score"]) == {"new study", "study", "war"}
+    assert total(BLOCK, hits, "score") == 8
+    assert hits["block"] == {}
+
+
+def test_case_insensitive_and_first_offset():
+    hits = scan(BLOCK, "WAR and war")
+    assert hits["block"] == {"war": 3}
+    assert within(hits, "block", 3) == ["war"]
+    assert within(hits, "block", 2) == []
+
+
+def test_list_weights_and_duplicates():
+    m = build_matcher({"k": ["a b", "a b", "c"]})
+    hits = scan(m, "a b c")
+    assert total(m, hits, "k") == 3
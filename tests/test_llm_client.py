@@ -0,0 +1,55 @@
+"""
+tests/test_llm_client.py
+Response-cache behaviour of llm_client.generate, with a fake provider.
+"""
+
+import pytest
+
+import hook_writer
+import llm_cache
+import llm_client
+
+MODELS = {"fake": "fake-1"}
+
+
+@pytest.fixture
+def fake(tmp_path, monkeypatch):
+    """A provider that answers "answer 1", "answer 2", ... and counts its calls."""
+    monkeypatch.setattr(llm_cache, "DB_PATH", str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(llm_cache, "_conn", None)
+    monkeypatch.setattr(llm_cache, "ENABLED", True)
+    calls = []
+
+    def call(request, model, timeout):
+        calls.append(request["prompt"])
+        return f"answer {len(calls)}"
+
+    monkeypatch.setitem(llm_client.PROVIDERS, "fake", {"call": call, "available": lambda: True})
+    yield calls
+    if llm_cache._conn is not None:
+        llm_cache._conn.close()
+
+
+def test_cached_by_default(fake):
+    first  = llm_client.generate("q", providers=("fake",), models=MODELS)
+    second = llm_client.generate("q", providers=("fake",), models=MODELS)
+    assert first == second == "answer 1"
+    assert len(fake) == 1
+
+
+def test_cache_false_neither_reads_nor_writes(fake):
+    assert llm_client.generate("q", providers=("fake",), models=MODELS, cache=False) == "answer 1"
+    assert llm_client.generate("q", providers=("fake",), models=MODELS, cache=False) == "answer 2"
+    assert llm_client.generate("q", providers=("fake",), models=MODELS) == "answer 3"
+
+
+def test_rejected_answer_is_not_cached(fake):
+    assert llm_client.generate("q", providers=("fake",), models=MODELS, parse=lambda text: None) is None
+    assert llm_client.generate("q", providers=("fake",), models=MODELS) == "answer 2"
+
+
+def test_hook_is_never_cached(monkeypatch):
+    seen = []
+    monkeypatch.setattr(hook_writer.llm_client, "generate", lambda prompt, **kw: seen.append(kw) or "hook")
+    hook_writer.generate_hook({"title": "Walking daily cuts heart risk", "summary": "A study."})
+    assert seen and seen[0]["cache"] is False
@@ -0,0 +1,49 @@
+"""
+tests/test_lp_news_fetcher.py
+Smoke test: fetch_top_articles end to end on canned feed results, with the
+article store and post history in a temp dir (no network).
+"""
+
+import time
+
+import pytest
+
+import article_store
+import lp_news_fetcher
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    monkeypatch.setattr(article_store, "DB_PATH", str(tmp_path / "articles.db"))
+    monkeypatch.setattr(article_store, "_conn", None)
+    monkeypatch.setattr(lp_news_fetcher, "HISTORY_FILE", str(tmp_path / "lp_post_history.jsonl"))
+    monkeypatch.setattr(lp_news_fetcher, "print_fetch_summary", lambda results: None)
+
+    runs = []
+
+    def fetch_feeds(feeds, watermark=None, full_rescan=False):
+        runs.append(watermark)
+        entries = [] if len(runs) > 1 else [   # the watermark hides them on the next run
+            {"title": "How one nurse built a side hustle into extra income",
+             "link": "https://example.com/side-hustle",
+             "summary": "A small business story about financial freedom.",
+             "published_parsed": list(time.gmtime())},
+            {"title": "NBA finals recap", "link": "https://example.com/nba", "summary": "",
+             "published_parsed": list(time.gmtime())},
+        ]
+        return [{"feed": feeds[0], "entries": entries}]
+
+    monkeypatch.setattr(lp_news_fetcher, "fetch_feeds", fetch_feeds)
+    yield
+    if article_store._conn is not None:
+        article_store._conn.close()
+
+
+def test_fetch_top_articles(offline):
+    top = lp_news_fetcher.fetch_top_articles()
+    assert [a["url"] for a in top] == ["https://example.com/side-hustle"]
+    assert top[0]["score"] >= 4
+
+    # Second run: nothing new from the feeds, the stored candidate is carried over
+    again = lp_news_fetcher.fetch_top_articles()
+    assert [a["url"] for a in again] == ["https://example.com/side-hustle"]
@@ -0,0 +1,67 @@
+"""
+tests/test_viral_scorer.py
+score_articles_batch must agree with calculate_enhanced_viral_score.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import scoring_rules
+from article_record import Article
+from gemini_health_finder import VIRAL_FEATURES, calculate_enhanced_viral_score, score_articles_batch
+
+FILLER = "study finds people who sleep well have more energy at work new report shows".split()
+
+
+def _corpus(n: int, seed: int) -> list[dict]:
+    random.seed(seed)
+    keywords = scoring_rules.plan("viral")["keywords"]
+    vocab    = (list(keywords["viral"]) + keywords["surprise"] + keywords["action"]
+                + FILLER + ["you", "your", "10", "3"])
+    now      = datetime.now()
+    articles = []
+    for _ in range(n):
+        # Half-hour offsets keep every article clear of the recency/age thresholds
+        pub = now - timedelta(hours=random.randint(0, 24 * 20) + 0.5)
+        articles.append({
+            "title":              " ".join(random.choices(vocab, k=random.randint(4, 18)))
+                                  + random.choice(["", "?"]),
+            "summary":            " ".join(random.choices(vocab, k=random.randint(0, 40))),
+            "published_parsed":   random.choice([list(pub.timetuple())[:9], None, [2026, 13, 40, 0, 0, 0]]),
+            "source_credibility": random.randint(1, 10),
+            "category":           random.choice(["Research", "Nutrition", "General Health", "Cardiology"]),
+        })
+    return articles
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_batch_matches_per_article_scores(seed):
+    articles = _corpus(300, seed)
+    expected = [calculate_enhanced_viral_score(Article(a)) for a in articles]
+    scores, parts = score_articles_batch([Article(a) for a in articles])
+    assert scores == expected
+    assert set(parts) == set(VIRAL_FEATURES)
+    assert all(len(parts[f]) == len(articles) for f in VIRAL_FEATURES)
+
+
+def test_contributions_add_up_to_the_score():
+    articles = _corpus(200, 4)
+    scores, parts = score_articles_batch(articles)
+    low, high = scoring_rules.plan("viral")["clamp"]
+    for i, score in enumerate(scores):
+        assert score == max(min(sum(parts[f][i] for f in VIRAL_FEATURES), high), low)
+
+
+def test_empty_batch():
+    assert score_articles_batch([]) == ([], {f: [] for f in VIRAL_FEATURES})
+
+
+def test_breaking_news_reason_uses_configured_hours(monkeypatch):
+    from gemini_health_finder import generate_why_viral
+    rules = dict(scoring_rules.plan("viral"), breaking_hours=6)
+    monkeypatch.setattr("gemini_health_finder.scoring_plan", lambda profile: rules)
+    pub = datetime.now() - timedelta(hours=2)
+    article = {"title": "Clinic opens", "summary": "", "published_parsed": list(pub.timetuple())[:9]}
+    assert "Breaking news (published within 6 hours)" in generate_why_viral(article)